@@ -0,0 +1,287 @@
+"""
+OceanWatch Sentinel - Annotation Snapshot Module
+
+This module flattens annotation dictionaries into typed columnar snapshots
+(Parquet or Arrow IPC) for analytics and training. Low-cardinality string
+columns are dictionary-encoded, and timestamps are stored as naive UTC with
+the original UTC offset kept alongside. Snapshots are sorted by hazard type
+and timestamp so row-group statistics let readers skip data that a filter
+rules out, and only the requested columns are read.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+# Dictionary-encoded string column (pandas category on read)
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+ANNOTATION_SCHEMA = pa.schema([
+    ('image_id', pa.string()),
+    ('file_path', pa.string()),
+    ('hazard_type', CATEGORY),
+    ('is_real', pa.bool_()),
+    ('verification_status', CATEGORY),
+    ('confidence', pa.float64()),
+    ('lat', pa.float64()),
+    ('lng', pa.float64()),
+    ('city', pa.string()),
+    ('district', CATEGORY),
+    ('source', CATEGORY),
+    # Naive UTC; the offset (minutes) restores timezone-aware timestamps
+    ('timestamp', pa.timestamp('us')),
+    ('timestamp_utc_offset', pa.int16()),
+    ('file_size', pa.int64()),
+    ('width', pa.int32()),
+    ('height', pa.int32()),
+    ('image_format', pa.string()),
+    ('is_ai_generated', pa.bool_()),
+    ('ai_confidence', pa.float64()),
+    ('ai_indicators', pa.list_(pa.string())),
+    ('detected_types', pa.list_(pa.string())),
+    ('hazard_confidence', pa.float64()),
+    ('scenario_match', pa.bool_()),
+    # Anything not covered above, as JSON, so snapshots round-trip
+    ('extra', pa.string())
+])
+
+# Columns prepare_data needs; reading only these skips everything else
+TRAINING_COLUMNS = ['image_id', 'file_path', 'hazard_type', 'is_real']
+
+FORMATS = {'parquet': 'parquet', 'arrow': 'ipc'}
+
+_TOP_LEVEL_KEYS = {
+    'image_id', 'file_path', 'hazard_type', 'is_real', 'verification_status',
+    'confidence', 'location', 'metadata', 'ai_detection', 'hazard_detection'
+}
+_LOCATION_KEYS = {'lat', 'lng', 'city', 'district'}
+_METADATA_KEYS = {'source', 'timestamp', 'file_size', 'dimensions', 'format'}
+
+Filters = Union[ds.Expression, List[Any], None]
+
+
+def _parse_timestamp(value: Optional[str]) -> Tuple[Optional[datetime], Optional[int]]:
+    """
+    ISO timestamp string to a naive UTC datetime and its UTC offset.
+    
+    Returns:
+        Tuple of (datetime or None if missing or unparseable, offset in
+        minutes or None for a naive timestamp)
+    """
+    if not value:
+        return None, None
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None, None
+    if timestamp.tzinfo is None:
+        return timestamp, None
+    offset = int(timestamp.utcoffset().total_seconds() // 60)
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None), offset
+
+
+def _format_timestamp(timestamp: datetime, offset: Optional[int]) -> str:
+    """Inverse of _parse_timestamp."""
+    if offset is not None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(minutes=offset)))
+    return timestamp.isoformat()
+
+
+def flatten_annotation(annotation: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one annotation dictionary into a snapshot row."""
+    location = annotation.get('location') or {}
+    metadata = annotation.get('metadata') or {}
+    ai_detection = annotation.get('ai_detection') or {}
+    hazard_detection = annotation.get('hazard_detection') or {}
+    dimensions = metadata.get('dimensions') or [None, None]
+    timestamp, utc_offset = _parse_timestamp(metadata.get('timestamp'))
+    
+    extra = {key: value for key, value in annotation.items() if key not in _TOP_LEVEL_KEYS}
+    location_extra = {key: value for key, value in location.items() if key not in _LOCATION_KEYS}
+    metadata_extra = {key: value for key, value in metadata.items() if key not in _METADATA_KEYS}
+    if location_extra:
+        extra['_location'] = location_extra
+    if metadata_extra:
+        extra['_metadata'] = metadata_extra
+    if 'source' in metadata:
+        extra['_metadata_source'] = metadata['source']
+    
+    return {
+        'image_id': annotation.get('image_id'),
+        'file_path': annotation.get('file_path'),
+        'hazard_type': annotation.get('hazard_type'),
+        'is_real': annotation.get('is_real'),
+        'verification_status': annotation.get('verification_status'),
+        'confidence': annotation.get('confidence'),
+        'lat': location.get('lat'),
+        'lng': location.get('lng'),
+        'city': location.get('city'),
+        'district': location.get('district'),
+        # Top-level source (web, ai_generated) overrides the metadata default
+        'source': annotation.get('source', metadata.get('source')),
+        'timestamp': timestamp,
+        'timestamp_utc_offset': utc_offset,
+        'file_size': metadata.get('file_size'),
+        'width': dimensions[0],
+        'height': dimensions[1],
+        'image_format': metadata.get('format'),
+        'is_ai_generated': ai_detection.get('is_ai_generated'),
+        'ai_confidence': ai_detection.get('confidence'),
+        'ai_indicators': ai_detection.get('indicators'),
+        'detected_types': hazard_detection.get('detected_types'),
+        'hazard_confidence': hazard_detection.get('confidence'),
+        'scenario_match': hazard_detection.get('scenario_match'),
+        'extra': json.dumps(extra) if extra else None
+    }
+
+
+def unflatten_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild an annotation dictionary from a full snapshot row."""
+    extra = json.loads(row['extra']) if row.get('extra') else {}
+    location_extra = extra.pop('_location', {})
+    metadata_extra = extra.pop('_metadata', {})
+    metadata_source = extra.pop('_metadata_source', None)
+    
+    location = {key: row[key] for key in ('lat', 'lng', 'city', 'district') if row[key] is not None}
+    location.update(location_extra)
+    
+    metadata = {}
+    if metadata_source is not None:
+        metadata['source'] = metadata_source
+    if row['timestamp'] is not None:
+        metadata['timestamp'] = _format_timestamp(row['timestamp'], row['timestamp_utc_offset'])
+    if row['file_size'] is not None:
+        metadata['file_size'] = row['file_size']
+    if row['width'] is not None:
+        metadata['dimensions'] = [row['width'], row['height']]
+    if row['image_format'] is not None:
+        metadata['format'] = row['image_format']
+    metadata.update(metadata_extra)
+    
+    annotation = {
+        'image_id': row['image_id'],
+        'file_path': row['file_path'],
+        'hazard_type': row['hazard_type'],
+        'is_real': row['is_real'],
+        'verification_status': row['verification_status'],
+        'confidence': row['confidence'],
+        'location': location,
+        'metadata': metadata,
+        'ai_detection': {
+            'is_ai_generated': row['is_ai_generated'],
+            'confidence': row['ai_confidence'],
+            'indicators': row['ai_indicators'] or []
+        },
+        'hazard_detection': {
+            'detected_types': row['detected_types'] or [],
+            'confidence': row['hazard_confidence'],
+            'scenario_match': row['scenario_match']
+        }
+    }
+    annotation.update(extra)
+    return annotation
+
+
+def annotations_to_table(annotations: Sequence[Dict[str, Any]]) -> pa.Table:
+    """Flatten annotations into an Arrow table sorted by hazard type and time."""
+    # Arrow cannot sort dictionary columns, so rows are ordered before encoding (nulls last)
+    rows = sorted(
+        (flatten_annotation(a) for a in annotations),
+        key=lambda row: (
+            row['hazard_type'] is None, row['hazard_type'] or '',
+            row['timestamp'] is None, row['timestamp'] or datetime.min
+        )
+    )
+    return pa.Table.from_pylist(rows, schema=ANNOTATION_SCHEMA)
+
+
+def write_snapshot(annotations: Sequence[Dict[str, Any]], path: Union[str, Path],
+                   file_format: str = 'parquet', row_group_size: int = 16384) -> Path:
+    """
+    Atomically write annotations as a columnar snapshot.
+    
+    Args:
+        annotations: Annotation dictionaries
+        path: Output file
+        file_format: 'parquet' (zstd-compressed) or 'arrow' (uncompressed IPC,
+            memory-mappable)
+        row_group_size: Rows per Parquet row group / Arrow record batch
+    
+    Returns:
+        Path of the snapshot
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown snapshot format: {file_format}")
+    
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = annotations_to_table(annotations)
+    
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    if file_format == 'parquet':
+        pq.write_table(table, tmp_path, row_group_size=row_group_size, compression='zstd')
+    else:
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=row_group_size)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_snapshot_table(path: Union[str, Path], columns: Optional[List[str]] = None,
+                        filters: Filters = None) -> pa.Table:
+    """
+    Read the matching rows and requested columns of a snapshot.
+    
+    Args:
+        path: Snapshot file (.parquet or .arrow)
+        columns: Columns to read (all if omitted)
+        filters: pyarrow.dataset expression, or DNF tuples such as
+            [('hazard_type', '=', 'tsunami'), ('ai_confidence', '>', 0.5)]
+    
+    Returns:
+        Arrow table
+    """
+    path = Path(path)
+    file_format = FORMATS['arrow'] if path.suffix in ('.arrow', '.feather', '.ipc') else FORMATS['parquet']
+    if isinstance(filters, list):
+        filters = pq.filters_to_expression(filters) if filters else None
+    return ds.dataset(str(path), format=file_format).to_table(columns=columns, filter=filters)
+
+
+def read_snapshot(path: Union[str, Path], columns: Optional[List[str]] = None,
+                  filters: Filters = None) -> List[Dict[str, Any]]:
+    """
+    Read annotations from a snapshot.
+    
+    With all columns the nested annotation dictionaries are rebuilt; with a
+    column subset the flat rows are returned (TRAINING_COLUMNS rows carry
+    every key prepare_data uses).
+    
+    Args:
+        path: Snapshot file
+        columns: Columns to read (all if omitted)
+        filters: Row filter, see read_snapshot_table
+    
+    Returns:
+        List of annotation dictionaries or flat rows
+    """
+    rows = read_snapshot_table(path, columns, filters).to_pylist()
+    if columns is None:
+        return [unflatten_row(row) for row in rows]
+    return rows
+
+
+def read_snapshot_frame(path: Union[str, Path], columns: Optional[List[str]] = None,
+                        filters: Filters = None) -> pd.DataFrame:
+    """Read a snapshot into a pandas DataFrame for analysis."""
+    return read_snapshot_table(path, columns, filters).to_pandas()
@@ -9,13 +9,17 @@ import os
 import json
 import requests
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import cv2
 import numpy as np
 from PIL import Image
 import pandas as pd
 from pathlib import Path
 
+from annotation_snapshots import Filters, read_snapshot, read_snapshot_frame, write_snapshot
+from dataset_scanner import DatasetScanner
+from geo_index import GeoIndex
+
 
 class OceanHazardDataCollector:
     """Collects and organizes ocean hazard images for AI training."""
@@ -26,9 +30,6 @@ class OceanHazardDataCollector:
         self.processed_path = self.base_path / "processed"
         self.annotations_path = self.base_path / "annotations"
         
-        # Create directory structure
-        self._create_directories()
-        
         # Hazard types
         self.hazard_types = [
             "tsunami", "storm_surge", "high_waves", "flooding",
@@ -38,6 +39,12 @@ class OceanHazardDataCollector:
         # Image categories
         self.categories = ["real_images", "ai_generated"]
         
+        # Create directory structure
+        self._create_directories()
+        
+        # Spatial index over annotation locations, kept up to date as items are recorded
+        self.geo_index = GeoIndex()
+        
     def _create_directories(self):
         """Create the directory structure for the dataset."""
         for category in ["real_images", "ai_generated"]:
@@ -231,7 +238,7 @@ class OceanHazardDataCollector:
         width, height = image.size
         file_size = file_path.stat().st_size
         
-        return {
+        annotation = {
             "image_id": filename,
             "file_path": str(file_path),
             "hazard_type": hazard_type,
@@ -257,6 +264,9 @@ class OceanHazardDataCollector:
                 "scenario_match": True
             }
         }
+        self.geo_index.add_annotation(annotation)
+        
+        return annotation
     
     def save_annotations(self, annotations: List[Dict], 
                         filename: str = "annotations.json"):
@@ -278,13 +288,135 @@ class OceanHazardDataCollector:
         with open(file_path, 'r') as f:
             annotations = json.load(f)
         
+        # Already indexed annotations are skipped
+        self.geo_index.add_annotations(annotations)
+        
+        return annotations
+    
+    def _snapshot_path(self, name: str, file_format: Optional[str] = None) -> Path:
+        """
+        Snapshot file for a name, or the name itself if it is already a path.
+        
+        Without a format, an existing Parquet snapshot is preferred over an
+        Arrow one.
+        """
+        path = Path(name)
+        if path.suffix in ('.parquet', '.arrow'):
+            return path
+        if file_format is None:
+            arrow_path = self.annotations_path / f"{name}.arrow"
+            parquet_path = self.annotations_path / f"{name}.parquet"
+            return arrow_path if arrow_path.exists() and not parquet_path.exists() else parquet_path
+        return self.annotations_path / f"{name}.{file_format}"
+    
+    def save_snapshot(self, annotations: List[Dict], name: str = "annotations",
+                      file_format: str = 'parquet') -> Path:
+        """
+        Save annotations as a flattened columnar snapshot.
+        
+        Args:
+            annotations: List of annotation dictionaries
+            name: Snapshot name (stored in the annotations directory) or path
+            file_format: 'parquet' or 'arrow'
+        
+        Returns:
+            Path of the snapshot
+        """
+        path = write_snapshot(annotations, self._snapshot_path(name, file_format), file_format)
+        print(f"Saved {len(annotations)} annotations to {path}")
+        return path
+    
+    def load_snapshot(self, name: str = "annotations",
+                      columns: Optional[List[str]] = None,
+                      filters: Filters = None) -> List[Dict]:
+        """
+        Load annotations from a snapshot, reading only matching rows.
+        
+        Args:
+            name: Snapshot name or path
+            columns: Columns to read (full annotations if omitted, flat rows otherwise)
+            filters: DNF tuples such as [('verification_status', '=', 'pending')]
+                or a pyarrow.dataset expression
+        
+        Returns:
+            List of annotation dictionaries (or flat rows for a column subset)
+        """
+        annotations = read_snapshot(self._snapshot_path(name), columns, filters)
+        if columns is None:
+            self.geo_index.add_annotations(annotations)
         return annotations
     
-    def create_dataset_split(self, annotations: List[Dict], 
+    def query_snapshot(self, name: str = "annotations",
+                       columns: Optional[List[str]] = None,
+                       filters: Filters = None) -> pd.DataFrame:
+        """
+        Load a snapshot into a DataFrame for analysis.
+        
+        For example, class balance per district:
+            query_snapshot(columns=['district', 'hazard_type']).value_counts()
+        
+        Args:
+            name: Snapshot name or path
+            columns: Columns to read (all if omitted)
+            filters: Row filter, as for load_snapshot
+        
+        Returns:
+            DataFrame with one typed column per snapshot field
+        """
+        return read_snapshot_frame(self._snapshot_path(name), columns, filters)
+    
+    def find_nearby_annotations(self, lat: float, lng: float, radius_km: float,
+                                hazard_types: Optional[List[str]] = None,
+                                start: Optional[str] = None,
+                                end: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Find recorded annotations near a point.
+        
+        Args:
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+            radius_km: Search radius in kilometres
+            hazard_types: Only return these hazard types (optional)
+            start: Earliest ISO timestamp (optional)
+            end: Latest ISO timestamp (optional)
+        
+        Returns:
+            List of (image_id, distance_km), nearest first
+        """
+        return self.geo_index.query_radius(lat, lng, radius_km, hazard_types, start, end)
+    
+    def scan_dataset(self, annotations: Optional[List[Dict]] = None,
+                     workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Check raw images against the annotations, in parallel and incrementally.
+        
+        Args:
+            annotations: Annotations to check (defaults to every saved annotation file)
+            workers: Worker processes (defaults to all cores)
+        
+        Returns:
+            Scan report, see DatasetScanner.scan
+        """
+        return DatasetScanner(str(self.base_path), workers).scan(annotations)
+    
+    def create_dataset_split(self, annotations: Union[List[Dict], str, Path],
                            train_ratio: float = 0.7,
                            val_ratio: float = 0.15,
-                           test_ratio: float = 0.15):
-        """Create train/validation/test splits."""
+                           test_ratio: float = 0.15,
+                           snapshot_format: Optional[str] = None):
+        """
+        Create train/validation/test splits.
+        
+        Args:
+            annotations: Annotation dictionaries, or the path of a snapshot
+            train_ratio: Share of training annotations
+            val_ratio: Share of validation annotations
+            test_ratio: Share of test annotations
+            snapshot_format: Also save the splits as 'parquet' or 'arrow' snapshots
+        """
+        if isinstance(annotations, (str, Path)):
+            annotations = read_snapshot(annotations)
+        
         # Shuffle annotations
         np.random.shuffle(annotations)
         
@@ -302,6 +434,10 @@ class OceanHazardDataCollector:
         self.save_annotations(train_annotations, "train_annotations.json")
         self.save_annotations(val_annotations, "validation_annotations.json")
         self.save_annotations(test_annotations, "test_annotations.json")
+        if snapshot_format is not None:
+            self.save_snapshot(train_annotations, "train_annotations", snapshot_format)
+            self.save_snapshot(val_annotations, "validation_annotations", snapshot_format)
+            self.save_snapshot(test_annotations, "test_annotations", snapshot_format)
         
         print(f"Dataset split created:")
         print(f"  Train: {len(train_annotations)} images")
@@ -0,0 +1,315 @@
+"""
+OceanWatch Sentinel - Dataset Integrity Scanner Module
+
+This module checks the raw image tree and the annotation set before
+training. Files are decoded across all cores to validate them and to
+accumulate per-channel pixel statistics; orphaned files and dangling
+annotations are reported alongside class counts. Per-file results are
+cached by size, mtime and content hash, so a re-scan only decodes files
+that changed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+import pandas as pd
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+CACHE_NAME = "scan_cache.json"
+
+# Resolution channel statistics are computed at (matches prepare_data)
+STATS_SIZE = (224, 224)
+
+
+def _scan_file(task: Tuple[str, Optional[Dict[str, Any]], int, int]) -> Dict[str, Any]:
+    """
+    Validate one image (runs in a worker process).
+    
+    Args:
+        task: (path, cached entry or None, min_width, min_height)
+    
+    Returns:
+        Scan entry with the content hash, dimensions, error and channel sums
+    """
+    path, cached, min_width, min_height = task
+    stat = os.stat(path)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': None, 'error': f"unreadable: {e}"}
+    
+    sha256 = hashlib.sha256(data).hexdigest()
+    # Touched but unchanged: keep the earlier result
+    if cached is not None and cached.get('sha256') == sha256:
+        return {**cached, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256, 'error': None}
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        entry['error'] = 'undecodable'
+        return entry
+    
+    height, width = image.shape[:2]
+    entry['width'] = width
+    entry['height'] = height
+    if width < min_width or height < min_height:
+        entry['error'] = 'too_small'
+    
+    # Sums over the resized RGB image in [0, 1], as the model sees it
+    pixels = cv2.cvtColor(cv2.resize(image, STATS_SIZE), cv2.COLOR_BGR2RGB).reshape(-1, 3) / 255.0
+    entry['channel_sum'] = pixels.sum(axis=0).tolist()
+    entry['channel_sumsq'] = np.square(pixels).sum(axis=0).tolist()
+    entry['pixels'] = len(pixels)
+    return entry
+
+
+class DatasetScanner:
+    """Parallel validator and statistics collector for the raw dataset."""
+    
+    def __init__(self, data_path: str = "dataset/data", workers: Optional[int] = None,
+                 min_width: int = 64, min_height: int = 64):
+        """
+        Args:
+            data_path: Dataset root holding raw/ and annotations/
+            workers: Worker processes (defaults to all cores)
+            min_width: Narrower images are reported as too small
+            min_height: Shorter images are reported as too small
+        """
+        self.data_path = Path(data_path)
+        self.raw_path = self.data_path / "raw"
+        self.annotations_path = self.data_path / "annotations"
+        self.cache_path = self.data_path / CACHE_NAME
+        self.workers = workers or os.cpu_count() or 1
+        self.min_width = min_width
+        self.min_height = min_height
+    
+    def _load_cache(self) -> Dict[str, Any]:
+        """Cached per-file entries, discarded if the scan settings changed."""
+        if not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable scan cache {self.cache_path}: {e}")
+            return {}
+        if cache.get('settings') != self._settings():
+            return {}
+        return cache.get('files', {})
+    
+    def _save_cache(self, files: Dict[str, Any]):
+        """Atomically write the per-file cache."""
+        tmp_path = self.cache_path.with_name(f".{CACHE_NAME}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'settings': self._settings(), 'files': files}, f)
+        os.replace(tmp_path, self.cache_path)
+    
+    def _settings(self) -> Dict[str, Any]:
+        """Settings that change per-file results."""
+        return {'min_width': self.min_width, 'min_height': self.min_height, 'stats_size': list(STATS_SIZE)}
+    
+    def list_files(self) -> List[Path]:
+        """Image files under raw/, sorted."""
+        if not self.raw_path.exists():
+            return []
+        return sorted(
+            path for path in self.raw_path.rglob('*')
+            if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS
+        )
+    
+    def load_annotations(self) -> List[Dict[str, Any]]:
+        """All annotations from the JSON files in annotations/, de-duplicated by image_id."""
+        annotations = {}
+        for path in sorted(self.annotations_path.glob('*.json')):
+            try:
+                with open(path, 'r') as f:
+                    items = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable annotation file {path}: {e}")
+                continue
+            for annotation in items if isinstance(items, list) else []:
+                annotations.setdefault(annotation.get('image_id'), annotation)
+        return list(annotations.values())
+    
+    def scan_files(self, files: List[Path]) -> Tuple[Dict[str, Any], int]:
+        """
+        Scan files, reusing cached entries for files whose size and mtime are unchanged.
+        
+        Returns:
+            Tuple of (entries keyed by resolved path, number of files read)
+        """
+        cache = self._load_cache()
+        entries = {}
+        tasks = []
+        for path in files:
+            key = str(path.resolve())
+            stat = path.stat()
+            cached = cache.get(key)
+            if cached is not None and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                entries[key] = cached
+            else:
+                tasks.append((key, cached, self.min_width, self.min_height))
+        
+        if tasks:
+            chunksize = max(1, len(tasks) // (self.workers * 8))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for (key, _, _, _), entry in zip(tasks, executor.map(_scan_file, tasks, chunksize=chunksize)):
+                    entries[key] = entry
+        
+        self._save_cache(entries)
+        return entries, len(tasks)
+    
+    @staticmethod
+    def _channel_stats(sums: np.ndarray, sumsqs: np.ndarray, pixels: np.ndarray) -> Dict[str, Any]:
+        """Mean and std per channel from summed moments."""
+        total = pixels.sum()
+        if total == 0:
+            return {'images': 0, 'mean': None, 'std': None}
+        mean = sums.sum(axis=0) / total
+        std = np.sqrt(np.maximum(sumsqs.sum(axis=0) / total - np.square(mean), 0.0))
+        return {'images': int(len(pixels)), 'mean': mean.tolist(), 'std': std.tolist()}
+    
+    def scan(self, annotations: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Scan the raw image tree against the annotation set.
+        
+        Args:
+            annotations: Annotations to check (defaults to every JSON file
+                in the annotations directory)
+        
+        Returns:
+            Report with invalid files, orphaned files, dangling annotations,
+            class counts and channel statistics
+        """
+        start = time.perf_counter()
+        if annotations is None:
+            annotations = self.load_annotations()
+        
+        annotated = {}
+        for annotation in annotations:
+            file_path = annotation.get('file_path')
+            if file_path:
+                annotated[str(Path(file_path).resolve())] = annotation
+        
+        # Annotated paths also cover files outside raw/ (e.g. a custom base path);
+        # one pass over both keeps every file's entry in the saved cache
+        files = self.list_files()
+        listed = {str(path.resolve()) for path in files}
+        extra = [Path(key) for key in annotated if key not in listed and Path(key).is_file()]
+        entries, rescanned = self.scan_files(files + extra)
+        
+        invalid = {key: entry['error'] for key, entry in entries.items() if entry['error']}
+        orphaned = sorted(key for key in entries if key not in annotated)
+        dangling = []
+        for key, annotation in annotated.items():
+            if key not in entries:
+                dangling.append({'image_id': annotation.get('image_id'), 'file_path': annotation['file_path'], 'reason': 'missing'})
+            elif key in invalid:
+                dangling.append({'image_id': annotation.get('image_id'), 'file_path': annotation['file_path'], 'reason': invalid[key]})
+        missing_path = [a.get('image_id') for a in annotations if not a.get('file_path')]
+        
+        # Content duplicates
+        by_hash = {}
+        for key, entry in entries.items():
+            if entry.get('sha256'):
+                by_hash.setdefault(entry['sha256'], []).append(key)
+        duplicates = [sorted(keys) for keys in by_hash.values() if len(keys) > 1]
+        
+        # Class counts from the annotations, and from the directory layout
+        frame = pd.DataFrame(
+            [(a.get('hazard_type'), bool(a.get('is_real'))) for a in annotations],
+            columns=['hazard_type', 'is_real']
+        )
+        class_counts = {}
+        if len(frame):
+            table = pd.crosstab(frame['hazard_type'], frame['is_real'])
+            class_counts = {
+                hazard_type: {
+                    'real': int(row.get(True, 0)),
+                    'ai_generated': int(row.get(False, 0))
+                }
+                for hazard_type, row in table.iterrows()
+            }
+        file_classes = pd.Series(
+            [Path(key).parent.name for key in entries], dtype=object
+        ).value_counts().to_dict()
+        
+        # Channel statistics over valid images, overall and per hazard type
+        valid = [key for key, entry in entries.items() if not entry['error'] and 'pixels' in entry]
+        sums = np.array([entries[key]['channel_sum'] for key in valid], dtype=np.float64).reshape(-1, 3)
+        sumsqs = np.array([entries[key]['channel_sumsq'] for key in valid], dtype=np.float64).reshape(-1, 3)
+        pixels = np.array([entries[key]['pixels'] for key in valid], dtype=np.float64)
+        classes = np.array([
+            annotated[key].get('hazard_type') if key in annotated else Path(key).parent.name
+            for key in valid
+        ], dtype=object)
+        per_class = {
+            hazard_type: self._channel_stats(sums[classes == hazard_type], sumsqs[classes == hazard_type],
+                                             pixels[classes == hazard_type])
+            for hazard_type in sorted(set(classes.tolist()))
+        }
+        
+        return {
+            'scanned_at': datetime.now().isoformat(),
+            'data_path': str(self.data_path),
+            'files': len(entries),
+            'rescanned': rescanned,
+            'cached': len(entries) - rescanned,
+            'annotations': len(annotations),
+            'invalid_files': [{'file_path': key, 'error': error} for key, error in sorted(invalid.items())],
+            'orphaned_files': orphaned,
+            'dangling_annotations': dangling,
+            'annotations_without_path': missing_path,
+            'duplicate_files': duplicates,
+            'class_counts': class_counts,
+            'file_class_counts': {str(k): int(v) for k, v in file_classes.items()},
+            'channel_stats': {
+                **self._channel_stats(sums, sumsqs, pixels),
+                'per_class': per_class
+            },
+            'scan_seconds': time.perf_counter() - start
+        }
+
+
+def main():
+    """Scan the dataset and print a summary."""
+    parser = argparse.ArgumentParser(description="OceanWatch Sentinel dataset integrity scanner")
+    parser.add_argument("--data-path", default="dataset/data")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--min-size", type=int, default=64)
+    parser.add_argument("--output", default=None, help="Write the full report as JSON")
+    args = parser.parse_args()
+    
+    scanner = DatasetScanner(args.data_path, args.workers, args.min_size, args.min_size)
+    report = scanner.scan()
+    
+    print(f"Scanned {report['files']} files ({report['rescanned']} read, {report['cached']} cached) "
+          f"in {report['scan_seconds']:.1f}s")
+    print(f"  Invalid files: {len(report['invalid_files'])}")
+    print(f"  Orphaned files: {len(report['orphaned_files'])}")
+    print(f"  Dangling annotations: {len(report['dangling_annotations'])}")
+    print(f"  Duplicate groups: {len(report['duplicate_files'])}")
+    if report['channel_stats']['mean'] is not None:
+        print(f"  Channel mean: {np.round(report['channel_stats']['mean'], 4).tolist()}")
+        print(f"  Channel std: {np.round(report['channel_stats']['std'], 4).tolist()}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+OceanWatch Sentinel - Near-Duplicate Index Module
+
+This module finds re-shared hazard photos that exact content hashes miss
+(re-compressed, resized or lightly edited copies). Each verified image gets
+a 64-bit perceptual hash stored in a multi-index hash table, so a
+Hamming-distance lookup returns the earlier prediction and the reports that
+shared the photo without running the model again.
+"""
+
+import itertools
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def dhash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Difference hash: signs of horizontal gradients on a tiny grayscale copy.
+    
+    Args:
+        image: RGB uint8 image
+        hash_size: Hash is hash_size * hash_size bits
+    
+    Returns:
+        Hash as an integer
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def phash(image: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Perceptual hash: low-frequency DCT coefficients against their median.
+    
+    Args:
+        image: RGB uint8 image
+        hash_size: Hash is hash_size * hash_size bits
+    
+    Returns:
+        Hash as an integer
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(gray, (hash_size * 4, hash_size * 4), interpolation=cv2.INTER_AREA)
+    low = cv2.dct(small.astype(np.float32))[:hash_size, :hash_size]
+    # The DC term tracks overall brightness, not structure
+    bits = (low > np.median(low.ravel()[1:])).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+HASH_FUNCTIONS = {'dhash': dhash, 'phash': phash}
+HASH_BITS = 64
+
+# Set bits per byte value, for vectorised popcounts
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class MultiIndexHashTable:
+    """
+    Hamming-radius search over 64-bit hashes.
+    
+    Hashes are split into max_distance + 1 disjoint chunks, each with its own
+    exact-match table. Two hashes within max_distance bits must agree exactly
+    on at least one chunk, so only items sharing a chunk are compared.
+    """
+    
+    def __init__(self, max_distance: int, bits: int = HASH_BITS):
+        chunk_count = max_distance + 1
+        widths = [bits // chunk_count + (1 if i < bits % chunk_count else 0) for i in range(chunk_count)]
+        
+        self.max_distance = max_distance
+        self._chunks = []
+        offset = 0
+        for width in widths:
+            self._chunks.append((offset, (1 << width) - 1))
+            offset += width
+        self._tables = [{} for _ in widths]
+        
+        # Item ids are positions in this array
+        self._hashes = np.zeros(1024, dtype=np.uint64)
+        self.size = 0
+    
+    def add(self, hash_value: int) -> int:
+        """
+        Insert a hash.
+        
+        Returns:
+            Item id (insertion order)
+        """
+        if self.size == len(self._hashes):
+            self._hashes = np.concatenate([self._hashes, np.zeros_like(self._hashes)])
+        item_id = self.size
+        self._hashes[item_id] = hash_value
+        self.size += 1
+        
+        for (offset, mask), table in zip(self._chunks, self._tables):
+            table.setdefault((hash_value >> offset) & mask, []).append(item_id)
+        return item_id
+    
+    def search(self, hash_value: int) -> List[Tuple[int, int]]:
+        """
+        Find items within max_distance bits.
+        
+        Args:
+            hash_value: Query hash
+        
+        Returns:
+            List of (distance, item_id), closest first
+        """
+        buckets = [
+            table.get((hash_value >> offset) & mask)
+            for (offset, mask), table in zip(self._chunks, self._tables)
+        ]
+        candidates = np.unique(np.fromiter(
+            itertools.chain.from_iterable(bucket for bucket in buckets if bucket), dtype=np.int64
+        ))
+        if not len(candidates):
+            return []
+        
+        diff = (self._hashes[candidates] ^ np.uint64(hash_value)).view(np.uint8).reshape(-1, 8)
+        distances = _POPCOUNT[diff].sum(axis=1, dtype=np.int32)
+        keep = np.flatnonzero(distances <= self.max_distance)
+        return sorted(zip(distances[keep].tolist(), candidates[keep].tolist()))
+
+
+class NearDuplicateIndex:
+    """Perceptual-hash index of verified images with optional JSON persistence."""
+    
+    def __init__(self, max_distance: int = 6, method: str = 'dhash',
+                 path: Optional[str] = None):
+        """
+        Args:
+            max_distance: Hamming threshold (out of 64 bits) for a near duplicate
+            method: 'dhash' or 'phash'
+            path: JSON file the index is loaded from and saved to
+        """
+        if method not in HASH_FUNCTIONS:
+            raise ValueError(f"Unknown perceptual hash method: {method}")
+        
+        self.max_distance = max_distance
+        self.method = method
+        self.path = Path(path) if path else None
+        
+        self._entries = []
+        self._table = MultiIndexHashTable(max_distance)
+        self._lock = threading.Lock()
+        self.stats = {'lookups': 0, 'hits': 0, 'added': 0}
+        
+        if self.path is not None and self.path.exists():
+            self.load()
+    
+    def hash_image(self, image: np.ndarray) -> int:
+        """Perceptual hash of a decoded RGB image."""
+        return HASH_FUNCTIONS[self.method](image)
+    
+    def add(self, hash_value: int, prediction: Dict[str, Any], model_version: str,
+            report_id: Optional[str] = None) -> int:
+        """
+        Index a verified image.
+        
+        Args:
+            hash_value: Perceptual hash of the image
+            prediction: Model prediction for the image
+            model_version: Version of the models that produced it
+            report_id: Hazard report the image belongs to (optional)
+        
+        Returns:
+            Entry id
+        """
+        with self._lock:
+            entry_id = self._table.add(hash_value)
+            self._entries.append({
+                'hash': hash_value,
+                'model_version': model_version,
+                'prediction': prediction,
+                'report_ids': [report_id] if report_id else []
+            })
+            self.stats['added'] += 1
+        return entry_id
+    
+    def lookup(self, hash_value: int, model_version: str,
+               report_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Find the closest near duplicate produced by the same model version.
+        
+        Args:
+            hash_value: Perceptual hash of the query image
+            model_version: Current model version
+            report_id: Report to link to the matched entry (optional)
+        
+        Returns:
+            Dictionary with entry_id, distance, prediction and report_ids,
+            or None if nothing is within max_distance
+        """
+        with self._lock:
+            self.stats['lookups'] += 1
+            for distance, entry_id in self._table.search(hash_value):
+                entry = self._entries[entry_id]
+                if entry['model_version'] != model_version:
+                    continue
+                
+                linked = list(entry['report_ids'])
+                if report_id and report_id not in entry['report_ids']:
+                    entry['report_ids'].append(report_id)
+                self.stats['hits'] += 1
+                return {
+                    'entry_id': entry_id,
+                    'distance': distance,
+                    'prediction': dict(entry['prediction']),
+                    'report_ids': linked
+                }
+        return None
+    
+    def report_ids(self, entry_id: int) -> List[str]:
+        """Reports linked to an entry."""
+        with self._lock:
+            return list(self._entries[entry_id]['report_ids'])
+    
+    def save(self, path: Optional[str] = None):
+        """Atomically write the index to JSON."""
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ValueError("No path given for the near-duplicate index")
+        
+        with self._lock:
+            data = {
+                'method': self.method,
+                'entries': [
+                    {**entry, 'hash': format(entry['hash'], '016x')}
+                    for entry in self._entries
+                ]
+            }
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    
+    def load(self, path: Optional[str] = None):
+        """Replace the index contents with a saved JSON index."""
+        path = Path(path) if path else self.path
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if data.get('method', self.method) != self.method:
+            raise ValueError(f"Index at {path} uses {data['method']}, not {self.method}")
+        
+        entries = []
+        table = MultiIndexHashTable(self.max_distance)
+        for entry in data['entries']:
+            entry['hash'] = int(entry['hash'], 16)
+            entries.append(entry)
+            table.add(entry['hash'])
+        
+        with self._lock:
+            self._entries = entries
+            self._table = table
+        print(f"Loaded {len(entries)} near-duplicate index entries from {path}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Lookup and hit counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        stats['hit_rate'] = stats['hits'] / stats['lookups'] if stats['lookups'] else 0.0
+        stats['max_distance'] = self.max_distance
+        stats['method'] = self.method
+        return stats
@@ -0,0 +1,192 @@
+"""
+OceanWatch Sentinel - Early-Exit Inference Module
+
+This module serves the early-exit variant of the hazard model. The trainer
+exports the backbone as consecutive TFLite stages, each ending in its own
+hazard_classification/ai_detection heads. A batch runs stage by stage, and
+images whose heads are already confident leave at that stage; only the rest
+carry their feature maps on to the next, more expensive one.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from interpreter_pool import TFLiteInterpreterPool
+
+
+EARLY_EXIT_MANIFEST = "ocean_hazard_model_early_exit.json"
+
+
+class EarlyExitStages:
+    """The exported stage interpreters described by an early-exit manifest."""
+    
+    def __init__(self, manifest_path: str, pool_size: int = 1,
+                 num_threads: Optional[int] = None):
+        """
+        Args:
+            manifest_path: Manifest written by OceanHazardModelTrainer.export_early_exit_model
+            pool_size: Interpreters per stage
+            num_threads: Threads per interpreter
+        """
+        self.manifest_path = Path(manifest_path)
+        with open(self.manifest_path, 'r') as f:
+            self.manifest = json.load(f)
+        
+        self.pools = [
+            TFLiteInterpreterPool(self.manifest_path.parent / stage['file'], pool_size, num_threads)
+            for stage in self.manifest['stages']
+        ]
+        self.cost_fractions = [stage['cost_fraction'] for stage in self.manifest['stages']]
+    
+    def __len__(self) -> int:
+        return len(self.pools)
+    
+    def run_stage(self, stage: int, inputs: np.ndarray
+                  ) -> Tuple[Optional[np.ndarray], np.ndarray, np.ndarray]:
+        """
+        Run one stage over a batch.
+        
+        Args:
+            stage: Stage index
+            inputs: Raw uint8 pixels for stage 0, else the previous stage's features
+        
+        Returns:
+            Tuple of (features for the next stage or None for the last stage,
+            hazard scores, AI detection scores)
+        """
+        outputs = self.pools[stage].run(inputs)
+        # Output order is not guaranteed by the converter; pick by rank and width
+        features = next((o for o in outputs if o.ndim == 4), None)
+        hazard = next(o for o in outputs if o.ndim == 2 and o.shape[-1] > 1)
+        ai = next(o for o in outputs if o.ndim == 2 and o.shape[-1] == 1)
+        return features, hazard, ai
+    
+    def describe(self) -> Dict[str, Any]:
+        """Get information about the stages."""
+        return {
+            'exit_layers': self.manifest.get('exit_layers', []),
+            'cost_fractions': self.cost_fractions,
+            'stages': [pool.describe() for pool in self.pools]
+        }
+
+
+class EarlyExitPolicy:
+    """Confidence thresholds deciding where each image leaves the model."""
+    
+    def __init__(self, hazard_threshold: float = 0.85, ai_margin: float = 0.35):
+        """
+        Args:
+            hazard_threshold: Minimum top hazard score to exit early
+            ai_margin: Minimum distance of the AI detection score from 0.5
+                to exit early (0.35 accepts scores below 0.15 or above 0.85)
+        """
+        self.hazard_threshold = hazard_threshold
+        self.ai_margin = ai_margin
+        
+        self._lock = threading.Lock()
+        self.stats = {
+            'images': 0,
+            'exits': {},
+            'compute_fraction': 0.0
+        }
+    
+    def accepts(self, hazard_scores: np.ndarray, ai_scores: np.ndarray) -> np.ndarray:
+        """
+        Which images are confident enough to exit.
+        
+        Args:
+            hazard_scores: Array of shape (N, num_classes)
+            ai_scores: Array of shape (N, 1)
+        
+        Returns:
+            Boolean array of shape (N,)
+        """
+        return ((np.max(hazard_scores, axis=1) >= self.hazard_threshold)
+                & (np.abs(ai_scores[:, 0] - 0.5) >= self.ai_margin))
+    
+    def exit_indices(self, hazard_outputs: List[np.ndarray],
+                     ai_outputs: List[np.ndarray]) -> np.ndarray:
+        """
+        Exit each image would take, given every head's outputs at once.
+        
+        Used to evaluate the policy offline from a single pass of the joint model.
+        
+        Args:
+            hazard_outputs: Hazard scores per exit, the final head last
+            ai_outputs: AI detection scores per exit, the final head last
+        
+        Returns:
+            Exit index per image
+        """
+        exits = np.full(len(hazard_outputs[0]), len(hazard_outputs) - 1)
+        for stage in reversed(range(len(hazard_outputs) - 1)):
+            exits[self.accepts(hazard_outputs[stage], ai_outputs[stage])] = stage
+        return exits
+    
+    def run(self, images: np.ndarray, stages: EarlyExitStages,
+            parse: Callable[[List[np.ndarray]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Predict a batch, stopping each image at the first confident exit.
+        
+        Args:
+            images: Batch of raw uint8 pixels
+            stages: Loaded stage interpreters
+            parse: Turns [hazard scores, AI scores] into prediction dictionaries
+        
+        Returns:
+            List of predictions in input order, each tagged with its exit
+            and the share of full-model compute it used
+        """
+        results = [None] * len(images)
+        remaining = np.arange(len(images))
+        inputs = images
+        exits = {}
+        compute = 0.0
+        
+        for stage in range(len(stages)):
+            features, hazard, ai = stages.run_stage(stage, inputs)
+            done = np.ones(len(remaining), dtype=bool) if features is None else self.accepts(hazard, ai)
+            
+            cost = stages.cost_fractions[stage]
+            for j, prediction in zip(np.flatnonzero(done), parse([hazard[done], ai[done]])):
+                prediction['exit'] = stage
+                prediction['compute_fraction'] = cost
+                results[remaining[j]] = prediction
+            exits[stage] = int(done.sum())
+            compute += cost * exits[stage]
+            
+            if done.all():
+                break
+            remaining = remaining[~done]
+            inputs = features[~done]
+        
+        with self._lock:
+            self.stats['images'] += len(images)
+            for stage, count in exits.items():
+                self.stats['exits'][stage] = self.stats['exits'].get(stage, 0) + count
+            self.stats['compute_fraction'] += compute
+        
+        return results
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Share of images per exit and the average compute saved."""
+        with self._lock:
+            stats = {**self.stats, 'exits': dict(self.stats['exits'])}
+        
+        images = stats['images']
+        average = stats['compute_fraction'] / images if images else 1.0
+        return {
+            'hazard_threshold': self.hazard_threshold,
+            'ai_margin': self.ai_margin,
+            'images': images,
+            'exits': {str(stage): count for stage, count in sorted(stats['exits'].items())},
+            'exit_rates': {
+                str(stage): count / images for stage, count in sorted(stats['exits'].items())
+            } if images else {},
+            'avg_compute_fraction': average,
+            'compute_saved': 1.0 - average
+        }
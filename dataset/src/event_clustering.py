@@ -0,0 +1,419 @@
+"""
+OceanWatch Sentinel - Hazard Event Clustering Module
+
+This module groups verified reports into hazard events as they arrive.
+Each hazard type keeps a sliding time window of recent report locations in
+a coarse grid; a new report is compared only with the reports in nearby
+cells, DBSCAN-style. A dense neighbourhood opens an event, later reports
+nearby grow it, and an event closes once a full window passes without a
+new report. Each change is emitted as an update straight away, so alerting
+never has to re-cluster the whole report history.
+"""
+
+import math
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from geo_index import KM_PER_DEGREE_LAT, Timestamp, haversine_km, to_epoch
+
+
+OPEN = 'open'
+GROW = 'grow'
+CLOSE = 'close'
+
+
+class _WindowPoint:
+    """A report inside the sliding window."""
+    
+    __slots__ = ('report_id', 'lat', 'lng', 'time', 'district', 'confidence', 'cell', 'event')
+    
+    def __init__(self, report_id: str, lat: float, lng: float, timestamp: float,
+                 district: Optional[str], confidence: Optional[float], cell: Tuple[int, int]):
+        self.report_id = report_id
+        self.lat = lat
+        self.lng = lng
+        self.time = timestamp
+        self.district = district
+        self.confidence = confidence
+        self.cell = cell
+        self.event = None
+
+
+class HazardEvent:
+    """A spatio-temporal cluster of verified reports of one hazard type."""
+    
+    def __init__(self, hazard_type: str, max_report_ids: int = 50):
+        self.event_id = uuid.uuid4().hex[:12]
+        self.hazard_type = hazard_type
+        self.reports = 0
+        self.lat_sum = 0.0
+        self.lng_sum = 0.0
+        self.bbox = [math.inf, math.inf, -math.inf, -math.inf]
+        self.first_seen = math.inf
+        self.last_seen = -math.inf
+        self.districts = Counter()
+        self.confidence_sum = 0.0
+        self.report_ids = deque(maxlen=max_report_ids)
+        self.status = OPEN
+        self.close_reason = None
+    
+    @property
+    def centroid(self) -> Tuple[float, float]:
+        return self.lat_sum / self.reports, self.lng_sum / self.reports
+    
+    def add(self, point: _WindowPoint):
+        """Count one report towards the event."""
+        point.event = self
+        self.reports += 1
+        self.lat_sum += point.lat
+        self.lng_sum += point.lng
+        self.bbox = [
+            min(self.bbox[0], point.lat), min(self.bbox[1], point.lng),
+            max(self.bbox[2], point.lat), max(self.bbox[3], point.lng)
+        ]
+        self.first_seen = min(self.first_seen, point.time)
+        self.last_seen = max(self.last_seen, point.time)
+        if point.district:
+            self.districts[point.district] += 1
+        if point.confidence is not None:
+            self.confidence_sum += point.confidence
+        self.report_ids.append(point.report_id)
+    
+    def absorb(self, other: 'HazardEvent'):
+        """Merge another event's totals into this one."""
+        self.reports += other.reports
+        self.lat_sum += other.lat_sum
+        self.lng_sum += other.lng_sum
+        self.bbox = [
+            min(self.bbox[0], other.bbox[0]), min(self.bbox[1], other.bbox[1]),
+            max(self.bbox[2], other.bbox[2]), max(self.bbox[3], other.bbox[3])
+        ]
+        self.first_seen = min(self.first_seen, other.first_seen)
+        self.last_seen = max(self.last_seen, other.last_seen)
+        self.districts.update(other.districts)
+        self.confidence_sum += other.confidence_sum
+        self.report_ids.extend(other.report_ids)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot of the event."""
+        lat, lng = self.centroid
+        return {
+            'event_id': self.event_id,
+            'hazard_type': self.hazard_type,
+            'status': self.status,
+            'close_reason': self.close_reason,
+            'reports': self.reports,
+            'centroid': {'lat': lat, 'lng': lng},
+            'bbox': self.bbox,
+            'first_seen': datetime.fromtimestamp(self.first_seen).isoformat(),
+            'last_seen': datetime.fromtimestamp(self.last_seen).isoformat(),
+            'duration_seconds': self.last_seen - self.first_seen,
+            'districts': dict(self.districts.most_common(5)),
+            'mean_confidence': self.confidence_sum / self.reports if self.reports else None,
+            'recent_report_ids': list(self.report_ids)
+        }
+
+
+class HazardEventClusterer:
+    """Incremental sliding-window density clustering of verified reports, per hazard type."""
+    
+    def __init__(self, radius_km: float = 5.0, window_seconds: float = 3600.0,
+                 min_reports: int = 5, max_points_per_type: int = 20000,
+                 max_closed_events: int = 100):
+        """
+        Args:
+            radius_km: Reports closer than this are neighbours
+            window_seconds: Reports older than this (relative to the newest
+                report) leave the window; an event with no report for this
+                long closes
+            min_reports: Reports within radius_km (including the new one)
+                needed to open an event
+            max_points_per_type: Window size cap per hazard type; the oldest
+                reports are dropped first, which bounds memory under bursts
+            max_closed_events: Closed events kept for get_events
+        """
+        self.radius_km = radius_km
+        self.window_seconds = window_seconds
+        self.min_reports = min_reports
+        self.max_points_per_type = max_points_per_type
+        
+        # Grid cells one radius tall, so neighbours are at most one cell away in latitude
+        self.cell_size = radius_km / KM_PER_DEGREE_LAT
+        
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Deque[_WindowPoint]] = {}
+        self._grids: Dict[str, Dict[Tuple[int, int], List[_WindowPoint]]] = {}
+        self._events: Dict[str, HazardEvent] = {}
+        self._closed: Deque[HazardEvent] = deque(maxlen=max_closed_events)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.clock = -math.inf
+        
+        self.stats = {
+            'reports': 0,
+            'late_reports': 0,
+            'unclustered_on_arrival': 0,
+            'dropped_points': 0,
+            'events_opened': 0,
+            'events_closed': 0,
+            'events_merged': 0,
+            'updates': 0,
+            'ingest_seconds': 0.0
+        }
+    
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Call callback(update) for every event update.
+        
+        Callbacks run on the thread that added the report, after the
+        clusterer's lock is released; they should hand off slow work.
+        """
+        self._listeners.append(callback)
+    
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lng / self.cell_size))
+    
+    def _neighbours(self, hazard_type: str, lat: float, lng: float) -> List[_WindowPoint]:
+        """Window reports of a hazard type within radius_km of a point."""
+        grid = self._grids.get(hazard_type)
+        if not grid:
+            return []
+        
+        # Longitude degrees shrink towards the poles, so search more cells east-west
+        cell_lat, cell_lng = self._cell(lat, lng)
+        lng_span = int(math.ceil(1.0 / max(math.cos(math.radians(min(abs(lat) + self.cell_size, 89.0))), 1e-6)))
+        candidates = [
+            point
+            for d_lat in (-1, 0, 1)
+            for d_lng in range(-lng_span, lng_span + 1)
+            for point in grid.get((cell_lat + d_lat, cell_lng + d_lng), ())
+        ]
+        if not candidates:
+            return []
+        
+        distances = haversine_km(
+            lat, lng,
+            np.fromiter((p.lat for p in candidates), dtype=np.float64, count=len(candidates)),
+            np.fromiter((p.lng for p in candidates), dtype=np.float64, count=len(candidates))
+        )
+        return [point for point, distance in zip(candidates, distances) if distance <= self.radius_km]
+    
+    def _update(self, kind: str, event: HazardEvent, report_id: Optional[str] = None,
+                **extra) -> Dict[str, Any]:
+        self.stats['updates'] += 1
+        return {
+            'type': kind,
+            'event': event.to_dict(),
+            'report_id': report_id,
+            'emitted_at': datetime.now().isoformat(),
+            **extra
+        }
+    
+    def _close(self, event: HazardEvent, reason: str) -> Dict[str, Any]:
+        event.status = 'closed'
+        event.close_reason = reason
+        self._events.pop(event.event_id, None)
+        self._closed.append(event)
+        self.stats['events_closed'] += 1
+        return self._update(CLOSE, event)
+    
+    def _expire(self, now: float) -> List[Dict[str, Any]]:
+        """Drop reports that left the window and close events that went quiet."""
+        cutoff = now - self.window_seconds
+        for hazard_type, window in self._windows.items():
+            grid = self._grids[hazard_type]
+            while window and (window[0].time < cutoff or len(window) >= self.max_points_per_type):
+                point = window.popleft()
+                if point.time >= cutoff:
+                    self.stats['dropped_points'] += 1
+                cell = grid[point.cell]
+                cell.remove(point)
+                if not cell:
+                    del grid[point.cell]
+        
+        return [
+            self._close(event, 'expired')
+            for event in list(self._events.values())
+            if event.last_seen < cutoff
+        ]
+    
+    def _notify(self, updates: List[Dict[str, Any]]):
+        for update in updates:
+            for callback in self._listeners:
+                try:
+                    callback(update)
+                except Exception as e:
+                    print(f"Error in hazard event listener: {e}")
+    
+    def add_report(self, report_id: str, lat: float, lng: float, hazard_type: str,
+                   timestamp: Timestamp = None, district: Optional[str] = None,
+                   confidence: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Add one verified report and update the events it touches.
+        
+        Args:
+            report_id: Hazard report id
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+            hazard_type: Verified hazard type
+            timestamp: Report time (ISO string, datetime or epoch seconds; now if missing)
+            district: District name, summarized per event
+            confidence: Verification confidence, averaged per event
+        
+        Returns:
+            Updates emitted: {'type': 'open' | 'grow' | 'close', 'event': {...}, ...}
+        """
+        start = time.perf_counter()
+        timestamp = to_epoch(timestamp)
+        if math.isnan(timestamp):
+            timestamp = time.time()
+        
+        with self._lock:
+            self.stats['reports'] += 1
+            self.clock = max(self.clock, timestamp)
+            updates = self._expire(self.clock)
+            
+            # Too old to fall inside the window
+            if timestamp < self.clock - self.window_seconds:
+                self.stats['late_reports'] += 1
+            else:
+                updates.extend(self._insert(report_id, lat, lng, hazard_type, timestamp, district, confidence))
+            self.stats['ingest_seconds'] += time.perf_counter() - start
+        
+        self._notify(updates)
+        return updates
+    
+    def _insert(self, report_id: str, lat: float, lng: float, hazard_type: str,
+                timestamp: float, district: Optional[str],
+                confidence: Optional[float]) -> List[Dict[str, Any]]:
+        """Place a report in the window and grow, open or merge events around it."""
+        neighbours = self._neighbours(hazard_type, lat, lng)
+        point = _WindowPoint(report_id, lat, lng, timestamp, district, confidence, self._cell(lat, lng))
+        self._windows.setdefault(hazard_type, deque()).append(point)
+        self._grids.setdefault(hazard_type, {}).setdefault(point.cell, []).append(point)
+        
+        updates = []
+        events = {p.event.event_id: p.event for p in neighbours if p.event is not None and p.event.status == OPEN}
+        dense = len(neighbours) + 1 >= self.min_reports
+        
+        if events:
+            # Join the oldest neighbouring event; a report bridging several merges them
+            event = min(events.values(), key=lambda e: e.first_seen)
+            for other in events.values():
+                if other is event:
+                    continue
+                event.absorb(other)
+                for window_point in self._windows[hazard_type]:
+                    if window_point.event is other:
+                        window_point.event = event
+                self.stats['events_merged'] += 1
+                updates.append(self._close(other, f'merged into {event.event_id}'))
+        elif dense:
+            event = HazardEvent(hazard_type)
+            self._events[event.event_id] = event
+            self.stats['events_opened'] += 1
+        else:
+            self.stats['unclustered_on_arrival'] += 1
+            return updates
+        
+        opened = event.reports == 0
+        event.add(point)
+        # A dense report also pulls in unclustered neighbours (density expansion)
+        if dense:
+            for neighbour in neighbours:
+                if neighbour.event is None:
+                    event.add(neighbour)
+        
+        updates.append(self._update(OPEN if opened else GROW, event, report_id))
+        return updates
+    
+    def add_result(self, report_id: str, location: Dict[str, Any],
+                   result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Add a verification result, if it is verified and located.
+        
+        Args:
+            report_id: Hazard report id
+            location: Location dictionary with 'lat', 'lng' and optionally 'district'/'city'
+            result: Result from AIVerificationService.verify_image
+        
+        Returns:
+            Updates emitted (empty for unverified or unlocated reports)
+        """
+        if result.get('status') != 'verified':
+            return []
+        if not location or location.get('lat') is None or location.get('lng') is None:
+            return []
+        
+        return self.add_report(
+            report_id,
+            float(location['lat']),
+            float(location['lng']),
+            result['hazard_detection']['detected_type'],
+            result.get('timestamp'),
+            location.get('district') or location.get('city'),
+            result.get('confidence')
+        )
+    
+    def advance(self, now: Timestamp = None) -> List[Dict[str, Any]]:
+        """
+        Move the window forward without a new report, closing quiet events.
+        
+        Call periodically so events close even when reports stop arriving.
+        
+        Args:
+            now: Current time (wall clock if missing)
+        
+        Returns:
+            Close updates emitted
+        """
+        now = to_epoch(now)
+        if math.isnan(now):
+            now = time.time()
+        
+        with self._lock:
+            self.clock = max(self.clock, now)
+            updates = self._expire(self.clock)
+        
+        self._notify(updates)
+        return updates
+    
+    def get_events(self, hazard_type: Optional[str] = None,
+                   include_closed: bool = False) -> List[Dict[str, Any]]:
+        """
+        Open (and optionally recently closed) events, largest first.
+        
+        Args:
+            hazard_type: Only events of this hazard type
+            include_closed: Also return the most recently closed events
+        
+        Returns:
+            Event snapshots
+        """
+        with self._lock:
+            events = list(self._events.values())
+            if include_closed:
+                events.extend(self._closed)
+            snapshots = [
+                event.to_dict() for event in events
+                if hazard_type is None or event.hazard_type == hazard_type
+            ]
+        return sorted(snapshots, key=lambda event: event['reports'], reverse=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, window sizes and ingest latency."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['open_events'] = len(self._events)
+            stats['window_points'] = {hazard_type: len(window) for hazard_type, window in self._windows.items()}
+        
+        stats['avg_ingest_ms'] = 1000.0 * stats['ingest_seconds'] / stats['reports'] if stats['reports'] else 0.0
+        stats['radius_km'] = self.radius_km
+        stats['window_seconds'] = self.window_seconds
+        stats['min_reports'] = self.min_reports
+        return stats
@@ -0,0 +1,327 @@
+"""
+OceanWatch Sentinel - Geospatial Index Module
+
+This module indexes annotation and report locations so nearby hazards can
+be found without scanning every record. Points are bucketed into a fixed
+lat/lng grid and kept in columnar NumPy arrays; queries visit only the
+covering cells and filter the candidates by distance, hazard type and time
+window in a single vectorised pass.
+"""
+
+import itertools
+import math
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+Timestamp = Union[float, str, datetime, None]
+
+
+def to_epoch(timestamp: Timestamp) -> float:
+    """Convert an ISO string, datetime or epoch seconds to epoch seconds (NaN if missing)."""
+    if timestamp is None or timestamp == '':
+        return math.nan
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return float(timestamp)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances in km from one point to arrays of points."""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """Grid-bucketed point index with bounding-box, radius and k-nearest queries."""
+    
+    def __init__(self, cell_size_deg: float = 0.1, initial_capacity: int = 4096):
+        """
+        Args:
+            cell_size_deg: Grid cell size in degrees (0.1 deg is about 11 km)
+            initial_capacity: Rows preallocated for the point columns
+        """
+        self.cell_size = cell_size_deg
+        self.count = 0
+        
+        self._lats = np.empty(initial_capacity, dtype=np.float64)
+        self._lngs = np.empty(initial_capacity, dtype=np.float64)
+        self._times = np.empty(initial_capacity, dtype=np.float64)
+        self._hazards = np.empty(initial_capacity, dtype=np.int16)
+        self._ids = []
+        self._known_ids = set()
+        
+        self._hazard_codes = {}
+        self._hazard_names = []
+        self._cells = {}
+        self._lock = threading.Lock()
+    
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        """Grid cell containing a point."""
+        return int(math.floor(lat / self.cell_size)), int(math.floor(lng / self.cell_size))
+    
+    def _grow(self):
+        """Double the capacity of the point columns."""
+        capacity = 2 * len(self._lats)
+        for name in ('_lats', '_lngs', '_times', '_hazards'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+    
+    def _hazard_code(self, hazard_type: Optional[str]) -> int:
+        """Small integer code for a hazard type (-1 for none)."""
+        if hazard_type is None:
+            return -1
+        code = self._hazard_codes.get(hazard_type)
+        if code is None:
+            code = len(self._hazard_names)
+            self._hazard_codes[hazard_type] = code
+            self._hazard_names.append(hazard_type)
+        return code
+    
+    def add(self, item_id: str, lat: float, lng: float,
+            hazard_type: Optional[str] = None, timestamp: Timestamp = None) -> bool:
+        """
+        Index one point.
+        
+        Args:
+            item_id: Annotation image_id or report id
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+            hazard_type: Hazard type used by query filters
+            timestamp: ISO string, datetime or epoch seconds
+        
+        Returns:
+            False if the item was already indexed
+        """
+        lat, lng = float(lat), float(lng)
+        epoch = to_epoch(timestamp)
+        
+        with self._lock:
+            if item_id in self._known_ids:
+                return False
+            if self.count == len(self._lats):
+                self._grow()
+            
+            row = self.count
+            self._lats[row] = lat
+            self._lngs[row] = lng
+            self._times[row] = epoch
+            self._hazards[row] = self._hazard_code(hazard_type)
+            self._ids.append(item_id)
+            self._known_ids.add(item_id)
+            self._cells.setdefault(self._cell(lat, lng), []).append(row)
+            self.count += 1
+        return True
+    
+    def add_annotation(self, annotation: Dict[str, Any]) -> bool:
+        """
+        Index an annotation from OceanHazardDataCollector.
+        
+        Annotations without a lat/lng location are skipped.
+        
+        Returns:
+            True if the annotation was added
+        """
+        location = annotation.get('location') or {}
+        if location.get('lat') is None or location.get('lng') is None:
+            return False
+        return self.add(
+            annotation['image_id'],
+            location['lat'],
+            location['lng'],
+            annotation.get('hazard_type'),
+            annotation.get('metadata', {}).get('timestamp')
+        )
+    
+    def add_annotations(self, annotations: Iterable[Dict[str, Any]]) -> int:
+        """Index many annotations; returns how many were added."""
+        return sum(self.add_annotation(annotation) for annotation in annotations)
+    
+    def _filter(self, rows: np.ndarray, hazard_types: Optional[Sequence[str]],
+                start: Timestamp, end: Timestamp) -> np.ndarray:
+        """Keep rows matching the hazard-type and time-window filters."""
+        mask = np.ones(len(rows), dtype=bool)
+        if hazard_types is not None:
+            codes = [self._hazard_codes[name] for name in hazard_types if name in self._hazard_codes]
+            mask &= np.isin(self._hazards[rows], codes)
+        if start is not None:
+            mask &= self._times[rows] >= to_epoch(start)
+        if end is not None:
+            mask &= self._times[rows] <= to_epoch(end)
+        return rows[mask]
+    
+    def _candidates(self, min_lat: float, min_lng: float,
+                    max_lat: float, max_lng: float) -> np.ndarray:
+        """Rows in the grid cells covering a bounding box."""
+        low_lat, low_lng = self._cell(min_lat, min_lng)
+        high_lat, high_lng = self._cell(max_lat, max_lng)
+        cell_count = (high_lat - low_lat + 1) * (high_lng - low_lng + 1)
+        
+        # A box covering more cells than are populated is cheaper as a full scan
+        if cell_count >= len(self._cells):
+            return np.arange(self.count)
+        
+        buckets = (
+            self._cells.get((cell_lat, cell_lng))
+            for cell_lat in range(low_lat, high_lat + 1)
+            for cell_lng in range(low_lng, high_lng + 1)
+        )
+        return np.fromiter(
+            itertools.chain.from_iterable(bucket for bucket in buckets if bucket), dtype=np.int64
+        )
+    
+    def query_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float,
+                   hazard_types: Optional[Sequence[str]] = None,
+                   start: Timestamp = None, end: Timestamp = None) -> List[str]:
+        """
+        Items inside a bounding box.
+        
+        Args:
+            min_lat, min_lng, max_lat, max_lng: Box corners in degrees
+            hazard_types: Only return these hazard types (optional)
+            start: Earliest timestamp (optional)
+            end: Latest timestamp (optional)
+        
+        Returns:
+            List of item ids
+        """
+        with self._lock:
+            rows = self._candidates(min_lat, min_lng, max_lat, max_lng)
+            lats, lngs = self._lats[rows], self._lngs[rows]
+            rows = rows[(lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)]
+            rows = self._filter(rows, hazard_types, start, end)
+            return [self._ids[row] for row in rows.tolist()]
+    
+    def query_radius(self, lat: float, lng: float, radius_km: float,
+                     hazard_types: Optional[Sequence[str]] = None,
+                     start: Timestamp = None, end: Timestamp = None) -> List[Tuple[str, float]]:
+        """
+        Items within a great-circle radius, nearest first.
+        
+        Args:
+            lat, lng: Centre in degrees
+            radius_km: Radius in kilometres
+            hazard_types: Only return these hazard types (optional)
+            start: Earliest timestamp (optional)
+            end: Latest timestamp (optional)
+        
+        Returns:
+            List of (item_id, distance_km)
+        """
+        lat_span = radius_km / KM_PER_DEGREE_LAT
+        lng_span = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        
+        with self._lock:
+            rows = self._candidates(lat - lat_span, lng - lng_span, lat + lat_span, lng + lng_span)
+            rows = self._filter(rows, hazard_types, start, end)
+            distances = haversine_km(lat, lng, self._lats[rows], self._lngs[rows])
+            inside = distances <= radius_km
+            rows, distances = rows[inside], distances[inside]
+            order = np.argsort(distances)
+            return [(self._ids[row], float(distances[i])) for i, row in zip(order.tolist(), rows[order].tolist())]
+    
+    def nearest(self, lat: float, lng: float, k: int = 10,
+                hazard_types: Optional[Sequence[str]] = None,
+                start: Timestamp = None, end: Timestamp = None,
+                max_radius_km: Optional[float] = None) -> List[Tuple[str, float]]:
+        """
+        The k items nearest to a point.
+        
+        Searches rings of grid cells outwards until k matches are found
+        that no unvisited cell could beat. Rings do not wrap across the
+        antimeridian.
+        
+        Args:
+            lat, lng: Query point in degrees
+            k: Number of items
+            hazard_types: Only return these hazard types (optional)
+            start: Earliest timestamp (optional)
+            end: Latest timestamp (optional)
+            max_radius_km: Ignore items further than this (optional)
+        
+        Returns:
+            List of (item_id, distance_km), nearest first
+        """
+        with self._lock:
+            if self.count == 0:
+                return []
+            
+            centre_lat, centre_lng = self._cell(lat, lng)
+            
+            found_rows = list(self._cells.get((centre_lat, centre_lng), ()))
+            ring = 0
+            while len(found_rows) < self.count:
+                # Anything in an unvisited cell is at least this far away
+                guaranteed_km = self._ring_min_km(centre_lat, ring)
+                if max_radius_km is not None and guaranteed_km >= max_radius_km:
+                    break
+                if len(found_rows) >= k:
+                    rows = self._filter(np.array(found_rows, dtype=np.int64), hazard_types, start, end)
+                    if len(rows) >= k:
+                        distances = haversine_km(lat, lng, self._lats[rows], self._lngs[rows])
+                        if np.partition(distances, k - 1)[k - 1] <= guaranteed_km:
+                            break
+                
+                ring += 1
+                if 8 * ring >= len(self._cells):
+                    # Sparse data: a full scan is cheaper than walking empty rings
+                    found_rows = range(self.count)
+                    break
+                for cell in self._ring_cells(centre_lat, centre_lng, ring):
+                    bucket = self._cells.get(cell)
+                    if bucket:
+                        found_rows.extend(bucket)
+            
+            rows = self._filter(np.array(found_rows, dtype=np.int64), hazard_types, start, end)
+            distances = haversine_km(lat, lng, self._lats[rows], self._lngs[rows])
+            if max_radius_km is not None:
+                inside = distances <= max_radius_km
+                rows, distances = rows[inside], distances[inside]
+            order = np.argsort(distances)[:k]
+            return [(self._ids[row], float(distances[i])) for i, row in zip(order.tolist(), rows[order].tolist())]
+    
+    def _ring_min_km(self, centre_lat: int, ring: int) -> float:
+        """
+        Lower bound on the distance from the centre cell to any cell outside a ring.
+        
+        Cells narrow towards the poles, so the longitude gap is measured at
+        the latitude furthest from the equator that the ring covers.
+        """
+        edge_lat = max(abs(centre_lat - ring), abs(centre_lat + ring + 1)) * self.cell_size
+        cell_km = self.cell_size * KM_PER_DEGREE_LAT * max(math.cos(math.radians(min(edge_lat, 90.0))), 1e-6)
+        return ring * cell_km
+    
+    @staticmethod
+    def _ring_cells(centre_lat: int, centre_lng: int, ring: int):
+        """Cells on the square ring at Chebyshev distance ring from a cell."""
+        for d_lng in range(-ring, ring + 1):
+            yield centre_lat - ring, centre_lng + d_lng
+            yield centre_lat + ring, centre_lng + d_lng
+        for d_lat in range(-ring + 1, ring):
+            yield centre_lat + d_lat, centre_lng - ring
+            yield centre_lat + d_lat, centre_lng + ring
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and grid occupancy."""
+        with self._lock:
+            cells = len(self._cells)
+            return {
+                'points': self.count,
+                'cells': cells,
+                'cell_size_deg': self.cell_size,
+                'avg_points_per_cell': self.count / cells if cells else 0.0,
+                'hazard_types': list(self._hazard_names)
+            }
@@ -0,0 +1,336 @@
+"""
+OceanWatch Sentinel - Inference Backends Module
+
+This module puts the runtimes that can serve the hazard model behind one
+interface: load, warm up, predict a batch, describe. TensorFlow Lite, Keras
+and (when installed) ONNX Runtime implementations all return raw head
+outputs, so AIVerificationService post-processes them along one path.
+BackendSelector benchmarks the loaded backends on this host and picks the
+fastest one whose outputs agree with the most precise one.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+from interpreter_pool import TFLiteInterpreterPool
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+# Model file each backend loads from a model directory
+MODEL_FILES = {
+    'tflite': "ocean_hazard_model.tflite",
+    'keras': "ocean_hazard_model.h5",
+    'onnx': "ocean_hazard_model.onnx"
+}
+
+
+def split_heads(outputs: Sequence[np.ndarray], num_classes: int
+                ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Pick the hazard and AI detection heads out of raw model outputs.
+    
+    Output order is not guaranteed by the TFLite or ONNX converters, so
+    heads are told apart by width.
+    
+    Args:
+        outputs: Raw output arrays
+        num_classes: Number of hazard classes
+    
+    Returns:
+        Tuple of (hazard scores (N, num_classes), AI scores (N, 1) or None
+        for a hazard-only model)
+    """
+    hazard = next(o for o in outputs if o.shape[-1] == num_classes)
+    ai = next((o for o in outputs if o.shape[-1] == 1), None)
+    return hazard, ai
+
+
+def normalize_pixels(images: np.ndarray, buffers: threading.local, min_rows: int = 0) -> np.ndarray:
+    """
+    Scale a raw uint8 batch to float32 in [0, 1] inside a reused per-thread buffer.
+    
+    Uses the same float32 math as AIVerificationService._normalize, so
+    every float backend sees identical inputs.
+    
+    Args:
+        images: Raw uint8 batch, or an already preprocessed float batch
+            (returned unchanged)
+        buffers: Thread-local storage holding the buffer between calls
+        min_rows: Batch size to allocate at least, so a growing batch
+            does not reallocate on every call
+    
+    Returns:
+        Normalized batch; a view of the buffer, valid until the same thread
+        normalizes its next batch
+    """
+    if images.dtype != np.uint8:
+        return images
+    buffer = getattr(buffers, 'floats', None)
+    if buffer is None or len(buffer) < len(images) or buffer.shape[1:] != images.shape[1:]:
+        buffer = np.empty((max(len(images), min_rows), *images.shape[1:]), dtype=np.float32)
+        buffers.floats = buffer
+    buffer = buffer[:len(images)]
+    buffer[...] = images
+    return np.divide(buffer, np.float32(255.0), out=buffer)
+
+
+class InferenceBackend:
+    """A loaded model mapping a batch of pixels to raw head outputs."""
+    
+    name = 'base'
+    
+    def __init__(self, path: str, num_threads: Optional[int] = None):
+        """
+        Args:
+            path: Model file
+            num_threads: Threads the runtime may use (runtime default if None)
+        """
+        self.path = Path(path)
+        self.num_threads = num_threads
+        self._buffers = threading.local()
+    
+    @classmethod
+    def available(cls) -> bool:
+        """Whether the runtime is installed."""
+        return True
+    
+    def load(self) -> 'InferenceBackend':
+        """Load the model; returns self."""
+        raise NotImplementedError
+    
+    def predict(self, images: np.ndarray) -> List[np.ndarray]:
+        """
+        Run one forward pass.
+        
+        Args:
+            images: Batch of shape (N, 224, 224, 3), either raw uint8 pixels
+                or preprocessed float32 in [0, 1]
+        
+        Returns:
+            Raw output arrays, in no particular order
+        """
+        raise NotImplementedError
+    
+    def warm_up(self, batch_size: int = 1, input_size: Tuple[int, int] = (224, 224)) -> float:
+        """Run a synthetic batch to pay allocation and tracing costs; returns seconds taken."""
+        start = time.perf_counter()
+        self.predict(np.random.randint(0, 256, (batch_size, *input_size, 3), dtype=np.uint8))
+        return time.perf_counter() - start
+    
+    def describe(self) -> Dict[str, Any]:
+        """Get information about the loaded model."""
+        return {'path': str(self.path)}
+
+
+class TFLiteBackend(InferenceBackend):
+    """Quantized TensorFlow Lite model on a pool of interpreters."""
+    
+    name = 'tflite'
+    
+    def __init__(self, path: str, num_threads: Optional[int] = None, pool_size: int = 1):
+        """
+        Args:
+            path: .tflite file
+            num_threads: Threads per interpreter
+            pool_size: Interpreters, one per concurrent caller
+        """
+        super().__init__(path, num_threads)
+        self.pool_size = pool_size
+        self.pool = None
+    
+    def load(self) -> 'TFLiteBackend':
+        self.pool = TFLiteInterpreterPool(self.path, pool_size=self.pool_size, num_threads=self.num_threads)
+        return self
+    
+    def predict(self, images: np.ndarray) -> List[np.ndarray]:
+        # Raw pixels go straight into the quantized input tensor
+        return self.pool.run(images)
+    
+    def warm_up(self, batch_size: int = 1, input_size: Tuple[int, int] = (224, 224)) -> float:
+        # Every pooled interpreter is resized and allocated
+        return sum(InferenceBackend.warm_up(self, batch_size, input_size) for _ in range(self.pool_size))
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'input_shape': self.pool.input_details[0]['shape'].tolist(),
+            'input_type': str(self.pool.input_details[0]['dtype']),
+            'output_count': len(self.pool.output_details),
+            **self.pool.describe()
+        }
+
+
+class KerasBackend(InferenceBackend):
+    """Full-precision Keras model."""
+    
+    name = 'keras'
+    
+    def __init__(self, path: str, num_threads: Optional[int] = None):
+        super().__init__(path, num_threads)
+        self.model = None
+    
+    def load(self) -> 'KerasBackend':
+        self.model = keras.models.load_model(str(self.path))
+        return self
+    
+    def predict(self, images: np.ndarray) -> List[np.ndarray]:
+        outputs = self.model.predict_on_batch(normalize_pixels(images, self._buffers))
+        if not isinstance(outputs, (list, tuple)):
+            outputs = [outputs]
+        return [np.asarray(output) for output in outputs]
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'input_shape': self.model.input_shape,
+            'output_shape': self.model.output_shape,
+            'parameters': self.model.count_params()
+        }
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime session on the CPU execution provider."""
+    
+    name = 'onnx'
+    
+    def __init__(self, path: str, num_threads: Optional[int] = None):
+        super().__init__(path, num_threads)
+        self.session = None
+        self.input_name = None
+    
+    @classmethod
+    def available(cls) -> bool:
+        return ort is not None
+    
+    def load(self) -> 'OnnxBackend':
+        if ort is None:
+            raise ImportError("onnxruntime is not installed")
+        options = ort.SessionOptions()
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.session = ort.InferenceSession(str(self.path), options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        return self
+    
+    def predict(self, images: np.ndarray) -> List[np.ndarray]:
+        # Sessions are safe to run from several threads at once
+        return self.session.run(None, {self.input_name: normalize_pixels(images, self._buffers)})
+    
+    def describe(self) -> Dict[str, Any]:
+        session_input = self.session.get_inputs()[0]
+        return {
+            'input_shape': session_input.shape,
+            'input_type': session_input.type,
+            'output_count': len(self.session.get_outputs()),
+            'providers': self.session.get_providers(),
+            'num_threads': self.num_threads
+        }
+
+
+BACKENDS = {
+    'tflite': TFLiteBackend,
+    'keras': KerasBackend,
+    'onnx': OnnxBackend
+}
+
+
+class BackendSelector:
+    """Picks the fastest backend on this host whose outputs agree with the reference."""
+    
+    def __init__(self, batch_size: int = 8, rounds: int = 5, tolerance: float = 0.1,
+                 reference_order: Tuple[str, ...] = ('keras', 'onnx', 'tflite'),
+                 sample_images: Optional[np.ndarray] = None):
+        """
+        Args:
+            batch_size: Images per benchmark batch
+            rounds: Timed batches per backend (the median is compared)
+            tolerance: Largest absolute difference in any hazard or AI
+                score, against the reference, that still counts as agreeing
+            reference_order: Most precise backend first; the first loaded
+                one is the reference
+            sample_images: Representative uint8 images to benchmark and
+                compare on (random pixels if omitted)
+        """
+        self.batch_size = batch_size
+        self.rounds = rounds
+        self.tolerance = tolerance
+        self.reference_order = reference_order
+        self.sample_images = sample_images
+    
+    def _images(self, input_size: Tuple[int, int]) -> np.ndarray:
+        """The benchmark batch."""
+        if self.sample_images is not None and len(self.sample_images):
+            return np.resize(self.sample_images, (self.batch_size, *self.sample_images.shape[1:]))
+        rng = np.random.default_rng(0)
+        return rng.integers(0, 256, (self.batch_size, *input_size, 3), dtype=np.uint8)
+    
+    def select(self, backends: Dict[str, InferenceBackend], num_classes: int,
+               input_size: Tuple[int, int] = (224, 224)) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        Benchmark backends and choose one.
+        
+        Args:
+            backends: Loaded backends by name
+            num_classes: Number of hazard classes
+            input_size: Model input size
+        
+        Returns:
+            Tuple of (chosen backend name or None, per-backend report)
+        """
+        images = self._images(input_size)
+        report = {
+            'batch_size': len(images),
+            'rounds': self.rounds,
+            'tolerance': self.tolerance,
+            'reference': None,
+            'backends': {}
+        }
+        
+        heads = {}
+        for name, backend in backends.items():
+            try:
+                # Allocation / tracing at this batch size is not timed
+                backend.warm_up(len(images), input_size)
+                timings = []
+                for _ in range(self.rounds):
+                    start = time.perf_counter()
+                    outputs = backend.predict(images)
+                    timings.append(time.perf_counter() - start)
+                heads[name] = split_heads(outputs, num_classes)
+                ms_per_batch = 1000.0 * float(np.median(timings))
+                report['backends'][name] = {
+                    'ms_per_batch': ms_per_batch,
+                    'ms_per_image': ms_per_batch / len(images)
+                }
+            except Exception as e:
+                print(f"Error benchmarking {name} backend: {e}")
+                report['backends'][name] = {'error': str(e)}
+        
+        reference = next((name for name in self.reference_order if name in heads), None)
+        if reference is None:
+            return None, report
+        report['reference'] = reference
+        reference_hazard, reference_ai = heads[reference]
+        
+        for name, (hazard, ai) in heads.items():
+            diff = float(np.max(np.abs(hazard - reference_hazard)))
+            if ai is not None and reference_ai is not None:
+                diff = max(diff, float(np.max(np.abs(ai - reference_ai))))
+            top_agreement = float(np.mean(np.argmax(hazard, axis=1) == np.argmax(reference_hazard, axis=1)))
+            report['backends'][name].update({
+                'max_abs_diff': diff,
+                'top1_agreement': top_agreement,
+                'agrees': diff <= self.tolerance
+            })
+        
+        candidates = [name for name in heads if report['backends'][name]['agrees']]
+        chosen = min(candidates, key=lambda name: report['backends'][name]['ms_per_batch'])
+        report['selected'] = chosen
+        return chosen, report
@@ -0,0 +1,191 @@
+"""
+OceanWatch Sentinel - TFLite Interpreter Pool
+
+This module provides a thread-safe pool of pre-allocated TensorFlow Lite
+interpreters. A single tf.lite.Interpreter must not be invoked from several
+threads at once, so each concurrent verification checks out its own.
+"""
+
+import queue
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+
+
+class TFLiteInterpreterPool:
+    """Pool of identical TFLite interpreters with checkout/return semantics."""
+    
+    def __init__(self, model_path: str, pool_size: int = 1,
+                 num_threads: Optional[int] = None):
+        self.model_path = Path(model_path)
+        self.pool_size = max(1, pool_size)
+        self.num_threads = num_threads
+        
+        self._available = queue.Queue()
+        self._batch_sizes = {}
+        
+        for _ in range(self.pool_size):
+            interpreter = tf.lite.Interpreter(
+                model_path=str(self.model_path),
+                num_threads=num_threads
+            )
+            interpreter.allocate_tensors()
+            self._batch_sizes[id(interpreter)] = int(interpreter.get_input_details()[0]['shape'][0])
+            self._available.put(interpreter)
+        
+        # Tensor indices and dtypes are identical across the pool, cache them once
+        probe = self.acquire()
+        try:
+            self.input_details = probe.get_input_details()
+            self.output_details = probe.get_output_details()
+        finally:
+            self.release(probe)
+    
+        self.input_dtype = self.input_details[0]['dtype']
+        self.input_lut = self._build_input_lut()
+        self.input_mode = self._describe_input_mode()
+    
+    def _build_input_lut(self) -> Optional[np.ndarray]:
+        """
+        Map raw uint8 pixels straight to quantized input values.
+        
+        Returns:
+            256-entry lookup table, or None when pixels can be fed as-is
+            (uint8 input with scale 1/255 and zero point 0) or the input is float
+        """
+        if self.input_dtype not in (np.uint8, np.int8):
+            return None
+        
+        scale, zero_point = self.input_details[0]['quantization']
+        if not scale:
+            return None
+        
+        # The model was trained on pixels / 255.0
+        limits = np.iinfo(self.input_dtype)
+        lut = np.round(np.arange(256, dtype=np.float64) / 255.0 / scale + zero_point)
+        lut = np.clip(lut, limits.min, limits.max).astype(self.input_dtype)
+        
+        if self.input_dtype == np.uint8 and np.array_equal(lut, np.arange(256)):
+            return None
+        return lut
+    
+    def _describe_input_mode(self) -> str:
+        """Name of the preprocessing path used for this model's input."""
+        if self.input_dtype not in (np.uint8, np.int8):
+            return 'float'
+        return 'raw_uint8' if self.input_lut is None else 'lut'
+    
+    def acquire(self, timeout: Optional[float] = None) -> tf.lite.Interpreter:
+        """
+        Check out an interpreter, blocking until one is free.
+        
+        Args:
+            timeout: Seconds to wait before giving up (None waits forever)
+        
+        Returns:
+            An interpreter owned by the caller until release()
+        """
+        try:
+            return self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No TFLite interpreter available after {timeout}s")
+    
+    def release(self, interpreter: tf.lite.Interpreter):
+        """Return a checked-out interpreter to the pool."""
+        self._available.put(interpreter)
+    
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Context manager wrapping acquire()/release()."""
+        interpreter = self.acquire(timeout)
+        try:
+            yield interpreter
+        finally:
+            self.release(interpreter)
+    
+    def _ensure_batch_size(self, interpreter: tf.lite.Interpreter, batch_size: int):
+        """Resize an interpreter's input to the batch dimension if needed."""
+        if self._batch_sizes[id(interpreter)] == batch_size:
+            return
+        
+        input_shape = list(self.input_details[0]['shape'])
+        input_shape[0] = batch_size
+        interpreter.resize_tensor_input(self.input_details[0]['index'], input_shape)
+        interpreter.allocate_tensors()
+        self._batch_sizes[id(interpreter)] = batch_size
+    
+    def _quantize_float(self, images: np.ndarray) -> np.ndarray:
+        """Quantize a float batch normalized to [0, 1] to the input dtype."""
+        scale, zero_point = self.input_details[0]['quantization']
+        limits = np.iinfo(self.input_dtype)
+        quantized = np.round(images / scale + zero_point)
+        return np.clip(quantized, limits.min, limits.max).astype(self.input_dtype)
+    
+    def dequantize(self, output: np.ndarray, detail: Dict[str, Any]) -> np.ndarray:
+        """Convert a quantized output tensor back to real values."""
+        scale, zero_point = detail['quantization']
+        if detail['dtype'] in (np.uint8, np.int8) and scale:
+            return (output.astype(np.float32) - zero_point) * scale
+        return output
+    
+    def _fill_input(self, buffer: np.ndarray, images: np.ndarray):
+        """Convert a batch to the model's input dtype inside the input buffer."""
+        raw_pixels = images.dtype == np.uint8
+        
+        if self.input_mode == 'float':
+            buffer[...] = images
+            if raw_pixels:
+                np.divide(buffer, np.float32(255.0), out=buffer)
+        elif not raw_pixels:
+            buffer[...] = self._quantize_float(images)
+        elif self.input_lut is not None:
+            # Map pixels through the lookup table
+            np.take(self.input_lut, images, out=buffer)
+        else:
+            buffer[...] = images
+    
+    def run(self, images: np.ndarray, timeout: Optional[float] = None) -> List[np.ndarray]:
+        """
+        Run one forward pass on a free interpreter.
+        
+        For quantized models, raw uint8 pixels go into the interpreter's own
+        input buffer without any float work.
+        
+        Args:
+            images: Batch of raw RGB uint8 pixels, or float32 normalized to [0, 1]
+            timeout: Seconds to wait for a free interpreter
+        
+        Returns:
+            List of dequantized output arrays, in output_details order
+        """
+        with self.checkout(timeout) as interpreter:
+            self._ensure_batch_size(interpreter, len(images))
+            
+            # Write straight into the interpreter's preallocated input tensor;
+            # the view must be released before invoke()
+            self._fill_input(interpreter.tensor(self.input_details[0]['index'])(), images)
+            interpreter.invoke()
+            
+            # get_tensor returns copies, safe to use after the interpreter is returned
+            outputs = [
+                interpreter.get_tensor(detail['index'])
+                for detail in self.output_details
+            ]
+        
+        return [
+            self.dequantize(output, detail)
+            for output, detail in zip(outputs, self.output_details)
+        ]
+    
+    def describe(self) -> Dict[str, Any]:
+        """Get information about the pool."""
+        return {
+            'pool_size': self.pool_size,
+            'num_threads': self.num_threads,
+            'input_mode': self.input_mode,
+            'input_quantization': [float(q) for q in self.input_details[0]['quantization']],
+            'available': self._available.qsize()
+        }
@@ -0,0 +1,283 @@
+"""
+OceanWatch Sentinel - Model Registry Module
+
+This module keeps versioned copies of exported models on the local
+filesystem. Each version is an immutable directory with checksums in a
+manifest, and the manifest's "active" pointer tells verification workers
+which version to serve. Publishing and activation are atomic renames, so a
+worker never loads a half-written model.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: Path) -> str:
+    """Compute the SHA-256 checksum of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """Versioned model store with a manifest, checksums and an active pointer."""
+    
+    def __init__(self, root: str = "dataset/models/registry"):
+        self.root = Path(root)
+        self.versions_path = self.root / "versions"
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.versions_path.mkdir(parents=True, exist_ok=True)
+        
+        # Serialises writers in this process; the manifest itself is replaced atomically
+        self._lock = threading.Lock()
+    
+    def read_manifest(self) -> Dict[str, Any]:
+        """Load the manifest, or an empty one if nothing was published yet."""
+        if not self.manifest_path.exists():
+            return {'versions': {}, 'active': None, 'history': [], 'shadow': None}
+        
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+    
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        """Atomically replace the manifest."""
+        tmp_path = self.root / f".{MANIFEST_NAME}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _next_version(self, manifest: Dict[str, Any]) -> str:
+        """Next sequential version name (v0001, v0002, ...)."""
+        numbers = [
+            int(name[1:]) for name in manifest['versions']
+            if name.startswith('v') and name[1:].isdigit()
+        ]
+        return f"v{max(numbers, default=0) + 1:04d}"
+    
+    def publish(self, model_files: Union[List[str], Dict[str, str]], version: Optional[str] = None,
+                metadata: Optional[Dict[str, Any]] = None,
+                activate: bool = False) -> str:
+        """
+        Copy model files into a new immutable version.
+        
+        Args:
+            model_files: Paths of the files to publish (e.g. .tflite and .h5),
+                or a mapping of the file name to store each one under to its path
+            version: Version name (defaults to the next sequential one)
+            metadata: Extra information stored in the manifest
+            activate: Whether to make the new version active
+        
+        Returns:
+            The published version name
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+            version = version or self._next_version(manifest)
+            if version in manifest['versions']:
+                raise ValueError(f"Model version already exists: {version}")
+            
+            # Stage into a temporary directory, then rename into place
+            staging = self.versions_path / f".staging-{uuid.uuid4().hex}"
+            staging.mkdir(parents=True)
+            try:
+                if not isinstance(model_files, dict):
+                    model_files = {Path(src).name: src for src in model_files}
+                files = {}
+                for name, src in model_files.items():
+                    dest = staging / name
+                    shutil.copyfile(src, dest)
+                    with open(dest, 'rb') as f:
+                        os.fsync(f.fileno())
+                    files[name] = {
+                        'sha256': file_sha256(dest),
+                        'size': dest.stat().st_size
+                    }
+                os.replace(staging, self.versions_path / version)
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            
+            manifest['versions'][version] = {
+                'created': datetime.now().isoformat(),
+                'files': files,
+                'metadata': metadata or {}
+            }
+            self._write_manifest(manifest)
+        
+        print(f"Published model version {version} ({len(files)} file(s))")
+        
+        if activate:
+            self.activate(version)
+        return version
+    
+    def version_path(self, version: str) -> Path:
+        """Directory holding a version's files."""
+        return self.versions_path / version
+    
+    def list_versions(self) -> List[str]:
+        """All published versions, oldest first."""
+        return sorted(self.read_manifest()['versions'])
+    
+    def active_version(self) -> Optional[str]:
+        """Currently active version, if any."""
+        return self.read_manifest()['active']
+    
+    def shadow_version(self) -> Optional[str]:
+        """Version being shadow-scored on live traffic, if any."""
+        return self.read_manifest().get('shadow')
+    
+    def verify(self, version: str) -> bool:
+        """
+        Check a version's files against the manifest checksums.
+        
+        Args:
+            version: Version name
+        
+        Returns:
+            True if every file exists and matches its checksum
+        """
+        entry = self.read_manifest()['versions'].get(version)
+        if entry is None:
+            return False
+        
+        for name, info in entry['files'].items():
+            path = self.version_path(version) / name
+            if not path.exists() or path.stat().st_size != info['size']:
+                return False
+            if file_sha256(path) != info['sha256']:
+                return False
+        return True
+    
+    def activate(self, version: str):
+        """
+        Point the registry at a version after verifying its checksums.
+        
+        Args:
+            version: Version name
+        """
+        if not self.verify(version):
+            raise ValueError(f"Model version {version} is missing or fails checksum verification")
+        
+        with self._lock:
+            manifest = self.read_manifest()
+            if manifest['active'] == version:
+                return
+            if manifest['active'] is not None:
+                manifest['history'].append(manifest['active'])
+            manifest['active'] = version
+            if manifest.get('shadow') == version:
+                manifest['shadow'] = None
+            self._write_manifest(manifest)
+        
+        print(f"Activated model version {version}")
+    
+    def rollback(self) -> str:
+        """
+        Re-activate the previously active version.
+        
+        Returns:
+            The version rolled back to
+        """
+        with self._lock:
+            manifest = self.read_manifest()
+            if not manifest['history']:
+                raise ValueError("No previous model version to roll back to")
+            
+            version = manifest['history'][-1]
+            if not self.verify(version):
+                raise ValueError(f"Model version {version} is missing or fails checksum verification")
+            
+            manifest['history'].pop()
+            manifest['active'] = version
+            self._write_manifest(manifest)
+        
+        print(f"Rolled back to model version {version}")
+        return version
+    
+    def set_shadow(self, version: Optional[str]):
+        """
+        Shadow-score a candidate version on live traffic (None to stop).
+        
+        Args:
+            version: Candidate version name, or None
+        """
+        if version is not None and not self.verify(version):
+            raise ValueError(f"Model version {version} is missing or fails checksum verification")
+        
+        with self._lock:
+            manifest = self.read_manifest()
+            manifest['shadow'] = version
+            self._write_manifest(manifest)
+
+
+class RegistryWatcher:
+    """Polls a registry and reports changes to the active/shadow versions."""
+    
+    def __init__(self, registry: ModelRegistry,
+                 on_change: Callable[[Optional[str], Optional[str]], None],
+                 poll_interval: float = 5.0):
+        self.registry = registry
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        
+        self._seen = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def check(self) -> bool:
+        """
+        Compare the registry against the last seen state once.
+        
+        Returns:
+            True if on_change was called
+        """
+        try:
+            manifest = self.registry.read_manifest()
+        except (OSError, ValueError) as e:
+            print(f"Error reading model registry manifest: {e}")
+            return False
+        
+        state = (manifest['active'], manifest.get('shadow'))
+        if state == self._seen:
+            return False
+        
+        try:
+            self.on_change(*state)
+        except Exception as e:
+            # Leave _seen unchanged so the swap is retried on the next poll
+            print(f"Error applying model registry change {state}: {e}")
+            return False
+        
+        self._seen = state
+        return True
+    
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+    
+    def start(self):
+        """Start polling in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-registry-watcher", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop polling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -6,7 +6,9 @@ Based on TinyCamML Flood-Model approach with MobileNetV2 backbone.
 """
 
 import os
+import re
 import json
+import time
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
@@ -18,10 +20,26 @@ from sklearn.metrics import classification_report, confusion_matrix
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import cv2
 from PIL import Image
 
+from annotation_snapshots import TRAINING_COLUMNS, read_snapshot
+from early_exit import EARLY_EXIT_MANIFEST, EarlyExitPolicy
+from inference_backends import MODEL_FILES
+from model_registry import ModelRegistry
+
+try:
+    import tf2onnx
+except ImportError:
+    tf2onnx = None
+
+
+# Backbone outputs the early-exit heads branch from. Nothing else crosses
+# these cuts (the next blocks downsample without a residual), so the
+# backbone splits cleanly into stages there
+EARLY_EXIT_LAYERS = ('block_5_add', 'block_12_add')
+
 
 class OceanHazardModelTrainer:
     """Trains AI models for ocean hazard detection and verification."""
@@ -31,6 +49,10 @@ class OceanHazardModelTrainer:
         self.model_path = Path(model_path)
         self.model_path.mkdir(parents=True, exist_ok=True)
         
+        # Artifacts written by this trainer, keyed by the file name the
+        # verification service loads them under; publish_to_registry ships these
+        self.exported_files = {}
+        
         # Model parameters
         self.input_shape = (224, 224, 3)
         self.num_hazard_classes = 9
@@ -92,21 +114,7 @@ class OceanHazardModelTrainer:
             )
             
             # Compile with multiple losses
-            model.compile(
-                optimizer=optimizers.Adam(learning_rate=self.learning_rate),
-                loss={
-                    'hazard_classification': 'categorical_crossentropy',
-                    'ai_detection': 'binary_crossentropy'
-                },
-                loss_weights={
-                    'hazard_classification': 1.0,
-                    'ai_detection': 0.5
-                },
-                metrics={
-                    'hazard_classification': 'accuracy',
-                    'ai_detection': 'accuracy'
-                }
-            )
+            self._compile_multi_output(model, self.learning_rate)
         else:
             # Single output model
             model = models.Model(
@@ -122,16 +130,166 @@ class OceanHazardModelTrainer:
         
         return model
     
-    def prepare_data(self, annotations: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    def _compile_multi_output(self, model: keras.Model, learning_rate: float):
+        """Compile a hazard + AI detection model with the standard losses."""
+        model.compile(
+            optimizer=optimizers.Adam(learning_rate=learning_rate),
+            loss={
+                'hazard_classification': 'categorical_crossentropy',
+                'ai_detection': 'binary_crossentropy'
+            },
+            loss_weights={
+                'hazard_classification': 1.0,
+                'ai_detection': 0.5
+            },
+            metrics={
+                'hazard_classification': 'accuracy',
+                'ai_detection': 'accuracy'
+            }
+        )
+    
+    def _add_heads(self, features, num_classes: int, prefix: str = '',
+                   hazard_units: int = 128, ai_units: int = 64) -> List:
+        """Pooled hazard classification and AI detection heads on a feature map."""
+        # Exit head layers are all prefixed so their cost can be told apart
+        name = lambda suffix: f"{prefix}{suffix}" if prefix else None
+        
+        x = layers.GlobalAveragePooling2D(name=name('pool'))(features)
+        x = layers.Dropout(0.2, name=name('dropout'))(x)
+        
+        hazard_output = layers.Dense(hazard_units, activation='relu', name=name('hazard_dense'))(x)
+        hazard_output = layers.Dropout(0.3, name=name('hazard_dropout'))(hazard_output)
+        hazard_output = layers.Dense(num_classes, activation='softmax', name=f'{prefix}hazard_classification')(hazard_output)
+        
+        ai_output = layers.Dense(ai_units, activation='relu', name=name('ai_dense'))(x)
+        ai_output = layers.Dropout(0.2, name=name('ai_dropout'))(ai_output)
+        ai_output = layers.Dense(1, activation='sigmoid', name=f'{prefix}ai_detection')(ai_output)
+        return [hazard_output, ai_output]
+    
+    def create_early_exit_model(self, num_classes: int = 9,
+                                exit_layers: Tuple[str, ...] = EARLY_EXIT_LAYERS,
+                                exit_loss_weight: float = 0.5) -> keras.Model:
+        """
+        Create the early-exit variant of the hazard detection model.
+        
+        Smaller hazard_classification/ai_detection heads (outputs named
+        exit1_..., exit2_...) are attached to intermediate backbone blocks and
+        trained jointly with the final heads, so confident images can be
+        answered without running the whole backbone.
+        
+        Args:
+            num_classes: Number of hazard classes
+            exit_layers: Backbone layers the exit heads branch from, shallowest first
+            exit_loss_weight: Loss weight of the exit heads relative to the final heads
+        
+        Returns:
+            Compiled Keras model with outputs for every exit, the final heads last
+        """
+        base_model = MobileNetV2(
+            input_shape=self.input_shape,
+            include_top=False,
+            weights='imagenet'
+        )
+        base_model.trainable = False
+        
+        outputs = []
+        for stage, layer_name in enumerate(exit_layers, start=1):
+            outputs.extend(self._add_heads(
+                base_model.get_layer(layer_name).output, num_classes,
+                prefix=f'exit{stage}_', hazard_units=64, ai_units=32
+            ))
+        outputs.extend(self._add_heads(base_model.output, num_classes))
+        
+        model = models.Model(inputs=base_model.input, outputs=outputs)
+        self._compile_early_exit(model, self.learning_rate, exit_loss_weight)
+        return model
+    
+    def _compile_early_exit(self, model: keras.Model, learning_rate: float,
+                            exit_loss_weight: float = 0.5):
+        """Compile an early-exit model; exit heads use the standard losses, down-weighted."""
+        losses, loss_weights, metrics = {}, {}, {}
+        for name in model.output_names:
+            is_hazard = name.endswith('hazard_classification')
+            losses[name] = 'categorical_crossentropy' if is_hazard else 'binary_crossentropy'
+            loss_weights[name] = (1.0 if is_hazard else 0.5) * (exit_loss_weight if name.startswith('exit') else 1.0)
+            metrics[name] = 'accuracy'
+        
+        model.compile(
+            optimizer=optimizers.Adam(learning_rate=learning_rate),
+            loss=losses,
+            loss_weights=loss_weights,
+            metrics=metrics
+        )
+    
+    @staticmethod
+    def _early_exit_targets(model: keras.Model, hazard_labels: np.ndarray,
+                            ai_labels: np.ndarray) -> Dict[str, np.ndarray]:
+        """The same labels for every exit of an early-exit model."""
+        return {
+            name: hazard_labels if name.endswith('hazard_classification') else ai_labels
+            for name in model.output_names
+        }
+    
+    @staticmethod
+    def _layer_macs(layer: layers.Layer) -> int:
+        """Multiply-accumulates of one forward pass through a layer, per image."""
+        if isinstance(layer, layers.DepthwiseConv2D):
+            kernel_h, kernel_w, channels, multiplier = layer.kernel.shape
+            _, height, width, _ = layer.output.shape
+            return height * width * kernel_h * kernel_w * channels * multiplier
+        if isinstance(layer, layers.Conv2D):
+            kernel_h, kernel_w, channels, filters = layer.kernel.shape
+            _, height, width, _ = layer.output.shape
+            return height * width * kernel_h * kernel_w * channels * filters
+        if isinstance(layer, layers.Dense):
+            return int(np.prod(layer.kernel.shape))
+        return 0
+    
+    def exit_cost_fractions(self, model: keras.Model,
+                            exit_layers: Tuple[str, ...] = EARLY_EXIT_LAYERS) -> List[float]:
+        """
+        Compute spent by an image leaving at each exit, as a share of the plain model.
+        
+        Args:
+            model: Early-exit model
+            exit_layers: Backbone layers the exit heads branch from
+        
+        Returns:
+            Cumulative cost fraction per exit, the final heads last (slightly
+            above 1.0, since the earlier exit heads ran too)
+        """
+        cut_blocks = [self._block_index(name) for name in exit_layers]
+        stage_macs = np.zeros(len(exit_layers) + 1)
+        exit_head_macs = 0
+        for layer in model.layers:
+            macs = self._layer_macs(layer)
+            match = re.match(r'exit(\d+)_', layer.name)
+            if match:
+                stage = int(match.group(1)) - 1
+                exit_head_macs += macs
+            else:
+                block = self._block_index(layer.name)
+                # Layers outside the backbone are the final heads
+                stage = len(exit_layers) if block is None else sum(block > cut for cut in cut_blocks)
+            stage_macs[stage] += macs
+        
+        full_macs = stage_macs.sum() - exit_head_macs
+        return (np.cumsum(stage_macs) / full_macs).tolist()
+    
+    def prepare_data(self, annotations: Union[List[Dict], str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Prepare training data from annotations.
         
         Args:
-            annotations: List of annotation dictionaries
+            annotations: List of annotation dictionaries, or the path of an
+                annotation snapshot (only the columns needed here are read)
             
         Returns:
             Tuple of (images, hazard_labels, ai_labels)
         """
+        if isinstance(annotations, (str, Path)):
+            annotations = read_snapshot(annotations, columns=TRAINING_COLUMNS)
+        
         images = []
         hazard_labels = []
         ai_labels = []
@@ -260,7 +418,9 @@ class OceanHazardModelTrainer:
         )
         
         # Save model
-        model.save(str(self.model_path / f"{model_name}.h5"))
+        model_file = self.model_path / f"{model_name}.h5"
+        model.save(str(model_file))
+        self.exported_files[MODEL_FILES['keras']] = model_file
         
         # Save training history
         with open(str(self.model_path / f"{model_name}_history.json"), 'w') as f:
@@ -271,14 +431,422 @@ class OceanHazardModelTrainer:
         
         return model
     
+    def train_early_exit_model(self, train_annotations: List[Dict],
+                               val_annotations: List[Dict],
+                               model_name: str = "ocean_hazard_model",
+                               exit_layers: Tuple[str, ...] = EARLY_EXIT_LAYERS,
+                               exit_loss_weight: float = 0.5) -> keras.Model:
+        """
+        Train the early-exit model, all heads jointly.
+        
+        Args:
+            train_annotations: Training annotations
+            val_annotations: Validation annotations
+            model_name: Name for saving the model ({model_name}_early_exit.h5)
+            exit_layers: Backbone layers the exit heads branch from
+            exit_loss_weight: Loss weight of the exit heads relative to the final heads
+        
+        Returns:
+            Trained Keras model
+        """
+        print("Preparing training data...")
+        X_train, y_hazard_train, y_ai_train = self.prepare_data(train_annotations)
+        X_val, y_hazard_val, y_ai_val = self.prepare_data(val_annotations)
+        
+        model = self.create_early_exit_model(exit_layers=exit_layers, exit_loss_weight=exit_loss_weight)
+        print(f"Early-exit model created with exits at {', '.join(exit_layers)}")
+        
+        callbacks_list = [
+            callbacks.EarlyStopping(
+                monitor='val_loss',
+                patience=10,
+                restore_best_weights=True
+            ),
+            callbacks.ReduceLROnPlateau(
+                monitor='val_loss',
+                factor=0.5,
+                patience=5,
+                min_lr=1e-7
+            )
+        ]
+        
+        print("Starting training...")
+        history = model.fit(
+            X_train,
+            self._early_exit_targets(model, y_hazard_train, y_ai_train),
+            validation_data=(X_val, self._early_exit_targets(model, y_hazard_val, y_ai_val)),
+            epochs=self.epochs,
+            batch_size=self.batch_size,
+            callbacks=callbacks_list,
+            verbose=1
+        )
+        
+        model.save(str(self.model_path / f"{model_name}_early_exit.h5"))
+        with open(str(self.model_path / f"{model_name}_early_exit_history.json"), 'w') as f:
+            json.dump(history.history, f, indent=2, default=float)
+        
+        return model
+    
+    def export_early_exit_model(self, model: keras.Model,
+                                representative_images: Optional[np.ndarray] = None,
+                                exit_layers: Tuple[str, ...] = EARLY_EXIT_LAYERS) -> Path:
+        """
+        Export an early-exit model as quantized TFLite stages plus a manifest.
+        
+        Stage k runs the backbone from the previous cut to the next one and
+        returns that cut's feature map along with its exit heads; the last
+        stage returns the final heads. AIVerificationService runs the stages
+        in turn when constructed with an EarlyExitPolicy.
+        
+        Args:
+            model: Trained early-exit model
+            representative_images: Preprocessed images used to calibrate the
+                int8 ranges of every stage (random data if omitted)
+            exit_layers: Backbone layers the exit heads branch from
+        
+        Returns:
+            Path of the manifest
+        """
+        cuts = [model.get_layer(name).output for name in exit_layers]
+        heads = [
+            [model.get_layer(f'exit{stage}_hazard_classification').output,
+             model.get_layer(f'exit{stage}_ai_detection').output]
+            for stage in range(1, len(exit_layers) + 1)
+        ]
+        heads.append([model.get_layer('hazard_classification').output, model.get_layer('ai_detection').output])
+        stage_inputs = [model.input] + cuts
+        
+        if representative_images is None or not len(representative_images):
+            representative_images = np.random.random((100, *self.input_shape)).astype(np.float32)
+        inputs = representative_images
+        cost_fractions = self.exit_cost_fractions(model, exit_layers)
+        
+        stages = []
+        for stage, stage_heads in enumerate(heads):
+            is_last = stage == len(cuts)
+            stage_model = keras.Model(
+                inputs=stage_inputs[stage],
+                outputs=stage_heads if is_last else [cuts[stage], *stage_heads]
+            )
+            # Pixels go in as uint8 like the main model; feature maps stay float
+            tflite_model = self._convert_int8(stage_model, inputs, uint8_input=stage == 0, uint8_output=False)
+            
+            filename = f"ocean_hazard_model_exit{stage}.tflite"
+            self._write_atomic(self.model_path / filename, tflite_model)
+            stages.append({
+                'file': filename,
+                'input': 'pixels' if stage == 0 else exit_layers[stage - 1],
+                'cost_fraction': cost_fractions[stage],
+                'size_bytes': len(tflite_model)
+            })
+            print(f"Stage {stage} saved to {filename} ({len(tflite_model) / 1024 / 1024:.2f} MB, "
+                  f"{100 * cost_fractions[stage]:.0f}% of full compute)")
+            
+            # The next stage calibrates on this stage's real feature maps
+            if not is_last:
+                inputs = np.asarray(stage_model.predict(inputs, batch_size=self.batch_size, verbose=0)[0])
+        
+        # Stages from an earlier export (possibly more of them) are replaced
+        self.exported_files = {
+            name: path for name, path in self.exported_files.items()
+            if not name.startswith("ocean_hazard_model_exit")
+        }
+        self.exported_files.update({stage['file']: self.model_path / stage['file'] for stage in stages})
+        
+        # The manifest goes last, so a loading service never sees missing stages
+        manifest_path = self.model_path / EARLY_EXIT_MANIFEST
+        manifest = {
+            'exit_layers': list(exit_layers),
+            'stages': stages,
+            'created': time.time()
+        }
+        self._write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+        self.exported_files[EARLY_EXIT_MANIFEST] = manifest_path
+        print(f"Early-exit manifest saved to {manifest_path}")
+        
+        return manifest_path
+    
+    def evaluate_early_exit(self, model: keras.Model, test_annotations: List[Dict],
+                            policy: Optional[EarlyExitPolicy] = None,
+                            exit_layers: Tuple[str, ...] = EARLY_EXIT_LAYERS) -> Dict:
+        """
+        Measure how much compute early exiting saves on the test split, and at what accuracy.
+        
+        Args:
+            model: Trained early-exit model
+            test_annotations: Test annotations
+            policy: Exit thresholds (defaults to EarlyExitPolicy())
+            exit_layers: Backbone layers the exit heads branch from
+        
+        Returns:
+            Exit distribution, average compute fraction and saving, and
+            adaptive versus full-model accuracy
+        """
+        policy = policy or EarlyExitPolicy()
+        X_test, y_hazard_test, y_ai_test = self.prepare_data(test_annotations)
+        if not len(X_test):
+            raise ValueError("No test images could be loaded")
+        
+        # One pass of the joint model yields every exit's prediction
+        outputs = dict(zip(model.output_names, model.predict(X_test, batch_size=self.batch_size, verbose=0)))
+        prefixes = [f'exit{stage}_' for stage in range(1, len(exit_layers) + 1)] + ['']
+        hazard_outputs = np.stack([outputs[f'{prefix}hazard_classification'] for prefix in prefixes])
+        ai_outputs = np.stack([outputs[f'{prefix}ai_detection'] for prefix in prefixes])
+        
+        exits = policy.exit_indices(list(hazard_outputs), list(ai_outputs))
+        rows = np.arange(len(X_test))
+        hazard_true = np.argmax(y_hazard_test, axis=1)
+        hazard_correct = np.argmax(hazard_outputs, axis=2) == hazard_true
+        ai_correct = (ai_outputs[:, :, 0] > 0.5) == y_ai_test.astype(bool)
+        cost_fractions = np.array(self.exit_cost_fractions(model, exit_layers))
+        avg_compute = float(cost_fractions[exits].mean())
+        exit_counts = np.bincount(exits, minlength=len(prefixes))
+        
+        metrics = {
+            'images': len(X_test),
+            'hazard_threshold': policy.hazard_threshold,
+            'ai_margin': policy.ai_margin,
+            'cost_fractions': cost_fractions.tolist(),
+            'exit_counts': exit_counts.tolist(),
+            'exit_rates': (exit_counts / len(exits)).tolist(),
+            'avg_compute_fraction': avg_compute,
+            'compute_saved': 1.0 - avg_compute,
+            'adaptive_hazard_accuracy': float(hazard_correct[exits, rows].mean()),
+            'full_hazard_accuracy': float(hazard_correct[-1].mean()),
+            'adaptive_ai_accuracy': float(ai_correct[exits, rows].mean()),
+            'full_ai_accuracy': float(ai_correct[-1].mean())
+        }
+        with open(str(self.model_path / "ocean_hazard_model_early_exit_eval.json"), 'w') as f:
+            json.dump(metrics, f, indent=2)
+        
+        print(f"Early exit: {100 * metrics['compute_saved']:.1f}% compute saved on {len(X_test)} test images")
+        print(f"  Exit rates: {[round(rate, 3) for rate in metrics['exit_rates']]}")
+        print(f"  Hazard accuracy: {metrics['adaptive_hazard_accuracy']:.4f} adaptive, "
+              f"{metrics['full_hazard_accuracy']:.4f} full")
+        
+        return metrics
+    
+    def _production_weights_path(self, registry: Optional[ModelRegistry],
+                                 model_name: str) -> Path:
+        """Keras model currently in production: the active registry version, else the local export."""
+        if registry is not None:
+            active = registry.active_version()
+            if active is not None:
+                path = registry.version_path(active) / MODEL_FILES['keras']
+                if path.exists():
+                    return path
+        
+        path = self.model_path / f"{model_name}.h5"
+        if not path.exists():
+            raise FileNotFoundError(f"No production model to fine-tune at {path}")
+        return path
+    
+    def sample_replay(self, annotations: List[Dict], count: int, seed: int = 0) -> List[Dict]:
+        """
+        Sample older annotations to mix into an incremental training run.
+        
+        The sample is stratified by hazard type so classes that are rare among
+        new reports are still rehearsed.
+        
+        Args:
+            annotations: Previously trained-on annotations
+            count: Number of annotations to sample
+            seed: Random seed
+        
+        Returns:
+            Sampled annotations
+        """
+        if count >= len(annotations):
+            return list(annotations)
+        
+        rng = np.random.default_rng(seed)
+        by_type = {}
+        for annotation in annotations:
+            by_type.setdefault(annotation['hazard_type'], []).append(annotation)
+        
+        # Proportional share per hazard type; one of each is kept when trimming to count
+        guaranteed, extra = [], []
+        for group in by_type.values():
+            share = max(1, int(round(count * len(group) / len(annotations))))
+            picks = rng.choice(len(group), min(share, len(group)), replace=False)
+            guaranteed.append(group[picks[0]])
+            extra.extend(group[i] for i in picks[1:])
+        rng.shuffle(guaranteed)
+        rng.shuffle(extra)
+        sample = (guaranteed + extra)[:count]
+        rng.shuffle(sample)
+        return sample
+    
+    @staticmethod
+    def _block_index(layer_name: str) -> Optional[int]:
+        """MobileNetV2 block a layer belongs to (stem 0 ... top conv 17), if any."""
+        match = re.match(r'block_(\d+)_', layer_name)
+        if match:
+            return int(match.group(1))
+        if layer_name.startswith(('Conv_1', 'out_relu')):
+            return 17
+        if layer_name.startswith(('Conv1', 'bn_Conv1', 'Conv1_relu', 'expanded_conv')):
+            return 0
+        return None
+    
+    def set_trainable_blocks(self, model: keras.Model, unfreeze_blocks: int = 0) -> int:
+        """
+        Freeze the backbone except its top blocks; the heads stay trainable.
+        
+        Batch normalization layers stay frozen so their statistics are not
+        disturbed by small fine-tuning batches.
+        
+        Args:
+            model: Hazard + AI detection model
+            unfreeze_blocks: Number of top MobileNetV2 blocks to train
+                (1 is the final 1x1 conv, 2 adds block 16, ...)
+        
+        Returns:
+            Number of trainable weights after the change
+        """
+        # Backbone layers are those before global pooling, including nested models
+        backbone, heads = [], []
+        seen_pooling = False
+        for layer in model.layers:
+            if isinstance(layer, layers.GlobalAveragePooling2D):
+                seen_pooling = True
+            if seen_pooling:
+                heads.append(layer)
+            elif isinstance(layer, keras.Model):
+                layer.trainable = True
+                backbone.extend(layer.layers)
+            else:
+                backbone.append(layer)
+        
+        first_block = 18 - unfreeze_blocks
+        for layer in backbone:
+            block = self._block_index(layer.name)
+            layer.trainable = (
+                unfreeze_blocks > 0
+                and block is not None
+                and block >= first_block
+                and not isinstance(layer, layers.BatchNormalization)
+            )
+        for layer in heads:
+            layer.trainable = True
+        
+        return int(sum(np.prod(weight.shape) for weight in model.trainable_weights))
+    
+    def fine_tune_model(self, new_annotations: List[Dict],
+                        val_annotations: List[Dict],
+                        previous_annotations: Optional[List[Dict]] = None,
+                        replay_ratio: float = 1.0,
+                        unfreeze_blocks: int = 0,
+                        epochs: int = 5,
+                        learning_rate: float = 1e-4,
+                        registry: Optional[ModelRegistry] = None,
+                        model_name: str = "ocean_hazard_model",
+                        export: bool = True,
+                        seed: int = 0) -> keras.Model:
+        """
+        Incrementally train the production model on newly collected annotations.
+        
+        Starts from the current production weights instead of ImageNet, trains
+        on the new annotations mixed with a replay sample of older ones (so
+        earlier data is not forgotten) for a few epochs at a low learning rate,
+        then saves and optionally exports the quantized TFLite model.
+        
+        Args:
+            new_annotations: Annotations collected since the last training run
+            val_annotations: Validation annotations
+            previous_annotations: Older training annotations to replay from
+            replay_ratio: Replayed annotations per new annotation
+            unfreeze_blocks: Top backbone blocks to train (0 trains the heads only)
+            epochs: Maximum epochs
+            learning_rate: Adam learning rate
+            registry: Registry whose active version supplies the starting weights
+            model_name: Name the models are loaded and saved under
+            export: Whether to run the quantize/export step afterwards
+            seed: Random seed for the replay sample
+        
+        Returns:
+            Fine-tuned Keras model
+        """
+        start = time.perf_counter()
+        base_path = self._production_weights_path(registry, model_name)
+        model = keras.models.load_model(str(base_path), compile=False)
+        if len(model.outputs) != 2:
+            raise ValueError(f"Fine-tuning expects the hazard + AI detection model, got {len(model.outputs)} output(s)")
+        print(f"Fine-tuning from {base_path}")
+        
+        replay = []
+        if previous_annotations:
+            replay = self.sample_replay(previous_annotations, int(len(new_annotations) * replay_ratio), seed)
+        train_annotations = list(new_annotations) + replay
+        
+        X_train, y_hazard_train, y_ai_train = self.prepare_data(train_annotations)
+        X_val, y_hazard_val, y_ai_val = self.prepare_data(val_annotations)
+        print(f"Training on {len(new_annotations)} new + {len(replay)} replayed annotations")
+        
+        trainable_params = self.set_trainable_blocks(model, unfreeze_blocks)
+        self._compile_multi_output(model, learning_rate)
+        print(f"Trainable parameters: {trainable_params:,} of {model.count_params():,}")
+        
+        history = model.fit(
+            X_train,
+            {'hazard_classification': y_hazard_train, 'ai_detection': y_ai_train},
+            validation_data=(X_val, {'hazard_classification': y_hazard_val, 'ai_detection': y_ai_val}),
+            epochs=epochs,
+            batch_size=self.batch_size,
+            callbacks=[
+                callbacks.EarlyStopping(
+                    monitor='val_loss',
+                    patience=2,
+                    restore_best_weights=True
+                )
+            ],
+            verbose=1
+        )
+        train_seconds = time.perf_counter() - start
+        
+        # Write then rename so publish_to_registry never copies a partial file
+        model_file = self.model_path / f"{model_name}.h5"
+        tmp_path = self.model_path / f".{model_name}.tmp.h5"
+        model.save(str(tmp_path))
+        os.replace(tmp_path, model_file)
+        self.exported_files[MODEL_FILES['keras']] = model_file
+        
+        if export:
+            # Calibrate int8 ranges on real training images rather than noise
+            self.quantize_model(model, quantize_aware_training=False,
+                                representative_images=X_train[:100])
+        
+        summary = {
+            'base_model': str(base_path),
+            'new_annotations': len(new_annotations),
+            'replayed_annotations': len(replay),
+            'unfreeze_blocks': unfreeze_blocks,
+            'trainable_params': trainable_params,
+            'total_params': int(model.count_params()),
+            'epochs_run': len(history.history['loss']),
+            'learning_rate': learning_rate,
+            'train_seconds': train_seconds,
+            'total_seconds': time.perf_counter() - start,
+            'history': history.history
+        }
+        with open(str(self.model_path / f"{model_name}_finetune.json"), 'w') as f:
+            json.dump(summary, f, indent=2, default=float)
+        print(f"Fine-tuning completed in {summary['total_seconds']:.1f}s "
+              f"({summary['epochs_run']} epochs)")
+        
+        return model
+    
     def quantize_model(self, model: keras.Model, 
-                      quantize_aware_training: bool = True) -> tf.lite.Interpreter:
+                      quantize_aware_training: bool = True,
+                      representative_images: Optional[np.ndarray] = None) -> tf.lite.Interpreter:
         """
         Quantize the model for deployment on mobile devices.
         
         Args:
             model: Trained Keras model
             quantize_aware_training: Whether to use quantization-aware training
+            representative_images: Preprocessed images used to calibrate the
+                int8 ranges (random data if omitted)
             
         Returns:
             Quantized TensorFlow Lite interpreter
@@ -288,36 +856,112 @@ class OceanHazardModelTrainer:
             quantize_model = tfmot.quantization.keras.quantize_model
             model = quantize_model(model)
         
-        # Convert to TensorFlow Lite
+        # Convert and save
+        tflite_model = self._convert_int8(model, representative_images)
+        tflite_path = self.model_path / "ocean_hazard_model.tflite"
+        self._write_atomic(tflite_path, tflite_model)
+        self.exported_files[MODEL_FILES['tflite']] = tflite_path
+        
+        print(f"Quantized model saved to {tflite_path}")
+        print(f"Model size: {len(tflite_model) / 1024 / 1024:.2f} MB")
+        
+        # Create interpreter
+        interpreter = tf.lite.Interpreter(model_path=str(tflite_path))
+        interpreter.allocate_tensors()
+        
+        return interpreter
+    
+    def _convert_int8(self, model: keras.Model,
+                      representative_inputs: Optional[np.ndarray] = None,
+                      uint8_input: bool = True, uint8_output: bool = True) -> bytes:
+        """
+        Convert a Keras model to a fully int8-quantized TFLite flatbuffer.
+        
+        Args:
+            model: Keras model
+            representative_inputs: Model inputs used to calibrate the int8
+                ranges (random data if omitted)
+            uint8_input: Quantize the input tensor to uint8 (float32 otherwise)
+            uint8_output: Quantize the output tensors to uint8 (float32 otherwise)
+        
+        Returns:
+            Serialized TFLite model
+        """
         converter = tf.lite.TFLiteConverter.from_keras_model(model)
         converter.optimizations = [tf.lite.Optimize.DEFAULT]
         
         # Set representative dataset for quantization
         def representative_data_gen():
+            if representative_inputs is not None and len(representative_inputs):
+                for sample in representative_inputs:
+                    yield [sample[np.newaxis].astype(np.float32)]
+                return
             for _ in range(100):
-                data = np.random.random((1, 224, 224, 3)).astype(np.float32)
+                data = np.random.random((1, *model.input_shape[1:])).astype(np.float32)
                 yield [data]
         
         converter.representative_dataset = representative_data_gen
         converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
-        converter.inference_input_type = tf.uint8
-        converter.inference_output_type = tf.uint8
+        if uint8_input:
+            converter.inference_input_type = tf.uint8
+        if uint8_output:
+            converter.inference_output_type = tf.uint8
         
-        # Convert and save
-        tflite_model = converter.convert()
+        return converter.convert()
+    
+    def export_onnx(self, model: keras.Model, opset: int = 13) -> Path:
+        """
+        Export the float model to ONNX for the ONNX Runtime backend.
         
-        tflite_path = self.model_path / "ocean_hazard_model.tflite"
-        with open(tflite_path, 'wb') as f:
-            f.write(tflite_model)
+        Args:
+            model: Trained Keras model
+            opset: ONNX opset version
         
-        print(f"Quantized model saved to {tflite_path}")
-        print(f"Model size: {len(tflite_model) / 1024 / 1024:.2f} MB")
+        Returns:
+            Path of the exported model
+        """
+        if tf2onnx is None:
+            raise ImportError("tf2onnx is required to export ONNX models")
         
-        # Create interpreter
-        interpreter = tf.lite.Interpreter(model_path=str(tflite_path))
-        interpreter.allocate_tensors()
+        input_signature = [tf.TensorSpec((None, *self.input_shape), tf.float32, name='input')]
+        onnx_model, _ = tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=opset)
         
-        return interpreter
+        onnx_path = self.model_path / MODEL_FILES['onnx']
+        self._write_atomic(onnx_path, onnx_model.SerializeToString())
+        self.exported_files[MODEL_FILES['onnx']] = onnx_path
+        print(f"ONNX model saved to {onnx_path}")
+        return onnx_path
+    
+    def _write_atomic(self, path: Path, data: bytes):
+        """Write then rename so a loading service never sees a partial file."""
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    def publish_to_registry(self, registry: ModelRegistry,
+                            metadata: Optional[Dict] = None,
+                            activate: bool = False) -> str:
+        """
+        Publish the models written by this trainer as a new registry version.
+        
+        Only artifacts saved or exported by this trainer instance are
+        published (never leftovers from earlier runs in model_path), under
+        the file names AIVerificationService loads, whatever model_name
+        they were saved as.
+        
+        Args:
+            registry: Model registry to publish into
+            metadata: Extra information stored with the version
+            activate: Whether to make the new version active
+        
+        Returns:
+            The published version name
+        """
+        if not self.exported_files:
+            raise ValueError("No models have been saved or exported by this trainer")
+        
+        return registry.publish(dict(self.exported_files), metadata=metadata, activate=activate)
     
     def evaluate_model(self, model: keras.Model, 
                       test_annotations: List[Dict]) -> Dict:
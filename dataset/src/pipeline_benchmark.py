@@ -0,0 +1,288 @@
+"""
+OceanWatch Sentinel - Pipeline Benchmark Module
+
+This module measures the data collection and training input pipelines on a
+synthetic corpus written to local disk. It times user-upload ingestion, web
+collection against a local HTTP stand-in, AI-image generation, dataset
+splitting and OceanHazardModelTrainer.prepare_data at several worker
+counts, reports images/sec and peak RSS per stage, and compares the results
+to a stored JSON baseline.
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from data_collection import OceanHazardDataCollector
+from model_training import OceanHazardModelTrainer
+from verification_benchmark import (
+    DEFAULT_IMAGE_SIZES, compare_to_baseline, generate_synthetic_images, peak_rss_mb
+)
+
+
+HAZARD_TYPES = [
+    "tsunami", "storm_surge", "high_waves", "flooding",
+    "debris", "pollution", "erosion", "wildlife", "other"
+]
+
+# Rough bounding box of the Indian coastline, for synthetic report locations
+COAST_LAT_RANGE = (8.0, 22.0)
+COAST_LNG_RANGE = (68.0, 90.0)
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request."""
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalImageServer:
+    """Serves a directory over HTTP on localhost as a stand-in for web sources."""
+    
+    def __init__(self, directory: str):
+        handler = functools.partial(_QuietHandler, directory=str(directory))
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    def url_for(self, path: str) -> str:
+        """URL of a file in the served directory."""
+        return f"{self.base_url}/{Path(path).name}"
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def synthetic_labels(count: int, seed: int = 0) -> Tuple[List[str], List[Dict[str, float]]]:
+    """Round-robin hazard types and random coastal locations for count images."""
+    rng = np.random.default_rng(seed)
+    hazard_types = [HAZARD_TYPES[i % len(HAZARD_TYPES)] for i in range(count)]
+    locations = [
+        {'lat': float(lat), 'lng': float(lng)}
+        for lat, lng in zip(rng.uniform(*COAST_LAT_RANGE, count), rng.uniform(*COAST_LNG_RANGE, count))
+    ]
+    return hazard_types, locations
+
+
+def shard(items: Sequence[Any], workers: int) -> List[List[Any]]:
+    """Split items into at most workers contiguous, non-empty shards."""
+    size = -(-len(items) // workers)
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def run_sharded(call: Callable[[int, List[Any]], List[Any]],
+                shards: List[List[Any]]) -> Tuple[List[Any], float]:
+    """
+    Run call(shard_index, shard) for every shard on its own thread.
+    
+    Returns:
+        Tuple of (per-shard outputs in shard order, wall seconds)
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        outputs = list(executor.map(call, range(len(shards)), shards))
+    return outputs, time.perf_counter() - start
+
+
+def stage_result(workers: int, items: int, wall_seconds: float, **extra) -> Dict[str, Any]:
+    """Throughput and memory for one stage run."""
+    return {
+        'workers': workers,
+        'items': items,
+        'wall_seconds': wall_seconds,
+        'throughput': items / wall_seconds if wall_seconds else 0.0,
+        # Process-wide peak so far, including every earlier stage
+        'cumulative_peak_rss_mb': peak_rss_mb(),
+        **extra
+    }
+
+
+def _collectors(stage_dir: Path, count: int) -> List[OceanHazardDataCollector]:
+    """One collector per worker, each writing under its own fresh directory."""
+    if stage_dir.exists():
+        shutil.rmtree(stage_dir)
+    return [OceanHazardDataCollector(str(stage_dir / f"shard{i}")) for i in range(count)]
+
+
+def run_benchmarks(work_dir: str, image_paths: List[str],
+                   workers: Sequence[int] = (1, 4),
+                   ai_images_per_type: int = 8) -> Dict[str, Any]:
+    """
+    Run every pipeline stage at each worker count and collect the results.
+    
+    Each worker gets its own collector and output directory, since the
+    collector names files by timestamp and position within a call.
+    
+    Args:
+        work_dir: Directory for collector output
+        image_paths: Synthetic source images
+        workers: Worker thread counts
+        ai_images_per_type: Placeholder AI images generated per hazard type
+    
+    Returns:
+        Results dictionary keyed by scenario name
+    """
+    work_dir = Path(work_dir)
+    hazard_types, locations = synthetic_labels(len(image_paths))
+    items = list(zip(image_paths, hazard_types, locations))
+    prompts = {hazard_type: [f"{hazard_type.replace('_', ' ')} on the coast"] for hazard_type in HAZARD_TYPES}
+    
+    results = {
+        'created': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'config': {
+            'images': len(image_paths),
+            'workers': list(workers),
+            'ai_images_per_type': ai_images_per_type
+        },
+        'scenarios': {}
+    }
+    scenarios = results['scenarios']
+    corpus = None
+    
+    def report(name: str):
+        result = scenarios[name]
+        print(f"{name}: {result['throughput']:.1f} img/s, peak RSS so far {result['cumulative_peak_rss_mb'] or 0:.0f} MB")
+    
+    with LocalImageServer(Path(image_paths[0]).parent) as server:
+        for count in workers:
+            shards = shard(items, count)
+            
+            name = f"collect_from_user_uploads/w{count}"
+            collectors = _collectors(work_dir / "uploads" / f"w{count}", len(shards))
+            outputs, seconds = run_sharded(
+                lambda i, part: collectors[i].collect_from_user_uploads(
+                    [path for path, _, _ in part],
+                    [hazard_type for _, hazard_type, _ in part],
+                    [location for _, _, location in part]
+                ),
+                shards
+            )
+            annotations = [annotation for output in outputs for annotation in output]
+            scenarios[name] = stage_result(len(shards), len(annotations), seconds)
+            report(name)
+            if corpus is None:
+                corpus = annotations
+            
+            name = f"collect_from_web_sources/w{count}"
+            collectors = _collectors(work_dir / "web" / f"w{count}", len(shards))
+            outputs, seconds = run_sharded(
+                lambda i, part: collectors[i].collect_from_web_sources(
+                    [server.url_for(path) for path, _, _ in part],
+                    [hazard_type for _, hazard_type, _ in part],
+                    [location for _, _, location in part]
+                ),
+                shards
+            )
+            scenarios[name] = stage_result(len(shards), sum(len(output) for output in outputs), seconds)
+            report(name)
+            
+            # Each worker generates its share of the images for every hazard type
+            name = f"generate_ai_images/w{count}"
+            per_worker = max(1, ai_images_per_type // count)
+            collectors = _collectors(work_dir / "ai_generated" / f"w{count}", count)
+            outputs, seconds = run_sharded(
+                lambda i, _: collectors[i].generate_ai_images(prompts, per_worker), [[]] * count
+            )
+            scenarios[name] = stage_result(count, sum(len(output) for output in outputs), seconds)
+            report(name)
+    
+    # Splitting is sequential; it shuffles in place, so give it a copy
+    name = "create_dataset_split"
+    collector = _collectors(work_dir / "split", 1)[0]
+    start = time.perf_counter()
+    collector.create_dataset_split(list(corpus))
+    scenarios[name] = stage_result(1, len(corpus), time.perf_counter() - start)
+    report(name)
+    
+    trainer = OceanHazardModelTrainer(str(work_dir / "data"), str(work_dir / "trainer_models"))
+    for count in workers:
+        name = f"prepare_data/w{count}"
+        outputs, seconds = run_sharded(lambda i, part: trainer.prepare_data(part), shard(corpus, count))
+        prepared = sum(len(images) for images, _, _ in outputs)
+        output_mb = sum(images.nbytes for images, _, _ in outputs) / (1024 * 1024)
+        scenarios[name] = stage_result(len(outputs), prepared, seconds, output_mb=output_mb)
+        report(name)
+        del outputs
+    
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def main():
+    """Run the data pipeline benchmark suite."""
+    parser = argparse.ArgumentParser(description="OceanWatch Sentinel data pipeline benchmarks")
+    parser.add_argument("--work-dir", default="dataset/benchmarks/pipeline")
+    parser.add_argument("--images", type=int, default=60)
+    parser.add_argument("--image-size", action="append", default=None,
+                        help="WIDTHxHEIGHT, may be repeated")
+    parser.add_argument("--workers", type=int, nargs='+', default=[1, 4])
+    parser.add_argument("--ai-images-per-type", type=int, default=8)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    
+    work_dir = Path(args.work_dir)
+    sizes = DEFAULT_IMAGE_SIZES
+    if args.image_size:
+        sizes = [tuple(int(v) for v in size.lower().split('x')) for size in args.image_size]
+    image_paths = generate_synthetic_images(work_dir / "images", args.images, sizes)
+    
+    results = run_benchmarks(work_dir / "output", image_paths, args.workers, args.ai_images_per_type)
+    
+    output = Path(args.output) if args.output else work_dir / "results.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+    
+    baseline_path = Path(args.baseline) if args.baseline else work_dir / "baseline.json"
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return
+    
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {100 * args.threshold:.0f}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions beyond {100 * args.threshold:.0f}% against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
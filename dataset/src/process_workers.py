@@ -0,0 +1,370 @@
+"""
+OceanWatch Sentinel - Multi-Process Verification Workers
+
+This module runs verification across several processes so decoding, NumPy
+work and Python overhead are not capped by a single GIL. The front process
+decodes images, runs the image pre-checks and the result cache lookup, and
+writes the remaining uint8 batches into one shared-memory block per worker;
+workers run inference on that memory in place and send back only the small
+result dictionaries over a pipe.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from verification_cascade import ImagePrechecks
+from verification_integration import AIVerificationService
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block owned by the front process without tracking it here."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: spawned workers share the front's resource tracker,
+        # which already holds this name, so attaching registers nothing new
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(worker_id: int, shm_name: str, batch_shape: tuple,
+                 conn, model_path: str, service_kwargs: Dict[str, Any],
+                 cpu_ids: Optional[List[int]]):
+    """Worker process entry point: own interpreter, inference on shared memory."""
+    if cpu_ids and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cpu_ids)
+        except OSError as e:
+            print(f"Worker {worker_id}: could not set CPU affinity: {e}")
+    
+    shm = _attach_shared_memory(shm_name)
+    try:
+        try:
+            service = AIVerificationService(model_path, **service_kwargs)
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+            return
+        conn.send(('ready', (service.get_model_info()['models_loaded'], service.model_version)))
+        
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            
+            batch_size, selected_hazard_types = message
+            images = np.ndarray((batch_size, *batch_shape[1:]), dtype=np.uint8, buffer=shm.buf)
+            try:
+                results = service.verify_batch(list(images), selected_hazard_types)
+                conn.send(('ok', results))
+            except Exception as e:
+                conn.send(('error', str(e)))
+            finally:
+                # Release the view before the block can be closed
+                del images
+    finally:
+        shm.close()
+        conn.close()
+
+
+class ProcessWorkerPool:
+    """Front end that fans decoded batches out to verification worker processes."""
+    
+    def __init__(self, model_path: str = "dataset/models",
+                 num_workers: Optional[int] = None,
+                 max_batch_size: int = 32,
+                 interpreter_threads: Optional[int] = None,
+                 pin_cpus: bool = True,
+                 decode_workers: Optional[int] = None,
+                 prechecks: Optional[ImagePrechecks] = None,
+                 cache_size: int = 1024,
+                 cache_dir: Optional[str] = None):
+        self.model_path = str(model_path)
+        self.max_batch_size = max_batch_size
+        self.pin_cpus = pin_cpus
+        
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+        self.num_workers = num_workers or max(1, len(cpus))
+        
+        # Round-robin the available CPUs over the workers
+        self.cpu_groups = [cpus[i::self.num_workers] or cpus for i in range(self.num_workers)]
+        self.interpreter_threads = interpreter_threads
+        
+        # Front-side service decodes, pre-checks and caches; models live in the workers
+        self.decoder = AIVerificationService(
+            self.model_path, cache_size=cache_size, cache_dir=cache_dir,
+            decode_workers=decode_workers, load_models=False, prechecks=prechecks
+        )
+        self.batch_shape = (max_batch_size, *self.decoder.input_size, 3)
+        
+        self._processes = []
+        self._connections = []
+        self._shared = []
+        self._idle = queue.Queue()
+        self._started = False
+    
+        # Workers that died and could not be restarted; once all have, calls fail fast
+        self._lock = threading.Lock()
+        self._dead = set()
+        self.restarts = 0
+    
+    def _spawn(self, worker_id: int):
+        """Start one worker process with a fresh shared-memory block."""
+        ctx = mp.get_context('spawn')
+        shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self.batch_shape)))
+        parent_conn, child_conn = ctx.Pipe()
+        cpu_ids = self.cpu_groups[worker_id] if self.pin_cpus else None
+        service_kwargs = {
+            'batch_size': self.max_batch_size,
+            'cache_size': 0,
+            'decode_workers': 1,
+            'interpreter_threads': self.interpreter_threads or (len(cpu_ids) if cpu_ids else None)
+        }
+        
+        process = ctx.Process(
+            target=_worker_main,
+            args=(worker_id, shm.name, self.batch_shape, child_conn,
+                  self.model_path, service_kwargs, cpu_ids),
+            name=f"verification-worker-{worker_id}",
+            daemon=True
+        )
+        self._processes[worker_id] = process
+        self._connections[worker_id] = parent_conn
+        self._shared[worker_id] = shm
+        process.start()
+        child_conn.close()
+    
+    def _wait_ready(self, worker_id: int):
+        """Wait for a spawned worker to load its models."""
+        try:
+            status, detail = self._connections[worker_id].recv()
+        except (EOFError, OSError) as e:
+            raise RuntimeError(f"Verification worker {worker_id} exited during startup: {e}")
+        if status != 'ready':
+            raise RuntimeError(f"Verification worker {worker_id} failed to start: {detail}")
+        
+        models_loaded, model_version = detail
+        print(f"Verification worker {worker_id} ready ({', '.join(models_loaded) or 'fallback'})")
+        # Cache keys carry the version the workers actually serve
+        self.decoder.model_version = model_version
+    
+    def _retire(self, worker_id: int):
+        """Stop one worker and free its shared memory."""
+        conn = self._connections[worker_id]
+        process = self._processes[worker_id]
+        shm = self._shared[worker_id]
+        self._connections[worker_id] = self._processes[worker_id] = self._shared[worker_id] = None
+        
+        if conn is not None:
+            try:
+                conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            conn.close()
+        if process is not None:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+    
+    def _replace_worker(self, worker_id: int):
+        """Respawn a dead worker, or retire it for good if it cannot start."""
+        self._retire(worker_id)
+        try:
+            self._spawn(worker_id)
+            self._wait_ready(worker_id)
+        except Exception as e:
+            print(f"Could not restart verification worker {worker_id}: {e}")
+            self._retire(worker_id)
+            with self._lock:
+                self._dead.add(worker_id)
+                if len(self._dead) == self.num_workers:
+                    # Wakes every caller waiting for a worker
+                    self._idle.put(None)
+            return
+        
+        with self._lock:
+            self.restarts += 1
+        self._idle.put(worker_id)
+    
+    def start(self):
+        """Spawn the workers and wait until each has loaded its models."""
+        self._processes = [None] * self.num_workers
+        self._connections = [None] * self.num_workers
+        self._shared = [None] * self.num_workers
+        self._idle = queue.Queue()
+        self._dead = set()
+        
+        try:
+            for worker_id in range(self.num_workers):
+                self._spawn(worker_id)
+            for worker_id in range(self.num_workers):
+                self._wait_ready(worker_id)
+                self._idle.put(worker_id)
+        except Exception:
+            # Do not leak the workers and blocks already created
+            self.close()
+            raise
+        
+        self._started = True
+    
+    def close(self):
+        """Stop the workers and free shared memory."""
+        for worker_id in range(len(self._processes)):
+            self._retire(worker_id)
+        
+        self._processes, self._connections, self._shared = [], [], []
+        self._started = False
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def verify_batch(self, images: List[Optional[np.ndarray]],
+                     selected_hazard_types: List[str] = None,
+                     cache_keys: List[Optional[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Verify decoded images on the next idle worker.
+        
+        Safe to call from several threads; each call holds one worker.
+        
+        Args:
+            images: Decoded RGB uint8 images (None marks a failed decode,
+                a RejectedImage a failed pre-check), at most max_batch_size
+                of them
+            selected_hazard_types: List of expected hazard types
+            cache_keys: Result cache keys from the decoder, to store results under
+        
+        Returns:
+            List of verification results, in input order
+        """
+        if len(images) > self.max_batch_size:
+            raise ValueError(f"Batch of {len(images)} exceeds max_batch_size {self.max_batch_size}")
+        
+        results = [self.decoder._unverified_result(image) for image in images]
+        valid = [i for i, image in enumerate(images) if isinstance(image, np.ndarray)]
+        if cache_keys:
+            # Pre-check rejections are deterministic, so they are cached too
+            for i, result in enumerate(results):
+                if i not in valid:
+                    self.decoder._cache_store(cache_keys[i], result)
+        if not valid:
+            return results
+        
+        worker_id = self._idle.get()
+        if worker_id is None:
+            self._idle.put(None)
+            raise RuntimeError("All verification workers have failed")
+        try:
+            # Write the batch straight into the worker's shared block
+            shm = self._shared[worker_id]
+            view = np.ndarray(self.batch_shape, dtype=np.uint8, buffer=shm.buf)
+            np.stack([images[i] for i in valid], out=view[:len(valid)])
+            del view
+            
+            selected = [selected_hazard_types[i] if selected_hazard_types else None for i in valid]
+            conn = self._connections[worker_id]
+            conn.send((len(valid), selected))
+            status, payload = conn.recv()
+        except (EOFError, OSError) as e:
+            # Never hand the dead worker out again; a fresh one takes its slot
+            self._replace_worker(worker_id)
+            raise RuntimeError(f"Verification worker {worker_id} failed: {e}")
+        else:
+            self._idle.put(worker_id)
+        
+        if status != 'ok':
+            raise RuntimeError(f"Verification worker {worker_id} error: {payload}")
+        
+        for i, result in zip(valid, payload):
+            results[i] = result
+            if cache_keys:
+                self.decoder._cache_store(cache_keys[i], result)
+        return results
+    
+    def batch_verify_images(self, image_paths: List[str],
+                            selected_hazard_types: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Verify many images across all workers.
+        
+        Args:
+            image_paths: List of image file paths
+            selected_hazard_types: List of expected hazard types
+        
+        Returns:
+            List of verification results
+        """
+        if not self._started:
+            raise RuntimeError("ProcessWorkerPool.start() has not been called")
+        if selected_hazard_types is None:
+            selected_hazard_types = [None] * len(image_paths)
+        
+        def run_chunk(start: int) -> List[Dict[str, Any]]:
+            paths = image_paths[start:start + self.max_batch_size]
+            types = selected_hazard_types[start:start + len(paths)]
+            prepared = list(decode_executor.map(self.decoder._prepare_path, paths, types))
+            
+            # Only cache misses are sent to a worker
+            results = [cached for _, cached, _ in prepared]
+            misses = [j for j, (_, cached, _) in enumerate(prepared) if cached is None]
+            if misses:
+                verified = self.verify_batch(
+                    [prepared[j][2] for j in misses],
+                    [types[j] for j in misses],
+                    [prepared[j][0] for j in misses]
+                )
+                for j, result in zip(misses, verified):
+                    results[j] = result
+            
+            for image_path, result in zip(paths, results):
+                result['image_path'] = image_path
+            return results
+        
+        starts = range(0, len(image_paths), self.max_batch_size)
+        with ThreadPoolExecutor(max_workers=self.decoder.decode_workers) as decode_executor, \
+                ThreadPoolExecutor(max_workers=self.num_workers) as dispatch_executor:
+            chunks = list(dispatch_executor.map(run_chunk, starts))
+        
+        return [result for chunk in chunks for result in chunk]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get information about the worker processes."""
+        return {
+            'num_workers': self.num_workers,
+            'alive': sum(process is not None and process.is_alive() for process in self._processes),
+            'restarts': self.restarts,
+            'dead': sorted(self._dead),
+            'idle': self._idle.qsize(),
+            'max_batch_size': self.max_batch_size,
+            'cpu_groups': self.cpu_groups if self.pin_cpus else None,
+            'cache': self.decoder.result_cache.get_stats() if self.decoder.result_cache is not None else None,
+            'prechecks': self.decoder.prechecks.get_stats() if self.decoder.prechecks is not None else None
+        }
+
+
+def main():
+    """Example usage of the multi-process verification workers."""
+    image_dir = "dataset/data/raw/real_images/tsunami"
+    image_paths = [
+        os.path.join(image_dir, name) for name in sorted(os.listdir(image_dir))
+    ] if os.path.isdir(image_dir) else []
+    
+    with ProcessWorkerPool(num_workers=2) as pool:
+        results = pool.batch_verify_images(image_paths, ["tsunami"] * len(image_paths))
+        print(f"Verified {len(results)} images")
+        print(pool.get_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+OceanWatch Sentinel - Verification Result Cache
+
+This module caches verification results by image content so the same photo,
+forwarded and re-submitted by many users during a hazard event, is only run
+through the model once per model version.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def content_hash(data: bytes) -> str:
+    """Hash encoded image bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class VerificationResultCache:
+    """Two-tier (in-process LRU + optional on-disk) verification result cache."""
+    
+    def __init__(self, max_entries: int = 1024, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'invalidations': 0
+        }
+    
+    @staticmethod
+    def make_key(image_hash: str, model_version: str,
+                 selected_hazard_type: Optional[str] = None) -> str:
+        """
+        Build a cache key.
+        
+        Args:
+            image_hash: Content hash of the encoded image
+            model_version: Version of the models that produced the result
+            selected_hazard_type: Expected hazard type the result was checked against
+        
+        Returns:
+            Cache key string
+        """
+        return f"{model_version}-{selected_hazard_type or 'any'}-{image_hash}"
+    
+    def _disk_path(self, key: str) -> Path:
+        """On-disk location of a cache entry, sharded by model version."""
+        model_version, _, rest = key.partition('-')
+        return self.cache_dir / model_version / f"{rest}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result.
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return copy.deepcopy(result)
+        
+        if self.cache_dir is not None:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                result = None
+            
+            if result is not None:
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+                    self._store_memory(key, result)
+                return copy.deepcopy(result)
+        
+        with self._lock:
+            self.stats['misses'] += 1
+        return None
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        """
+        Store a result in both tiers.
+        
+        Args:
+            key: Cache key from make_key
+            result: Verification result dictionary
+        """
+        result = copy.deepcopy(result)
+        with self._lock:
+            self.stats['stores'] += 1
+            self._store_memory(key, result)
+        
+        if self.cache_dir is not None:
+            path = self._disk_path(key)
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so readers never see a partial entry
+                tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Error writing verification cache entry {path}: {e}")
+    
+    def _store_memory(self, key: str, result: Dict[str, Any]):
+        """Insert into the LRU tier; caller holds the lock."""
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def invalidate(self):
+        """
+        Drop the in-memory tier.
+        
+        On-disk entries are keyed by model version, so entries written by
+        previous models are simply never looked up again.
+        """
+        with self._lock:
+            self._memory.clear()
+            self.stats['invalidations'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate counters."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['disk_enabled'] = self.cache_dir is not None
+        return stats
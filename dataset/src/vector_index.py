@@ -0,0 +1,326 @@
+"""
+OceanWatch Sentinel - Embedding Vector Index Module
+
+This module stores image embeddings of verified reports in a float16
+memory-mapped matrix so moderators can find visually similar reports.
+Search is a batched NumPy top-k over the matrix; for large collections an
+optional IVF (inverted file) partitioning restricts each query to the few
+clusters closest to it.
+"""
+
+import itertools
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Rows scored per step of an exact search (bounds float32 scratch memory)
+SEARCH_CHUNK_ROWS = 8192
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores along the last axis, best first."""
+    k = min(k, scores.shape[-1])
+    part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=-1), axis=-1)
+    return np.take_along_axis(part, order, axis=-1)
+
+
+class EmbeddingIndex:
+    """Persistent cosine-similarity index over report embeddings."""
+    
+    def __init__(self, root: str = "dataset/models/embeddings",
+                 dim: Optional[int] = None,
+                 initial_capacity: int = 1024):
+        """
+        Args:
+            root: Directory holding the index files
+            dim: Embedding dimension (taken from the first add if omitted)
+            initial_capacity: Rows preallocated when the matrix is created
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.meta_path = self.root / "meta.json"
+        self.vectors_path = self.root / "vectors.f16"
+        self.ids_path = self.root / "ids.txt"
+        self.centroids_path = self.root / "ivf_centroids.npy"
+        self.assignments_path = self.root / "ivf_assignments.i32"
+        
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.count = 0
+        self.capacity = 0
+        self.ids = []
+        self._rows = {}
+        
+        self._vectors = None
+        self.centroids = None
+        self._assignments = None
+        self._lists = None
+        self._lock = threading.RLock()
+        
+        if self.meta_path.exists():
+            self._open()
+    
+    def _open(self):
+        """Map an existing index from disk."""
+        with open(self.meta_path, 'r') as f:
+            meta = json.load(f)
+        self.dim = meta['dim']
+        self.count = meta['count']
+        self.capacity = meta['capacity']
+        
+        with open(self.ids_path, 'r') as f:
+            self.ids = [line.rstrip('\n') for line in itertools.islice(f, self.count)]
+            stale = next(f, None) is not None
+        if stale:
+            # Ids appended by an add that never reached its metadata write;
+            # drop them so later rows stay aligned with their vectors
+            self._write_ids()
+        self._rows = {report_id: row for row, report_id in enumerate(self.ids)}
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode='r+',
+                                  shape=(self.capacity, self.dim))
+        
+        if self.centroids_path.exists():
+            self.centroids = np.load(self.centroids_path)
+            self._assignments = np.memmap(self.assignments_path, dtype=np.int32, mode='r+',
+                                          shape=(self.capacity,))
+            self._build_lists()
+        
+        print(f"Loaded embedding index with {self.count} vectors from {self.root}")
+    
+    def _write_ids(self):
+        """Atomically replace the ids file with the current ids."""
+        tmp_path = self.root / f".ids.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.writelines(report_id + '\n' for report_id in self.ids)
+        os.replace(tmp_path, self.ids_path)
+    
+    def _write_meta(self):
+        """Atomically replace the metadata file."""
+        tmp_path = self.root / f".meta.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'dim': self.dim,
+                'count': self.count,
+                'capacity': self.capacity,
+                'nlist': len(self.centroids) if self.centroids is not None else 0
+            }, f)
+        os.replace(tmp_path, self.meta_path)
+    
+    @staticmethod
+    def _grow_file(path: Path, size: int):
+        """Extend a file to size bytes (new space reads as zeros)."""
+        with open(path, 'ab') as f:
+            f.truncate(size)
+    
+    def _ensure_capacity(self, extra: int):
+        """Grow the memory-mapped files so extra more rows fit."""
+        if self.count + extra <= self.capacity:
+            return
+        
+        capacity = max(self.initial_capacity, 2 * self.capacity, self.count + extra)
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._grow_file(self.vectors_path, capacity * self.dim * 2)
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float16, mode='r+',
+                                  shape=(capacity, self.dim))
+        
+        if self.centroids is not None:
+            self._assignments.flush()
+            self._grow_file(self.assignments_path, capacity * 4)
+            self._assignments = np.memmap(self.assignments_path, dtype=np.int32, mode='r+',
+                                          shape=(capacity,))
+        self.capacity = capacity
+    
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest IVF centroid for each normalized row."""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), SEARCH_CHUNK_ROWS):
+            chunk = vectors[start:start + SEARCH_CHUNK_ROWS]
+            assignments[start:start + len(chunk)] = np.argmax(
+                np.asarray(chunk, dtype=np.float32) @ self.centroids.T, axis=1
+            )
+        return assignments
+    
+    def _build_lists(self):
+        """Rebuild the inverted lists from the stored assignments."""
+        self._lists = [[] for _ in range(len(self.centroids))]
+        for row, cluster in enumerate(self._assignments[:self.count].tolist()):
+            self._lists[cluster].append(row)
+    
+    def add(self, report_ids: Sequence[str], embeddings: np.ndarray):
+        """
+        Append embeddings for verified reports.
+        
+        Args:
+            report_ids: Report id for each row
+            embeddings: Array of shape (N, dim)
+        """
+        vectors = _normalize_rows(embeddings)
+        if len(report_ids) != len(vectors):
+            raise ValueError(f"Got {len(report_ids)} report ids for {len(vectors)} embeddings")
+        
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+            
+            self._ensure_capacity(len(vectors))
+            start, end = self.count, self.count + len(vectors)
+            self._vectors[start:end] = vectors.astype(np.float16)
+            self._vectors.flush()
+            
+            if self.centroids is not None:
+                assignments = self._assign(vectors)
+                self._assignments[start:end] = assignments
+                self._assignments.flush()
+                for row, cluster in zip(range(start, end), assignments.tolist()):
+                    self._lists[cluster].append(row)
+            
+            with open(self.ids_path, 'a') as f:
+                for row, report_id in zip(range(start, end), report_ids):
+                    report_id = str(report_id)
+                    f.write(report_id + '\n')
+                    self.ids.append(report_id)
+                    self._rows[report_id] = row
+            
+            self.count = end
+            self._write_meta()
+    
+    def get_vector(self, report_id: str) -> Optional[np.ndarray]:
+        """Stored (normalized) embedding of a report, or None if unknown."""
+        row = self._rows.get(str(report_id))
+        if row is None:
+            return None
+        return np.asarray(self._vectors[row], dtype=np.float32)
+    
+    def train_ivf(self, nlist: Optional[int] = None, iterations: int = 10,
+                  sample_size: Optional[int] = None, seed: int = 0):
+        """
+        Partition the index into nlist clusters with spherical k-means.
+        
+        Args:
+            nlist: Number of clusters (defaults to 4 * sqrt(vectors), which
+                keeps an nprobe=8 query to a few thousand rows)
+            iterations: k-means iterations
+            sample_size: Rows used for training (defaults to 32 per cluster)
+            seed: Random seed
+        """
+        with self._lock:
+            nlist = nlist or max(1, int(4 * np.sqrt(self.count)))
+            if self.count < nlist:
+                raise ValueError(f"Need at least {nlist} vectors to train {nlist} clusters, have {self.count}")
+            
+            rng = np.random.default_rng(seed)
+            sample_size = min(self.count, sample_size or 32 * nlist)
+            sample_rows = np.sort(rng.choice(self.count, sample_size, replace=False))
+            sample = np.asarray(self._vectors[sample_rows], dtype=np.float32)
+            
+            centroids = sample[rng.choice(sample_size, nlist, replace=False)]
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                counts = np.bincount(labels, minlength=nlist)
+                
+                # Re-seed empty clusters from random sample rows
+                empty = np.flatnonzero(counts == 0)
+                sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+                centroids = _normalize_rows(sums)
+            
+            self.centroids = centroids
+            np.save(self.centroids_path, centroids)
+            
+            self._grow_file(self.assignments_path, self.capacity * 4)
+            self._assignments = np.memmap(self.assignments_path, dtype=np.int32, mode='r+',
+                                          shape=(self.capacity,))
+            self._assignments[:self.count] = self._assign(self._vectors[:self.count])
+            self._assignments.flush()
+            self._build_lists()
+            self._write_meta()
+        
+        print(f"Trained IVF index with {nlist} clusters over {self.count} vectors")
+    
+    def search(self, queries: np.ndarray, k: int = 10,
+               nprobe: int = 8) -> List[List[Tuple[str, float]]]:
+        """
+        Find the most similar stored reports for each query embedding.
+        
+        Args:
+            queries: Array of shape (Q, dim) or (dim,)
+            k: Results per query
+            nprobe: IVF clusters searched per query (ignored without IVF)
+        
+        Returns:
+            For each query, a list of (report_id, cosine similarity), best first
+        """
+        queries = _normalize_rows(queries)
+        with self._lock:
+            vectors, count = self._vectors, self.count
+            lists = self._lists
+        
+        if count == 0:
+            return [[] for _ in queries]
+        if lists is not None:
+            return [self._search_ivf(vectors, lists, query, k, nprobe) for query in queries]
+        
+        # Exact search: stream the matrix in chunks, keep a running top-k per query
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, count, SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:min(start + SEARCH_CHUNK_ROWS, count)], dtype=np.float32)
+            scores = np.concatenate([best_scores, queries @ chunk.T], axis=1)
+            rows = np.concatenate([
+                best_rows,
+                np.broadcast_to(np.arange(start, start + len(chunk)), (len(queries), len(chunk)))
+            ], axis=1)
+            keep = _top_k(scores, k)
+            best_scores = np.take_along_axis(scores, keep, axis=1)
+            best_rows = np.take_along_axis(rows, keep, axis=1)
+        
+        return [
+            [(self.ids[row], float(score)) for row, score in zip(row_list, score_list)]
+            for row_list, score_list in zip(best_rows.tolist(), best_scores.tolist())
+        ]
+    
+    def _search_ivf(self, vectors: np.ndarray, lists: List[List[int]],
+                    query: np.ndarray, k: int, nprobe: int) -> List[Tuple[str, float]]:
+        """Search only the nprobe clusters closest to one query."""
+        probes = _top_k(self.centroids @ query, nprobe)
+        rows = np.fromiter(
+            itertools.chain.from_iterable(lists[cluster] for cluster in probes), dtype=np.int64
+        )
+        if not len(rows):
+            return []
+        
+        rows.sort()
+        scores = np.asarray(vectors[rows], dtype=np.float32) @ query
+        keep = _top_k(scores, k)
+        return [(self.ids[row], float(score)) for row, score in zip(rows[keep].tolist(), scores[keep].tolist())]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and layout of the index."""
+        return {
+            'root': str(self.root),
+            'vectors': self.count,
+            'dim': self.dim,
+            'capacity': self.capacity,
+            'size_mb': self.capacity * (self.dim or 0) * 2 / (1024 * 1024),
+            'ivf_clusters': len(self.centroids) if self.centroids is not None else 0
+        }
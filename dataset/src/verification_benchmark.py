@@ -0,0 +1,367 @@
+"""
+OceanWatch Sentinel - Verification Benchmark Module
+
+This module load-tests AIVerificationService against locally created
+stand-in models and synthetic phone-sized photos. It drives verify_image,
+batch_verify_images and integrate_with_report_hazard at configurable
+concurrency and batch sizes, reports throughput, latency percentiles, peak
+RSS and startup time, and compares the results to a stored JSON baseline.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from verification_integration import AIVerificationService, integrate_with_report_hazard
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Typical phone camera resolutions (width, height)
+DEFAULT_IMAGE_SIZES = [(1280, 960), (1920, 1080), (3024, 4032)]
+
+# Metrics where a larger value is a regression; throughput is the opposite
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mb', 'startup_seconds')
+HIGHER_IS_BETTER = ('throughput',)
+
+
+def create_stand_in_models(model_dir: str, architecture: str = 'mobilenet',
+                           quantize: bool = False) -> Path:
+    """
+    Build untrained models with the production input/output signature.
+    
+    Args:
+        model_dir: Directory for ocean_hazard_model.h5 / .tflite
+        architecture: 'mobilenet' (MobileNetV2 backbone, realistic compute)
+            or 'tiny' (a single conv layer, for quick smoke runs)
+        quantize: Convert the TFLite model with full-integer quantization
+    
+    Returns:
+        Path of the model directory
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    
+    inputs = keras.Input(shape=(224, 224, 3))
+    if architecture == 'mobilenet':
+        backbone = keras.applications.MobileNetV2(
+            input_shape=(224, 224, 3), include_top=False, weights=None
+        )
+        x = backbone(inputs)
+    elif architecture == 'tiny':
+        x = layers.Conv2D(16, 3, strides=4, activation='relu')(inputs)
+    else:
+        raise ValueError(f"Unknown stand-in architecture: {architecture}")
+    
+    x = layers.GlobalAveragePooling2D()(x)
+    hazard_output = layers.Dense(9, activation='softmax', name='hazard_classification')(x)
+    ai_output = layers.Dense(1, activation='sigmoid', name='ai_detection')(x)
+    model = keras.Model(inputs=inputs, outputs=[hazard_output, ai_output])
+    model.save(model_dir / "ocean_hazard_model.h5")
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantize:
+        def representative_data_gen():
+            for _ in range(20):
+                yield [np.random.random((1, 224, 224, 3)).astype(np.float32)]
+        
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_data_gen
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.uint8
+        converter.inference_output_type = tf.uint8
+    
+    with open(model_dir / "ocean_hazard_model.tflite", 'wb') as f:
+        f.write(converter.convert())
+    
+    print(f"Stand-in {architecture} models written to {model_dir}")
+    return model_dir
+
+
+def generate_synthetic_images(image_dir: str, count: int,
+                              sizes: Sequence[Tuple[int, int]] = DEFAULT_IMAGE_SIZES,
+                              seed: int = 0) -> List[str]:
+    """
+    Write JPEG photos with sky/sea gradients, shapes and sensor noise.
+    
+    Args:
+        image_dir: Output directory
+        count: Number of images
+        sizes: (width, height) pairs, used round-robin
+        seed: Random seed
+    
+    Returns:
+        List of image paths
+    """
+    image_dir = Path(image_dir)
+    image_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    paths = []
+    
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        path = image_dir / f"synthetic_{width}x{height}_{i:04d}.jpg"
+        paths.append(str(path))
+        if path.exists():
+            continue
+        
+        # Sky-to-sea gradient, a few solid objects and sensor noise
+        rows = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+        sky, sea = rng.uniform(100, 255, 3), rng.uniform(0, 120, 3)
+        image = (sky * (1 - rows) + sea * rows) * np.ones((1, width, 1), dtype=np.float32)
+        for _ in range(rng.integers(3, 8)):
+            center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+            radius = int(rng.integers(min(width, height) // 20, min(width, height) // 5))
+            cv2.circle(image, center, radius, rng.uniform(0, 255, 3).tolist(), -1)
+        image += rng.normal(0, 8, image.shape).astype(np.float32)
+        cv2.imwrite(str(path), np.clip(image, 0, 255).astype(np.uint8),
+                    [cv2.IMWRITE_JPEG_QUALITY, 90])
+    
+    return paths
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def summarize(latencies: List[float], items: int, wall_seconds: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles for one scenario."""
+    latencies_ms = 1000.0 * np.asarray(latencies)
+    return {
+        'calls': len(latencies),
+        'items': items,
+        'wall_seconds': wall_seconds,
+        'throughput': items / wall_seconds if wall_seconds else 0.0,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        # Process-wide peak so far, including every earlier scenario; only
+        # the run-level peak_rss_mb is compared against the baseline
+        'cumulative_peak_rss_mb': peak_rss_mb()
+    }
+
+
+def run_concurrent(call, payloads: List[Any], concurrency: int) -> Dict[str, Any]:
+    """Run call(payload) for every payload from concurrency threads."""
+    def timed(payload):
+        start = time.perf_counter()
+        call(payload)
+        return time.perf_counter() - start
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed, payloads))
+    return summarize(latencies, len(payloads), time.perf_counter() - start)
+
+
+def run_benchmarks(model_dir: str, image_paths: List[str],
+                   concurrency: Sequence[int] = (1, 4),
+                   batch_sizes: Sequence[int] = (8, 32),
+                   interpreter_pool_size: int = 4,
+                   repeat: int = 1) -> Dict[str, Any]:
+    """
+    Run every scenario and collect the results.
+    
+    Args:
+        model_dir: Directory with the (stand-in) models
+        image_paths: Images to verify
+        concurrency: Thread counts for the per-request scenarios
+        batch_sizes: Batch sizes for batch_verify_images
+        interpreter_pool_size: TFLite interpreters shared by concurrent callers
+        repeat: Passes over the images per scenario
+    
+    Returns:
+        Results dictionary keyed by scenario name
+    """
+    # Cache disabled so every call measures decode + inference
+    start = time.perf_counter()
+    service = AIVerificationService(
+        model_dir, cache_size=0, interpreter_pool_size=interpreter_pool_size,
+        warmup_batch_sizes=(1,)
+    )
+    startup_seconds = time.perf_counter() - start
+    
+    results = {
+        'created': datetime.now().isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'tensorflow': tf.__version__
+        },
+        'config': {
+            'images': len(image_paths),
+            'concurrency': list(concurrency),
+            'batch_sizes': list(batch_sizes),
+            'interpreter_pool_size': interpreter_pool_size,
+            'repeat': repeat,
+            'models_loaded': list(service.models.keys())
+        },
+        'startup': {
+            'startup_seconds': startup_seconds,
+            **{key: value for key, value in service.startup_stats.items() if key != 'load_seconds'}
+        },
+        'scenarios': {}
+    }
+    scenarios = results['scenarios']
+    paths = list(image_paths) * repeat
+    uploads = []
+    for path in image_paths:
+        with open(path, 'rb') as f:
+            uploads.append(f.read())
+    uploads = uploads * repeat
+    
+    for threads in concurrency:
+        name = f"verify_image/c{threads}"
+        scenarios[name] = run_concurrent(lambda path: service.verify_image(path, 'tsunami'), paths, threads)
+        print(f"{name}: {scenarios[name]['throughput']:.1f} img/s, p95 {scenarios[name]['p95_ms']:.1f} ms")
+        
+        name = f"integrate_with_report_hazard/c{threads}"
+        scenarios[name] = run_concurrent(
+            lambda data: integrate_with_report_hazard(service, data, 'tsunami'), uploads, threads
+        )
+        print(f"{name}: {scenarios[name]['throughput']:.1f} img/s, p95 {scenarios[name]['p95_ms']:.1f} ms")
+    
+    for batch_size in batch_sizes:
+        name = f"batch_verify_images/b{batch_size}"
+        chunks = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+        latencies = []
+        start = time.perf_counter()
+        for chunk in chunks:
+            chunk_start = time.perf_counter()
+            service.batch_verify_images(chunk, batch_size=batch_size)
+            latencies.append(time.perf_counter() - chunk_start)
+        scenarios[name] = summarize(latencies, len(paths), time.perf_counter() - start)
+        print(f"{name}: {scenarios[name]['throughput']:.1f} img/s, p95 {scenarios[name]['p95_ms']:.1f} ms/batch")
+    
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = 0.15) -> List[str]:
+    """
+    Find metrics that regressed beyond a relative threshold.
+    
+    Args:
+        results: Output of run_benchmarks
+        baseline: Previously stored results
+        threshold: Allowed relative change (0.15 = 15%)
+    
+    Returns:
+        Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    
+    def check(label: str, metric: str, current: Optional[float], reference: Optional[float]):
+        if current is None or not reference:
+            return
+        change = (current - reference) / reference
+        if metric in LOWER_IS_BETTER and change > threshold:
+            regressions.append(f"{label} {metric}: {reference:.2f} -> {current:.2f} (+{100 * change:.1f}%)")
+        elif metric in HIGHER_IS_BETTER and change < -threshold:
+            regressions.append(f"{label} {metric}: {reference:.2f} -> {current:.2f} ({100 * change:.1f}%)")
+    
+    for name, reference in baseline.get('scenarios', {}).items():
+        current = results['scenarios'].get(name)
+        if current is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric != 'peak_rss_mb':
+                check(name, metric, current.get(metric), reference.get(metric))
+    
+    check('startup', 'startup_seconds', results.get('startup', {}).get('startup_seconds'),
+          baseline.get('startup', {}).get('startup_seconds'))
+    check('process', 'peak_rss_mb', results.get('peak_rss_mb'), baseline.get('peak_rss_mb'))
+    return regressions
+
+
+def main():
+    """Run the verification benchmark suite."""
+    parser = argparse.ArgumentParser(description="OceanWatch Sentinel verification benchmarks")
+    parser.add_argument("--work-dir", default="dataset/benchmarks")
+    parser.add_argument("--model-dir", default=None,
+                        help="Existing models to benchmark (default: build stand-ins in the work dir)")
+    parser.add_argument("--architecture", choices=['mobilenet', 'tiny'], default='mobilenet')
+    parser.add_argument("--quantize", action="store_true")
+    parser.add_argument("--images", type=int, default=48)
+    parser.add_argument("--image-size", action="append", default=None,
+                        help="WIDTHxHEIGHT, may be repeated")
+    parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 4])
+    parser.add_argument("--batch-sizes", type=int, nargs='+', default=[8, 32])
+    parser.add_argument("--interpreter-pool-size", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    
+    work_dir = Path(args.work_dir)
+    model_dir = args.model_dir
+    if model_dir is None:
+        model_dir = work_dir / f"models_{args.architecture}{'_int8' if args.quantize else ''}"
+        if not (model_dir / "ocean_hazard_model.tflite").exists():
+            create_stand_in_models(model_dir, args.architecture, args.quantize)
+    
+    sizes = DEFAULT_IMAGE_SIZES
+    if args.image_size:
+        sizes = [tuple(int(v) for v in size.lower().split('x')) for size in args.image_size]
+    image_paths = generate_synthetic_images(work_dir / "images", args.images, sizes)
+    
+    results = run_benchmarks(
+        model_dir, image_paths, args.concurrency, args.batch_sizes,
+        args.interpreter_pool_size, args.repeat
+    )
+    
+    output = Path(args.output) if args.output else work_dir / "results.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+    
+    baseline_path = Path(args.baseline) if args.baseline else work_dir / "baseline.json"
+    if args.save_baseline:
+        with open(baseline_path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+        return
+    
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return
+    
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {100 * args.threshold:.0f}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions beyond {100 * args.threshold:.0f}% against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
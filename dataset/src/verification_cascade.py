@@ -0,0 +1,210 @@
+"""
+OceanWatch Sentinel - Verification Cascade Module
+
+This module provides cheap image pre-checks and a confidence-gated model
+cascade. Pre-checks reject undecodable, tiny, blank and blurry uploads
+before any model runs. The cascade sends every image through the fast
+TFLite model and escalates only the uncertain ones to the heavier Keras
+model, reporting how much traffic each tier handled and what it cost.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+PRECHECK_MESSAGES = {
+    'too_small': 'Image resolution is too low - please upload a larger photo',
+    'blank': 'Image appears to be blank - please upload a photo of the hazard',
+    'blurry': 'Image is too blurry - please upload a sharper photo'
+}
+
+
+class RejectedImage:
+    """Decoder output for an image that failed a pre-check."""
+    
+    __slots__ = ('reason',)
+    
+    def __init__(self, reason: str):
+        self.reason = reason
+    
+    def __repr__(self) -> str:
+        return f"RejectedImage({self.reason!r})"
+
+
+class ImagePrechecks:
+    """Cheap checks run at decode time, before any model sees the image."""
+    
+    def __init__(self, min_width: int = 128, min_height: int = 128,
+                 min_std: float = 3.0, min_sharpness: float = 5.0):
+        """
+        Args:
+            min_width: Minimum source width in pixels
+            min_height: Minimum source height in pixels
+            min_std: Minimum grayscale standard deviation (below is blank)
+            min_sharpness: Minimum variance of the Laplacian at model input
+                size (below is blurry); 0 disables the blur check
+        """
+        self.min_width = min_width
+        self.min_height = min_height
+        self.min_std = min_std
+        self.min_sharpness = min_sharpness
+        
+        self._lock = threading.Lock()
+        self.stats = {'checked': 0, 'rejected': defaultdict(int)}
+    
+    def check_source(self, image: np.ndarray) -> Optional[str]:
+        """
+        Check the decoded image before resizing.
+        
+        Args:
+            image: Decoded BGR image at its original resolution
+        
+        Returns:
+            Rejection reason, or None if the image passes
+        """
+        height, width = image.shape[:2]
+        if width < self.min_width or height < self.min_height:
+            return self._record('too_small')
+        return None
+    
+    def check(self, image: np.ndarray) -> Optional[str]:
+        """
+        Check a resized RGB uint8 image for blank or blurry frames.
+        
+        Args:
+            image: RGB uint8 image at model input size
+        
+        Returns:
+            Rejection reason, or None if the image passes
+        """
+        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+        _, std = cv2.meanStdDev(gray)
+        if std[0][0] < self.min_std:
+            return self._record('blank')
+        
+        if self.min_sharpness > 0:
+            sharpness = cv2.Laplacian(gray, cv2.CV_32F).var()
+            if sharpness < self.min_sharpness:
+                return self._record('blurry')
+        
+        return self._record(None)
+    
+    def _record(self, reason: Optional[str]) -> Optional[str]:
+        """Count a finished check."""
+        with self._lock:
+            self.stats['checked'] += 1
+            if reason is not None:
+                self.stats['rejected'][reason] += 1
+        return reason
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Checked and rejected counts by reason."""
+        with self._lock:
+            rejected = dict(self.stats['rejected'])
+            checked = self.stats['checked']
+        return {
+            'checked': checked,
+            'rejected': rejected,
+            'rejection_rate': sum(rejected.values()) / checked if checked else 0.0
+        }
+
+
+class VerificationCascade:
+    """Fast-model-first prediction that escalates uncertain images."""
+    
+    def __init__(self, hazard_band: Tuple[float, float] = (0.5, 0.85),
+                 ai_band: Tuple[float, float] = (0.3, 0.7)):
+        """
+        Args:
+            hazard_band: Hazard confidences in [low, high) are escalated
+            ai_band: AI-detection scores in [low, high) are escalated
+        """
+        self.hazard_band = hazard_band
+        self.ai_band = ai_band
+        
+        self._lock = threading.Lock()
+        self.stats = {
+            'images': 0,
+            'escalated': 0,
+            'fast_seconds': 0.0,
+            'heavy_seconds': 0.0
+        }
+    
+    def is_uncertain(self, prediction: Dict[str, Any]) -> bool:
+        """Whether a fast-tier prediction falls in an uncertainty band."""
+        hazard_low, hazard_high = self.hazard_band
+        ai_low, ai_high = self.ai_band
+        return (hazard_low <= prediction['hazard_confidence'] < hazard_high
+                or ai_low <= prediction['ai_confidence'] < ai_high)
+    
+    def run(self, images: np.ndarray,
+            fast: Callable[[np.ndarray], List[Dict[str, Any]]],
+            heavy: Callable[[np.ndarray], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Predict a batch with the fast model, re-running uncertain images on the heavy one.
+        
+        Args:
+            images: Batch of raw uint8 pixels
+            fast: Batch predictor for the fast tier
+            heavy: Batch predictor for the heavy tier
+        
+        Returns:
+            List of predictions, each tagged with the tier that produced it
+        """
+        start = time.perf_counter()
+        predictions = fast(images)
+        fast_seconds = time.perf_counter() - start
+        
+        for prediction in predictions:
+            prediction['tier'] = 'fast'
+        uncertain = [
+            i for i, prediction in enumerate(predictions)
+            if not prediction.get('fallback') and self.is_uncertain(prediction)
+        ]
+        
+        heavy_seconds = 0.0
+        escalated = 0
+        if uncertain:
+            start = time.perf_counter()
+            heavy_predictions = heavy(images[uncertain])
+            heavy_seconds = time.perf_counter() - start
+            
+            for i, prediction in zip(uncertain, heavy_predictions):
+                # Keep the fast answer if the heavy model is unavailable
+                if prediction.get('fallback'):
+                    continue
+                prediction['tier'] = 'heavy'
+                predictions[i] = prediction
+                escalated += 1
+        
+        with self._lock:
+            self.stats['images'] += len(predictions)
+            self.stats['escalated'] += escalated
+            self.stats['fast_seconds'] += fast_seconds
+            self.stats['heavy_seconds'] += heavy_seconds
+        
+        return predictions
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Share of traffic per tier and the resulting average latency."""
+        with self._lock:
+            stats = dict(self.stats)
+        
+        images, escalated = stats['images'], stats['escalated']
+        total_seconds = stats['fast_seconds'] + stats['heavy_seconds']
+        return {
+            'hazard_band': list(self.hazard_band),
+            'ai_band': list(self.ai_band),
+            'images': images,
+            'fast_only': images - escalated,
+            'escalated': escalated,
+            'escalation_rate': escalated / images if images else 0.0,
+            'avg_fast_ms_per_image': 1000.0 * stats['fast_seconds'] / images if images else 0.0,
+            'avg_heavy_ms_per_escalation': 1000.0 * stats['heavy_seconds'] / escalated if escalated else 0.0,
+            'avg_latency_ms_per_image': 1000.0 * total_seconds / images if images else 0.0
+        }
@@ -7,6 +7,10 @@ Replaces the simulated verification with real AI model predictions.
 
 import os
 import json
+import time
+import hashlib
+import tempfile
+import threading
 import numpy as np
 import tensorflow as tf
 from tensorflow import keras
@@ -14,16 +18,120 @@ from PIL import Image
 import cv2
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from datetime import datetime
 
+from duplicate_index import NearDuplicateIndex
+from early_exit import EARLY_EXIT_MANIFEST, EarlyExitPolicy, EarlyExitStages
+from event_clustering import HazardEventClusterer
+from geo_index import GeoIndex
+from inference_backends import BACKENDS, MODEL_FILES, BackendSelector, normalize_pixels, split_heads
+from model_registry import ModelRegistry, RegistryWatcher
+from result_cache import VerificationResultCache, content_hash
+from vector_index import EmbeddingIndex
+from video_sampling import VideoFrameSampler
+from verification_metrics import VerificationMetrics
+from verification_cascade import (
+    PRECHECK_MESSAGES,
+    ImagePrechecks,
+    RejectedImage,
+    VerificationCascade,
+)
+
 
 class AIVerificationService:
     """AI-powered verification service for ocean hazard images."""
     
-    def __init__(self, model_path: str = "dataset/models"):
+    def __init__(self, model_path: str = "dataset/models",
+                 batch_size: int = 32, decode_workers: Optional[int] = None,
+                 interpreter_pool_size: int = 1,
+                 interpreter_threads: Optional[int] = None,
+                 cache_size: int = 1024,
+                 cache_dir: Optional[str] = None,
+                 lazy_backends: Tuple[str, ...] = ('keras',),
+                 warmup_batch_sizes: Optional[Tuple[int, ...]] = None,
+                 load_models: bool = True,
+                 enable_metrics: bool = True,
+                 prechecks: Optional[ImagePrechecks] = None,
+                 cascade: Optional[VerificationCascade] = None,
+                 near_duplicates: Optional[NearDuplicateIndex] = None,
+                 vector_index: Optional[EmbeddingIndex] = None,
+                 geo_index: Optional[GeoIndex] = None,
+                 event_clusterer: Optional[HazardEventClusterer] = None,
+                 video_sampler: Optional[VideoFrameSampler] = None,
+                 early_exit: Optional[EarlyExitPolicy] = None,
+                 backend_selector: Optional[BackendSelector] = None):
+        init_start = time.perf_counter()
         self.model_path = Path(model_path)
         self.models = {}
+        self.model_version = 'fallback'
+        self.input_size = (224, 224)
+        self.batch_size = batch_size
+        self.decode_workers = decode_workers or min(8, os.cpu_count() or 1)
+        
+        # TFLite interpreters are not thread-safe; concurrent callers each
+        # check one out of a pool of this size
+        self.interpreter_pool_size = interpreter_pool_size
+        self.interpreter_threads = interpreter_threads
+        
+        # Backends listed here are only loaded the first time they are needed
+        self.lazy_backends = tuple(lazy_backends)
+        self._deferred = {}
+        self._load_lock = threading.Lock()
+        
+        # Per-thread input buffers reused across batches
+        self._buffers = threading.local()
+        
+        # Stage latencies, batch sizes, fallbacks and outcomes
+        self.metrics = VerificationMetrics(enabled=enable_metrics)
+        
+        # Optional junk rejection at decode time and TFLite -> Keras escalation
+        self.prechecks = prechecks
+        self.cascade = cascade
+        
+        # Optional perceptual-hash index answering re-shared photos without inference
+        self.near_duplicates = near_duplicates
+        
+        # Optional index of pooled backbone embeddings for similar-report search
+        self.vector_index = vector_index
+        self._embedding_model_cache = None
+        
+        # Optional spatial index over the locations of verified reports
+        self.geo_index = geo_index
+        
+        # Optional streaming clustering of verified reports into hazard events
+        self.event_clusterer = event_clusterer
+        
+        # Frame selection and budgets for verify_video
+        self.video_sampler = video_sampler or VideoFrameSampler()
+        
+        # Optional exit thresholds; serves the exported early-exit stages when present
+        self.early_exit = early_exit
+        
+        # Optional on-host benchmark choosing the serving backend at load time;
+        # otherwise TFLite is preferred, then ONNX, then Keras
+        self.backend_selector = backend_selector
+        self.selected_backend = None
+        self.backend_selection = None
+        
+        # Optional model registry: active version served, candidate shadow-scored
+        self.registry = None
+        self.registry_version = None
+        self._registry_watcher = None
+        self._shadow = None
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._shadow_pending = 0
+        self._shadow_lock = threading.Lock()
+        self.shadow_stats = {}
+        
+        # Startup timings reported by get_model_info
+        self.startup_stats = {
+            'load_seconds': {},
+            'warmup_seconds': None,
+            'cold_start_seconds': None,
+            'first_request_ms': None
+        }
         self.hazard_types = [
             "tsunami", "storm_surge", "high_waves", "flooding",
             "debris", "pollution", "erosion", "wildlife", "other"
@@ -31,66 +139,454 @@ class AIVerificationService:
         self.hazard_to_idx = {hazard: idx for idx, hazard in enumerate(self.hazard_types)}
         self.idx_to_hazard = {idx: hazard for hazard, idx in self.hazard_to_idx.items()}
         
-        # Load models
-        self._load_models()
+        # Results keyed by image content + model version + selected hazard type
+        self.result_cache = None
+        if cache_size > 0 or cache_dir:
+            self.result_cache = VerificationResultCache(cache_size, cache_dir)
+        
+        # Load models (skipped by front ends that only decode, e.g. process_workers)
+        if load_models:
+            self._load_models()
     
-    def _load_models(self):
-        """Load the trained AI models."""
-        try:
+        if warmup_batch_sizes:
+            self.warm_up(warmup_batch_sizes)
+        self.startup_stats['cold_start_seconds'] = time.perf_counter() - init_start
+    
+    def _load_backend(self, backend: str, path: Path) -> Any:
+        """Load a single backend and record how long it took."""
+        start = time.perf_counter()
+        
+        if backend == 'tflite':
             # Load TensorFlow Lite model for deployment
-            tflite_path = self.model_path / "ocean_hazard_model.tflite"
-            if tflite_path.exists():
-                self.models['tflite'] = tf.lite.Interpreter(model_path=str(tflite_path))
-                self.models['tflite'].allocate_tensors()
-                print("TensorFlow Lite model loaded successfully")
+            model = BACKENDS['tflite'](
+                path,
+                num_threads=self.interpreter_threads,
+                pool_size=self.interpreter_pool_size
+            ).load()
+            print(f"TensorFlow Lite model loaded successfully "
+                  f"({self.interpreter_pool_size} interpreter(s))")
+        elif backend == 'early_exit':
+            # One interpreter pool per exported stage
+            model = EarlyExitStages(
+                path,
+                pool_size=self.interpreter_pool_size,
+                num_threads=self.interpreter_threads
+            )
+            print(f"Early-exit model loaded successfully ({len(model)} stages)")
+        else:
+            # Keras for detailed analysis, ONNX Runtime when installed
+            model = BACKENDS[backend](path, num_threads=self.interpreter_threads).load()
+            print(f"{backend} model loaded successfully")
+        
+        self.startup_stats['load_seconds'][backend] = time.perf_counter() - start
+        return model
+    
+    def _load_models(self, require_models: bool = False):
+        """
+        Load the trained AI models.
+        
+        Args:
+            require_models: Raise, keeping the current models, if no
+                serving backend could be loaded
+        """
+        models = {}
+        deferred = {}
+        model_files = {
+            backend: self.model_path / filename
+            for backend, filename in MODEL_FILES.items()
+            if BACKENDS[backend].available()
+        }
+        if self.early_exit is not None:
+            model_files['early_exit'] = self.model_path / EARLY_EXIT_MANIFEST
             
-            # Load Keras model for detailed analysis
-            keras_path = self.model_path / "ocean_hazard_model.h5"
-            if keras_path.exists():
-                self.models['keras'] = keras.models.load_model(str(keras_path))
-                print("Keras model loaded successfully")
+        for backend, path in model_files.items():
+            if not path.exists():
+                continue
+            if backend in self.lazy_backends:
+                deferred[backend] = path
+                continue
+            try:
+                models[backend] = self._load_backend(backend, path)
+            except Exception as e:
+                print(f"Error loading {backend} model: {e}")
             
-            if not self.models:
-                print("Warning: No models found. Using fallback verification.")
+        # A lazy backend that is the only one available is needed right away
+        if not models:
+            for backend in list(deferred):
+                try:
+                    models[backend] = self._load_backend(backend, deferred.pop(backend))
+                    break
+                except Exception as e:
+                    print(f"Error loading {backend} model: {e}")
                 
-        except Exception as e:
-            print(f"Error loading models: {e}")
-            print("Using fallback verification.")
+        if not models:
+            if require_models:
+                raise RuntimeError(f"No model in {self.model_path} could be loaded")
+            print("Warning: No models found. Using fallback verification.")
+        
+        model_version = self._compute_model_version(
+            [path for backend, path in model_files.items() if backend in models or backend in deferred]
+        )
+        
+        # Swap in the new models, their version and an empty result cache
+        # together, so no result is cached under the wrong version
+        with self._load_lock:
+            self.models = models
+            self._deferred = deferred
+            self.model_version = model_version
+            if self.result_cache is not None:
+                self.result_cache.invalidate()
+        
+        if self.backend_selector is not None:
+            self.select_backend()
     
-    def preprocess_image(self, image_path: str) -> np.ndarray:
+    def select_backend(self) -> Optional[str]:
         """
-        Preprocess image for AI model input.
+        Benchmark every available backend and serve the fastest one that agrees with the reference.
+        
+        Deferred backends are loaded for the comparison. The report is kept
+        for get_model_info.
+        
+        Returns:
+            Name of the selected backend, or None if none could run
+        """
+        selector = self.backend_selector or BackendSelector()
+        start = time.perf_counter()
+        candidates = {}
+        for backend in MODEL_FILES:
+            if self._has_backend(backend):
+                model = self._get_backend(backend)
+                if model is not None:
+                    candidates[backend] = model
+        
+        selected, report = selector.select(candidates, len(self.hazard_types), self.input_size)
+        report['seconds'] = time.perf_counter() - start
+        self.selected_backend = selected
+        self.backend_selection = report
+        
+        if selected is not None:
+            timings = ', '.join(
+                f"{name} {result['ms_per_image']:.1f} ms/img" + ('' if result.get('agrees') else ' (disagrees)')
+                for name, result in report['backends'].items() if 'ms_per_image' in result
+            )
+            print(f"Serving with {selected} backend ({timings})")
+        return selected
+    
+    def serving_backend(self) -> Optional[str]:
+        """Backend plain predictions run on: the selected one, else the first available."""
+        if self.selected_backend is not None and self._has_backend(self.selected_backend):
+            return self.selected_backend
+        return next((backend for backend in ('tflite', 'onnx', 'keras') if self._has_backend(backend)), None)
+    
+    def _has_backend(self, backend: str) -> bool:
+        """Whether a backend is loaded or can be loaded on demand."""
+        return backend in self.models or backend in self._deferred
+    
+    def _get_backend(self, backend: str) -> Any:
+        """Get a loaded backend, loading a deferred one on first use."""
+        model = self.models.get(backend)
+        if model is not None or backend not in self._deferred:
+            return model
+        
+        with self._load_lock:
+            if backend not in self.models and backend in self._deferred:
+                try:
+                    model = self._load_backend(backend, self._deferred[backend])
+                except Exception as e:
+                    print(f"Error loading {backend} model: {e}")
+                    return None
+                # Copy-on-write so concurrent readers never see a partial dict
+                self.models = {**self.models, backend: model}
+                self._deferred = {k: v for k, v in self._deferred.items() if k != backend}
+            return self.models.get(backend)
+    
+    def attach_registry(self, registry: ModelRegistry, watch: bool = True,
+                        poll_interval: float = 5.0):
+        """
+        Serve the registry's active version and follow it as it changes.
+        
+        New versions are loaded next to the current models and swapped in
+        once ready; batches already running keep the models they started
+        with, so no in-flight request is dropped.
+        
+        Args:
+            registry: Model registry to follow
+            watch: Whether to poll for changes in a background thread
+            poll_interval: Seconds between polls
+        """
+        self.registry = registry
+        self._registry_watcher = RegistryWatcher(registry, self._apply_registry_state, poll_interval)
+        self._registry_watcher.check()
+        if watch:
+            self._registry_watcher.start()
+    
+    def stop_watching_registry(self):
+        """Stop following the model registry."""
+        if self._registry_watcher is not None:
+            self._registry_watcher.stop()
+    
+    def _apply_registry_state(self, active: Optional[str], shadow: Optional[str]):
+        """Swap to a new active version and/or shadow candidate."""
+        if active is not None and active != self.registry_version:
+            if not self.registry.verify(active):
+                raise ValueError(f"Model version {active} fails checksum verification")
+            
+            # Keep serving the current models unless the new version loads
+            previous_path = self.model_path
+            self.model_path = self.registry.version_path(active)
+            try:
+                self._load_models(require_models=True)
+            except Exception:
+                self.model_path = previous_path
+                raise
+            self.registry_version = active
+            print(f"Serving model version {active}")
+        
+        current_shadow = self.shadow_stats.get('version')
+        if shadow != current_shadow:
+            if shadow is None or shadow == active:
+                with self._shadow_lock:
+                    self._shadow = None
+                    self.shadow_stats = {}
+            else:
+                if not self.registry.verify(shadow):
+                    raise ValueError(f"Model version {shadow} fails checksum verification")
+                candidate = AIVerificationService(
+                    self.registry.version_path(shadow),
+                    batch_size=self.batch_size,
+                    decode_workers=1,
+                    cache_size=0,
+                    lazy_backends=self.lazy_backends
+                )
+                with self._shadow_lock:
+                    self._shadow = candidate
+                    self.shadow_stats = {
+                        'version': shadow,
+                        'batches': 0,
+                        'images': 0,
+                        'skipped_batches': 0,
+                        'errors': 0,
+                        'status_matches': 0,
+                        'type_matches': 0,
+                        'confidence_abs_diff': 0.0
+                    }
+                print(f"Shadow-scoring model version {shadow}")
+    
+    def _submit_shadow(self, images: np.ndarray, selected_hazard_types: List[str],
+                       results: List[Dict[str, Any]]):
+        """Score a served batch with the shadow model in the background."""
+        with self._shadow_lock:
+            shadow, stats = self._shadow, self.shadow_stats
+            if shadow is None:
+                return
+        
+            # Never let the candidate slow down live traffic
+            if self._shadow_pending >= 2:
+                stats['skipped_batches'] += 1
+                return
+            self._shadow_pending += 1
+        
+        def score():
+            try:
+                shadow_results = shadow.verify_batch(list(images), selected_hazard_types)
+                with self._shadow_lock:
+                    stats['batches'] += 1
+                    stats['images'] += len(results)
+                    for served, candidate in zip(results, shadow_results):
+                        stats['status_matches'] += served['status'] == candidate['status']
+                        stats['type_matches'] += (
+                            served['hazard_detection']['detected_type']
+                            == candidate.get('hazard_detection', {}).get('detected_type')
+                        )
+                        stats['confidence_abs_diff'] += abs(served['confidence'] - candidate['confidence'])
+            except Exception as e:
+                with self._shadow_lock:
+                    stats['errors'] += 1
+                print(f"Error in shadow scoring: {e}")
+            finally:
+                with self._shadow_lock:
+                    self._shadow_pending -= 1
+        
+        self._shadow_executor.submit(score)
+    
+    def get_shadow_stats(self) -> Dict[str, Any]:
+        """Agreement between the served model and the shadow candidate."""
+        with self._shadow_lock:
+            stats = dict(self.shadow_stats)
+        images = stats.get('images', 0)
+        if images:
+            stats['status_agreement'] = stats['status_matches'] / images
+            stats['type_agreement'] = stats['type_matches'] / images
+            stats['mean_confidence_abs_diff'] = stats['confidence_abs_diff'] / images
+        return stats
+    
+    def warm_up(self, batch_sizes: Tuple[int, ...] = (1,)) -> float:
+        """
+        Run synthetic batches through the active backend.
+        
+        Loads a deferred backend if it is the one that will serve requests,
+        and pays interpreter allocation / graph tracing costs up front.
+        Every pooled interpreter is exercised; the last batch size stays
+        allocated, so list the most common size last.
+        
+        Args:
+            batch_sizes: Batch sizes to run
+        
+        Returns:
+            Warm-up time in seconds
+        """
+        start = time.perf_counter()
+        pooled = self.serving_backend() == 'tflite' or self._has_backend('early_exit')
+        rounds = self.interpreter_pool_size if pooled else 1
+        
+        for batch_size in batch_sizes:
+            images = np.random.randint(0, 256, (batch_size, *self.input_size, 3), dtype=np.uint8)
+            for _ in range(rounds):
+                self.predict_batch(images)
+        
+        elapsed = time.perf_counter() - start
+        self.startup_stats['warmup_seconds'] = elapsed
+        print(f"Warm-up completed in {elapsed:.2f}s")
+        return elapsed
+    
+    def _pixel_buffer(self, batch_size: int) -> np.ndarray:
+        """Reusable per-thread uint8 batch buffer."""
+        buffer = getattr(self._buffers, 'pixels', None)
+        if buffer is None or len(buffer) < batch_size:
+            buffer = np.empty((max(batch_size, self.batch_size), *self.input_size, 3), dtype=np.uint8)
+            self._buffers.pixels = buffer
+        return buffer[:batch_size]
+    
+    def reload_models(self):
+        """Reload models from model_path and invalidate cached results."""
+        self._load_models()
+    
+    def _compute_model_version(self, model_files: List[Path]) -> str:
+        """Hash the loaded model files into a short version string."""
+        if not model_files:
+            return 'fallback'
+        
+        digest = hashlib.blake2b(digest_size=8)
+        for path in model_files:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_key(self, data: bytes, selected_hazard_type: str = None) -> Optional[str]:
+        """Result cache key for encoded image bytes, or None when caching is off."""
+        if self.result_cache is None:
+            return None
+        return VerificationResultCache.make_key(
+            content_hash(data), self.model_version, selected_hazard_type
+        )
+    
+    def _cache_lookup(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Fetch a cached result, flagged as such."""
+        if key is None:
+            return None
+        result = self.result_cache.get(key)
+        if result is not None:
+            result['cached'] = True
+            self.metrics.count_outcome('cached')
+        return result
+    
+    def _cache_store(self, key: Optional[str], result: Dict[str, Any]):
+        """Cache a result unless it came from an error or the fallback path."""
+        if key is None or result['status'] == 'error' or result.get('fallback'):
+            return
+        self.result_cache.put(key, result)
+    
+    def decode_image(self, image_path: str) -> Optional[np.ndarray]:
+        """
+        Decode and resize an image to the model input size.
         
         Args:
             image_path: Path to the image file
             
         Returns:
-            Preprocessed image array
+            RGB uint8 array of shape (224, 224, 3), a RejectedImage if a
+            pre-check failed, or None on failure
         """
         try:
             # Load image
-            image = cv2.imread(image_path)
+            with self.metrics.timer('decode'):
+                image = cv2.imread(image_path)
             if image is None:
                 raise ValueError(f"Could not load image: {image_path}")
             
-            # Resize to model input size
-            image = cv2.resize(image, (224, 224))
-            
-            # Convert BGR to RGB
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            
-            # Normalize to [0, 1]
-            image = image.astype(np.float32) / 255.0
-            
-            # Add batch dimension
-            image = np.expand_dims(image, axis=0)
-            
-            return image
+            with self.metrics.timer('resize'):
+                # Resize to model input size
+                return self._finish_decode(image)
             
         except Exception as e:
             print(f"Error preprocessing image {image_path}: {e}")
             return None
     
+    def decode_image_bytes(self, data: bytes) -> Optional[np.ndarray]:
+        """
+        Decode and resize an encoded image held in memory.
+        
+        Args:
+            data: Encoded image bytes (JPEG, PNG, ...) or any buffer
+                (bytearray, memoryview) over them
+        
+        Returns:
+            RGB uint8 array of shape (224, 224, 3), a RejectedImage if a
+            pre-check failed, or None on failure
+        """
+        try:
+            with self.metrics.timer('decode'):
+                image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError("Could not decode image bytes")
+            
+            with self.metrics.timer('resize'):
+                return self._finish_decode(image)
+        
+        except Exception as e:
+            print(f"Error preprocessing image bytes: {e}")
+            return None
+    
+    def _finish_decode(self, image: np.ndarray) -> Any:
+        """Resize a decoded BGR image to model input and run the pre-checks."""
+        if self.prechecks is not None:
+            reason = self.prechecks.check_source(image)
+            if reason is not None:
+                return RejectedImage(reason)
+        
+        image = cv2.resize(image, self.input_size)
+        
+        # Convert BGR to RGB
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        if self.prechecks is not None:
+            reason = self.prechecks.check(image)
+            if reason is not None:
+                return RejectedImage(reason)
+        return image
+    
+    def _normalize(self, images: np.ndarray) -> np.ndarray:
+        """Normalize a stacked uint8 batch to float32 in [0, 1]."""
+        return images.astype(np.float32) / 255.0
+    
+    def preprocess_image(self, image_path: str) -> np.ndarray:
+        """
+        Preprocess image for AI model input.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Preprocessed image array
+        """
+        image = self.decode_image(image_path)
+        if not isinstance(image, np.ndarray):
+            return None
+        
+        # Add batch dimension and normalize to [0, 1]
+        return self._normalize(np.expand_dims(image, axis=0))
+    
     def predict_with_tflite(self, image: np.ndarray) -> Dict[str, Any]:
         """
         Run prediction using TensorFlow Lite model.
@@ -101,40 +597,46 @@ class AIVerificationService:
         Returns:
             Prediction results dictionary
         """
-        if 'tflite' not in self.models:
-            return self._fallback_prediction()
+        return self.predict_batch_with_tflite(image)[0]
+    
+    def predict_batch_with_tflite(self, images: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Run a single TensorFlow Lite forward pass over a batch.
         
-        try:
-            interpreter = self.models['tflite']
-            input_details = interpreter.get_input_details()
-            output_details = interpreter.get_output_details()
-            
-            # Set input tensor
-            interpreter.set_tensor(input_details[0]['index'], image.astype(np.uint8))
-            
-            # Run inference
-            interpreter.invoke()
-            
-            # Get outputs
-            hazard_output = interpreter.get_tensor(output_details[0]['index'])
-            ai_output = interpreter.get_tensor(output_details[1]['index'])
-            
-            # Process results
-            hazard_pred = np.argmax(hazard_output[0])
-            hazard_confidence = np.max(hazard_output[0])
-            ai_confidence = ai_output[0][0]
-            
-            return {
-                'hazard_type': self.idx_to_hazard[hazard_pred],
-                'hazard_confidence': float(hazard_confidence),
-                'is_ai_generated': ai_confidence > 0.5,
-                'ai_confidence': float(ai_confidence),
-                'all_hazard_scores': hazard_output[0].tolist()
-            }
+        The batch runs on an interpreter checked out of the pool, so this is
+        safe to call from several threads at once.
+        
+        Args:
+            images: Batch of shape (N, 224, 224, 3), either raw uint8 pixels
+                or preprocessed float32 in [0, 1]
             
+        Returns:
+            List of prediction results dictionaries, one per image
+        """
+        # Runs on a pooled interpreter (resized to the batch dimension)
+        return self.predict_batch_with_backend('tflite', images)
+    
+    def predict_batch_with_early_exit(self, images: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Run a batch through the early-exit stages, stopping each image at its first confident exit.
+        
+        Args:
+            images: Batch of raw uint8 pixels
+        
+        Returns:
+            List of detailed prediction results, one per image, tagged with
+            the exit taken and the share of full-model compute used
+        """
+        stages = self._get_backend('early_exit')
+        if stages is None:
+            return [self._fallback_prediction('early_exit_unavailable') for _ in range(len(images))]
+        
+        try:
+            return self.early_exit.run(images, stages, self._parse_outputs)
+        
         except Exception as e:
-            print(f"Error in TFLite prediction: {e}")
-            return self._fallback_prediction()
+            print(f"Error in early-exit prediction: {e}")
+            return [self._fallback_prediction('early_exit_error') for _ in range(len(images))]
     
     def predict_with_keras(self, image: np.ndarray) -> Dict[str, Any]:
         """
@@ -146,58 +648,147 @@ class AIVerificationService:
         Returns:
             Detailed prediction results
         """
-        if 'keras' not in self.models:
-            return self._fallback_prediction()
+        return self.predict_batch_with_keras(image)[0]
+    
+    def predict_batch_with_keras(self, images: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Run a single Keras forward pass over a batch.
         
-        try:
-            model = self.models['keras']
-            predictions = model.predict(image)
+        Args:
+            images: Batch of shape (N, 224, 224, 3), either raw uint8 pixels
+                or preprocessed float32 in [0, 1]
             
-            # Handle multi-output model
-            if isinstance(predictions, list):
-                hazard_output = predictions[0]
-                ai_output = predictions[1]
-            else:
-                hazard_output = predictions
-                ai_output = None
+        Returns:
+            List of detailed prediction results, one per image
+        """
+        return self.predict_batch_with_backend('keras', images)
+    
+    def predict_batch_with_backend(self, backend: str, images: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Run a single forward pass over a batch on a named backend.
+        
+        Args:
+            backend: 'tflite', 'keras' or 'onnx'
+            images: Batch of shape (N, 224, 224, 3), either raw uint8 pixels
+                or preprocessed float32 in [0, 1]
+        
+        Returns:
+            List of detailed prediction results, one per image
+        """
+        model = self._get_backend(backend)
+        if model is None:
+            return [self._fallback_prediction(f'{backend}_unavailable') for _ in range(len(images))]
+        
+        try:
+            return self._parse_outputs(model.predict(images))
             
+        except Exception as e:
+            print(f"Error in {backend} prediction: {e}")
+            return [self._fallback_prediction(f'{backend}_error') for _ in range(len(images))]
+    
+    def _parse_outputs(self, outputs: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Turn raw head outputs from any backend into detailed prediction results."""
+        hazard_output, ai_output = split_heads(outputs, len(self.hazard_types))
+        
+        results = []
+        for i, hazard_scores in enumerate(hazard_output):
             # Process hazard prediction
-            hazard_pred = np.argmax(hazard_output[0])
-            hazard_confidence = np.max(hazard_output[0])
+            hazard_pred = np.argmax(hazard_scores)
+            hazard_confidence = np.max(hazard_scores)
             
             # Process AI detection
             if ai_output is not None:
-                ai_confidence = ai_output[0][0]
-                is_ai_generated = ai_confidence > 0.5
+                ai_confidence = ai_output[i][0]
+                is_ai_generated = bool(ai_confidence > 0.5)
             else:
                 ai_confidence = 0.5
                 is_ai_generated = False
             
             # Get top 3 hazard predictions
-            top_indices = np.argsort(hazard_output[0])[-3:][::-1]
+            top_indices = np.argsort(hazard_scores)[-3:][::-1]
             top_predictions = [
                 {
                     'hazard_type': self.idx_to_hazard[idx],
-                    'confidence': float(hazard_output[0][idx])
+                    'confidence': float(hazard_scores[idx])
                 }
                 for idx in top_indices
             ]
             
-            return {
+            results.append({
                 'hazard_type': self.idx_to_hazard[hazard_pred],
                 'hazard_confidence': float(hazard_confidence),
                 'is_ai_generated': is_ai_generated,
                 'ai_confidence': float(ai_confidence),
                 'top_predictions': top_predictions,
-                'all_hazard_scores': hazard_output[0].tolist()
-            }
-            
+                'all_hazard_scores': hazard_scores.tolist()
+            })
+        
+        return results
+    
+    def _embedding_model(self, model: keras.Model) -> keras.Model:
+        """Keras model returning the pooled backbone features alongside the heads."""
+        cached = self._embedding_model_cache
+        if cached is not None and cached[0] is model:
+            return cached[1]
+        
+        pooled = next(
+            (layer.output for layer in model.layers
+             if isinstance(layer, keras.layers.GlobalAveragePooling2D)),
+            None
+        )
+        if pooled is None:
+            raise ValueError("Keras model has no GlobalAveragePooling2D embedding layer")
+        
+        embedding_model = keras.Model(inputs=model.inputs, outputs=[pooled, *model.outputs])
+        self._embedding_model_cache = (model, embedding_model)
+        return embedding_model
+    
+    def predict_batch_with_embeddings(self, images: np.ndarray
+                                      ) -> Tuple[List[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Run one Keras forward pass returning predictions and pooled embeddings.
+        
+        Args:
+            images: Batch of shape (N, 224, 224, 3), either raw uint8 pixels
+                or preprocessed float32 in [0, 1]
+        
+        Returns:
+            Tuple of (predictions, embeddings of shape (N, D)); embeddings is
+            None if the Keras model is unavailable
+        """
+        backend = self._get_backend('keras')
+        if backend is None:
+            return [self._fallback_prediction('keras_unavailable') for _ in range(len(images))], None
+        
+        try:
+            outputs = self._embedding_model(backend.model).predict_on_batch(
+                normalize_pixels(images, self._buffers, self.batch_size)
+            )
+            predictions = self._parse_outputs([np.asarray(head) for head in outputs[1:]])
+            return predictions, np.asarray(outputs[0], dtype=np.float32)
+        
         except Exception as e:
-            print(f"Error in Keras prediction: {e}")
-            return self._fallback_prediction()
+            print(f"Error extracting embeddings: {e}")
+            return [self._fallback_prediction('keras_error') for _ in range(len(images))], None
+    
+    def embed_batch(self, images: np.ndarray) -> Optional[np.ndarray]:
+        """Pooled backbone embeddings for a batch, or None if unavailable."""
+        return self.predict_batch_with_embeddings(images)[1]
+    
+    def predict_batch(self, images: np.ndarray) -> List[Dict[str, Any]]:
+        """Run a batch through the best available model, or the early exits / cascade when configured."""
+        if self.early_exit is not None and self._has_backend('early_exit'):
+            return self.predict_batch_with_early_exit(images)
+        if self.cascade is not None and self._has_backend('tflite') and self._has_backend('keras'):
+            return self.cascade.run(images, self.predict_batch_with_tflite, self.predict_batch_with_keras)
+        backend = self.serving_backend()
+        if backend is not None:
+            return self.predict_batch_with_backend(backend, images)
+        return [self._fallback_prediction('no_model') for _ in range(len(images))]
     
-    def _fallback_prediction(self) -> Dict[str, Any]:
+    def _fallback_prediction(self, reason: str = 'no_model') -> Dict[str, Any]:
         """Fallback prediction when models are not available."""
+        self.metrics.count_fallback(reason)
         return {
             'hazard_type': 'other',
             'hazard_confidence': 0.5,
@@ -206,37 +797,44 @@ class AIVerificationService:
             'top_predictions': [
                 {'hazard_type': 'other', 'confidence': 0.5}
             ],
-            'all_hazard_scores': [0.1] * len(self.hazard_types)
+            'all_hazard_scores': [0.1] * len(self.hazard_types),
+            'fallback': True
         }
     
-    def verify_image(self, image_path: str, selected_hazard_type: str = None) -> Dict[str, Any]:
-        """
-        Verify an image using AI models.
-        
-        Args:
-            image_path: Path to the image file
-            selected_hazard_type: Expected hazard type (optional)
-            
-        Returns:
-            Verification results dictionary
-        """
-        # Preprocess image
-        image = self.preprocess_image(image_path)
-        if image is None:
+    def _preprocess_error(self) -> Dict[str, Any]:
+        """Verification result for images that could not be preprocessed."""
+        return {
+            'status': 'error',
+            'message': 'Failed to preprocess image',
+            'confidence': 0.0
+        }
+    
+    def _unverified_result(self, image: Any) -> Dict[str, Any]:
+        """Result for a decoder output that never reaches a model."""
+        if isinstance(image, RejectedImage):
             return {
-                'status': 'error',
-                'message': 'Failed to preprocess image',
-                'confidence': 0.0
+                'status': 'failed',
+                'message': PRECHECK_MESSAGES.get(image.reason, 'Image rejected by pre-checks'),
+                'confidence': 0.0,
+                'precheck': image.reason,
+                'timestamp': datetime.now().isoformat()
             }
-        
-        # Run prediction
-        if 'tflite' in self.models:
-            prediction = self.predict_with_tflite(image)
-        elif 'keras' in self.models:
-            prediction = self.predict_with_keras(image)
-        else:
-            prediction = self._fallback_prediction()
-        
+        return self._preprocess_error()
+    
+    def _near_duplicate_result(self, match: Dict[str, Any],
+                               selected_hazard_type: str = None) -> Dict[str, Any]:
+        """Verification result reusing a near duplicate's earlier prediction."""
+        result = self._build_verification_result(match['prediction'], selected_hazard_type)
+        result['near_duplicate'] = {
+            'entry_id': match['entry_id'],
+            'distance': match['distance'],
+            'report_ids': match['report_ids']
+        }
+        return result
+    
+    def _build_verification_result(self, prediction: Dict[str, Any],
+                                   selected_hazard_type: str = None) -> Dict[str, Any]:
+        """Turn a model prediction into a verification result."""
         # Determine verification status
         status = 'verified'
         message = 'Image verified successfully'
@@ -259,7 +857,7 @@ class AIVerificationService:
         # Overall confidence
         overall_confidence = (prediction['hazard_confidence'] + (1 - prediction['ai_confidence'])) / 2
         
-        return {
+        result = {
             'status': status,
             'message': message,
             'confidence': overall_confidence,
@@ -274,117 +872,692 @@ class AIVerificationService:
             },
             'timestamp': datetime.now().isoformat()
         }
+        if prediction.get('fallback'):
+            result['fallback'] = True
+        if 'tier' in prediction:
+            result['tier'] = prediction['tier']
+        
+        return result
+    
+    def prepare_encoded(self, data: bytes, selected_hazard_type: str = None,
+                        report_id: str = None
+                        ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up encoded image bytes in the result cache and decode on a miss.
+        
+        Args:
+            data: Encoded image bytes
+            selected_hazard_type: Expected hazard type (optional)
+            report_id: Hazard report the image belongs to (optional); a
+                cache hit still links it in the near-duplicate and vector indexes
+        
+        Returns:
+            Tuple of (cache_key, cached_result, decoded_image); exactly one of
+            cached_result and decoded_image is set unless decoding failed
+        """
+        key = self._cache_key(data, selected_hazard_type)
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            if report_id:
+                self._record_cached_report(data, cached, report_id)
+            return key, cached, None
+        return key, None, self.decode_image_bytes(data)
+    
+    def _record_cached_report(self, data: bytes, result: Dict[str, Any], report_id: str):
+        """Link a report answered from the result cache in the near-duplicate and vector indexes."""
+        link_duplicate = (
+            self.near_duplicates is not None and result['status'] != 'error' and not result.get('precheck')
+        )
+        index_embedding = self.vector_index is not None and result['status'] == 'verified'
+        if not link_duplicate and not index_embedding:
+            return
+        
+        image = self.decode_image_bytes(data)
+        if not isinstance(image, np.ndarray):
+            return
+        if link_duplicate:
+            match = self.near_duplicates.lookup(
+                self.near_duplicates.hash_image(image), self.model_version, report_id
+            )
+            if match is not None:
+                result['near_duplicate'] = {
+                    'entry_id': match['entry_id'],
+                    'distance': match['distance'],
+                    'report_ids': match['report_ids']
+                }
+        if index_embedding:
+            self._index_embeddings([image], [0], [result], [report_id])
+    
+    def _prepare_path(self, image_path: str, selected_hazard_type: str = None,
+                      report_id: str = None
+                      ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """prepare_encoded for an image on disk."""
+        if self.result_cache is None:
+            return None, None, self.decode_image(image_path)
+        
+        try:
+            with open(image_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error preprocessing image {image_path}: {e}")
+            return None, None, None
+        return self.prepare_encoded(data, selected_hazard_type, report_id)
+    
+    def verify_image(self, image_path: str, selected_hazard_type: str = None,
+                     report_id: str = None) -> Dict[str, Any]:
+        """
+        Verify an image using AI models.
+        
+        Args:
+            image_path: Path to the image file
+            selected_hazard_type: Expected hazard type (optional)
+            report_id: Hazard report the image belongs to (optional)
+            
+        Returns:
+            Verification results dictionary
+        """
+        with self.metrics.timer('total'):
+            # Serve repeated uploads from the cache
+            key, cached, image = self._prepare_path(image_path, selected_hazard_type, report_id)
+            if cached is not None:
+                return cached
+        
+            return self.verify_batch([image], [selected_hazard_type], [key], [report_id])[0]
+    
+    def verify_image_bytes(self, data: bytes, selected_hazard_type: str = None,
+                           report_id: str = None) -> Dict[str, Any]:
+        """
+        Verify an encoded image held in memory, without touching the filesystem.
+        
+        Args:
+            data: Encoded image bytes, or a bytearray/memoryview over them
+            selected_hazard_type: Expected hazard type (optional)
+            report_id: Hazard report the image belongs to (optional)
+        
+        Returns:
+            Verification results dictionary
+        """
+        with self.metrics.timer('total'):
+            key, cached, image = self.prepare_encoded(data, selected_hazard_type, report_id)
+            if cached is not None:
+                return cached
+        
+            return self.verify_batch([image], [selected_hazard_type], [key], [report_id])[0]
+    
+    def verify_video(self, video_path: str, selected_hazard_type: str = None) -> Dict[str, Any]:
+        """
+        Verify a short video clip from a sample of its frames.
+        
+        Frames are streamed and chosen by the video sampler, run through the
+        model in batches of up to ``batch_size`` and their scores averaged
+        into one clip-level prediction.
+        
+        Args:
+            video_path: Path to the video file
+            selected_hazard_type: Expected hazard type (optional)
+        
+        Returns:
+            Verification results dictionary with a 'video' section holding
+            sampling statistics and per-frame predictions
+        """
+        with self.metrics.timer('total'):
+            try:
+                with self.metrics.timer('video_sampling'):
+                    frames, video_stats = self.video_sampler.sample(video_path, self._finish_decode)
+            except Exception as e:
+                print(f"Error reading video {video_path}: {e}")
+                self.metrics.count_outcome('error')
+                return {
+                    'status': 'error',
+                    'message': 'Failed to read video',
+                    'confidence': 0.0
+                }
+            
+            if not frames:
+                self.metrics.count_outcome('failed')
+                return {
+                    'status': 'failed',
+                    'message': 'No usable frames found in video - please upload a clearer clip',
+                    'confidence': 0.0,
+                    'video': video_stats,
+                    'timestamp': datetime.now().isoformat()
+                }
+            
+            predictions = []
+            for start in range(0, len(frames), self.batch_size):
+                chunk = frames[start:start + self.batch_size]
+                batch = np.stack([frame.image for frame in chunk], out=self._pixel_buffer(len(chunk)))
+                with self.metrics.timer('inference'):
+                    predictions.extend(self.predict_batch(batch))
+                self.metrics.observe_batch_size(len(chunk))
+            
+            with self.metrics.timer('postprocess'):
+                result = self._build_verification_result(
+                    self._aggregate_frame_predictions(predictions), selected_hazard_type
+                )
+                result['video'] = {
+                    **video_stats,
+                    'frames': [
+                        {
+                            'index': frame.index,
+                            'timestamp': frame.timestamp,
+                            'selection': frame.selection,
+                            'hazard_type': prediction['hazard_type'],
+                            'hazard_confidence': prediction['hazard_confidence'],
+                            'ai_confidence': prediction['ai_confidence']
+                        }
+                        for frame, prediction in zip(frames, predictions)
+                    ]
+                }
+            self.metrics.count_outcome(result['status'])
+            return result
+    
+    def verify_video_bytes(self, data: bytes, selected_hazard_type: str = None,
+                           suffix: str = '.mp4') -> Dict[str, Any]:
+        """
+        Verify an uploaded video held in memory.
+        
+        OpenCV can only open videos by path, so the bytes are spooled to a
+        temporary file that is removed afterwards.
+        
+        Args:
+            data: Encoded video bytes
+            selected_hazard_type: Expected hazard type (optional)
+            suffix: File extension hinting the container format
+        
+        Returns:
+            Verification results dictionary
+        """
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
+            f.write(data)
+            video_path = f.name
+        try:
+            return self.verify_video(video_path, selected_hazard_type)
+        finally:
+            os.unlink(video_path)
+    
+    def _aggregate_frame_predictions(self, predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Average per-frame hazard and AI scores into one clip-level prediction."""
+        usable = [prediction for prediction in predictions if not prediction.get('fallback')]
+        if not usable:
+            return predictions[0]
+        
+        hazard_scores = np.mean([prediction['all_hazard_scores'] for prediction in usable], axis=0)
+        ai_confidence = float(np.mean([prediction['ai_confidence'] for prediction in usable]))
+        hazard_pred = int(np.argmax(hazard_scores))
+        top_indices = np.argsort(hazard_scores)[-3:][::-1]
+        
+        return {
+            'hazard_type': self.idx_to_hazard[hazard_pred],
+            'hazard_confidence': float(hazard_scores[hazard_pred]),
+            'is_ai_generated': ai_confidence > 0.5,
+            'ai_confidence': ai_confidence,
+            'top_predictions': [
+                {
+                    'hazard_type': self.idx_to_hazard[idx],
+                    'confidence': float(hazard_scores[idx])
+                }
+                for idx in top_indices
+            ],
+            'all_hazard_scores': hazard_scores.tolist()
+        }
+    
+    def verify_batch(self, images: List[Optional[np.ndarray]],
+                     selected_hazard_types: List[str] = None,
+                     cache_keys: List[Optional[str]] = None,
+                     report_ids: List[Optional[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Verify already decoded images with a single forward pass.
+        
+        Args:
+            images: Decoded RGB uint8 images (None marks a failed decode,
+                a RejectedImage a failed pre-check)
+            selected_hazard_types: List of expected hazard types
+            cache_keys: Result cache keys from prepare_encoded, to store results under
+            report_ids: Hazard reports the images belong to, linked in the
+                near-duplicate index
+            
+        Returns:
+            List of verification results, in input order
+        """
+        results = [None] * len(images)
+        valid = []
+        for i, image in enumerate(images):
+            if isinstance(image, np.ndarray):
+                valid.append(i)
+                continue
+            # Pre-check rejections are deterministic, so they are cached too
+            results[i] = self._unverified_result(image)
+            self.metrics.count_outcome(results[i]['status'])
+            if cache_keys:
+                self._cache_store(cache_keys[i], results[i])
+        
+        # Re-shared photos reuse the earlier prediction instead of running the model
+        decoded = list(valid)
+        hashes = {}
+        if self.near_duplicates is not None and valid:
+            remaining = []
+            for i in valid:
+                hashes[i] = self.near_duplicates.hash_image(images[i])
+                match = self.near_duplicates.lookup(
+                    hashes[i], self.model_version, report_ids[i] if report_ids else None
+                )
+                if match is None:
+                    remaining.append(i)
+                    continue
+                selected_type = selected_hazard_types[i] if selected_hazard_types else None
+                results[i] = self._near_duplicate_result(match, selected_type)
+                self.metrics.count_outcome('near_duplicate')
+            valid = remaining
+        
+        if not valid:
+            self._index_embeddings(images, decoded, results, report_ids)
+            return results
+        
+        # Raw uint8 pixels; each backend converts to its own input dtype
+        start = time.perf_counter()
+        batch = np.stack([images[i] for i in valid], out=self._pixel_buffer(len(valid)))
+        with self.metrics.timer('inference'):
+            predictions = self.predict_batch(batch)
+        if self.startup_stats['first_request_ms'] is None:
+            self.startup_stats['first_request_ms'] = 1000.0 * (time.perf_counter() - start)
+        self.metrics.observe_batch_size(len(valid))
+        
+        with self.metrics.timer('postprocess'):
+            for i, prediction in zip(valid, predictions):
+                selected_type = selected_hazard_types[i] if selected_hazard_types else None
+                results[i] = self._build_verification_result(prediction, selected_type)
+                self.metrics.count_outcome(results[i]['status'])
+                if cache_keys:
+                    self._cache_store(cache_keys[i], results[i])
+                if i in hashes and not prediction.get('fallback'):
+                    self.near_duplicates.add(
+                        hashes[i], prediction, self.model_version,
+                        report_ids[i] if report_ids else None
+                    )
+        
+        self._index_embeddings(images, decoded, results, report_ids)
+        
+        if self._shadow is not None:
+            # The batch buffer is reused, so the shadow gets its own copy
+            self._submit_shadow(
+                batch.copy(),
+                [selected_hazard_types[i] if selected_hazard_types else None for i in valid],
+                [results[i] for i in valid]
+            )
+        
+        return results
+    
+    def _index_embeddings(self, images: List[Any], indices: List[int],
+                          results: List[Dict[str, Any]], report_ids: Optional[List[Optional[str]]]):
+        """
+        Add embeddings of verified reports to the vector index.
+        
+        Covers model results as well as near-duplicate and cached ones, so
+        every verified report can be found by similarity. Reports already
+        in the index (e.g. a retried job) are not added again.
+        """
+        if self.vector_index is None or not report_ids:
+            return
+        rows = [
+            i for i in indices
+            if report_ids[i] and results[i]['status'] == 'verified'
+            and self.vector_index.get_vector(report_ids[i]) is None
+        ]
+        if not rows:
+            return
+        
+        embeddings = self.embed_batch(np.stack([images[i] for i in rows]))
+        if embeddings is not None:
+            self.vector_index.add([report_ids[i] for i in rows], embeddings)
+    
+    def find_similar_reports(self, image: np.ndarray, k: int = 10,
+                             nprobe: int = 8) -> List[Dict[str, Any]]:
+        """
+        Find verified reports visually similar to an image.
+        
+        Args:
+            image: Decoded RGB uint8 image
+            k: Number of reports to return
+            nprobe: IVF clusters searched (if the index is partitioned)
+        
+        Returns:
+            List of {'report_id', 'similarity'} dictionaries, most similar first
+        """
+        if self.vector_index is None:
+            raise ValueError("No vector index configured")
+        
+        embeddings = self.embed_batch(np.expand_dims(image, axis=0))
+        if embeddings is None:
+            return []
+        return [
+            {'report_id': report_id, 'similarity': score}
+            for report_id, score in self.vector_index.search(embeddings, k, nprobe)[0]
+        ]
+    
+    def find_similar_to_report(self, report_id: str, k: int = 10,
+                               nprobe: int = 8) -> List[Dict[str, Any]]:
+        """
+        Find reports similar to an already indexed report.
+        
+        Args:
+            report_id: Indexed report id
+            k: Number of reports to return (excluding the report itself)
+            nprobe: IVF clusters searched (if the index is partitioned)
+        
+        Returns:
+            List of {'report_id', 'similarity'} dictionaries, most similar first
+        """
+        if self.vector_index is None:
+            raise ValueError("No vector index configured")
+        
+        vector = self.vector_index.get_vector(report_id)
+        if vector is None:
+            return []
+        matches = self.vector_index.search(vector, k + 1, nprobe)[0]
+        return [
+            {'report_id': match_id, 'similarity': score}
+            for match_id, score in matches if match_id != str(report_id)
+        ][:k]
+    
+    def record_report_location(self, report_id: str, location: Dict[str, Any],
+                               result: Dict[str, Any]) -> bool:
+        """
+        Add a verified report's location to the geospatial index and event clusterer.
+        
+        Args:
+            report_id: Hazard report id
+            location: Location dictionary with 'lat' and 'lng' (and optionally 'district')
+            result: Verification result for the report's image
+        
+        Returns:
+            True if the report was indexed or clustered
+        """
+        if result.get('status') != 'verified':
+            return False
+        if not location or location.get('lat') is None or location.get('lng') is None:
+            return False
+        
+        clustered = False
+        if self.event_clusterer is not None:
+            try:
+                self.event_clusterer.add_result(report_id, location, result)
+                clustered = True
+            except Exception as e:
+                print(f"Error clustering report {report_id}: {e}")
+        
+        if self.geo_index is None:
+            return clustered
+        
+        # A malformed location or timestamp must not change the verification outcome
+        try:
+            return self.geo_index.add(
+                report_id,
+                location['lat'],
+                location['lng'],
+                result['hazard_detection']['detected_type'],
+                result.get('timestamp')
+            ) or clustered
+        except Exception as e:
+            print(f"Error indexing location of report {report_id}: {e}")
+            return clustered
     
     def batch_verify_images(self, image_paths: List[str], 
-                          selected_hazard_types: List[str] = None) -> List[Dict[str, Any]]:
+                          selected_hazard_types: List[str] = None,
+                          batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Verify multiple images in batch.
         
+        Images are decoded in parallel and stacked into batches of up to
+        ``batch_size``; each batch runs one forward pass while the next
+        batch is being decoded.
+        
         Args:
             image_paths: List of image file paths
             selected_hazard_types: List of expected hazard types
+            batch_size: Maximum images per forward pass (defaults to self.batch_size)
             
         Returns:
             List of verification results
         """
+        batch_size = batch_size or self.batch_size
+        if selected_hazard_types is None:
+            selected_hazard_types = [None] * len(image_paths)
+        chunks = [
+            list(range(start, min(start + batch_size, len(image_paths))))
+            for start in range(0, len(image_paths), batch_size)
+        ]
         results = []
         
-        for i, image_path in enumerate(image_paths):
-            selected_type = selected_hazard_types[i] if selected_hazard_types else None
-            result = self.verify_image(image_path, selected_type)
-            result['image_path'] = image_path
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=self.decode_workers) as executor:
+            pending = None
+            for chunk_idx in range(len(chunks) + 1):
+                # Start decoding the next chunk before running inference on this one
+                upcoming = None
+                if chunk_idx < len(chunks):
+                    upcoming = [
+                        executor.submit(self._prepare_path, image_paths[i], selected_hazard_types[i])
+                        for i in chunks[chunk_idx]
+                    ]
+                
+                if pending is not None:
+                    indices = chunks[chunk_idx - 1]
+                    prepared = [future.result() for future in pending]
+                    
+                    # Only cache misses go through the model
+                    misses = [j for j, (_, cached, _) in enumerate(prepared) if cached is None]
+                    chunk_results = [cached for _, cached, _ in prepared]
+                    verified = self.verify_batch(
+                        [prepared[j][2] for j in misses],
+                        [selected_hazard_types[indices[j]] for j in misses],
+                        [prepared[j][0] for j in misses]
+                    )
+                    for j, result in zip(misses, verified):
+                        chunk_results[j] = result
+                    
+                    for i, result in zip(indices, chunk_results):
+                        result['image_path'] = image_paths[i]
+                        results.append(result)
+                
+                pending = upcoming
         
         return results
     
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """
+        Share of traffic handled by each tier.
+        
+        Returns:
+            Dictionary with pre-check and cascade counters and the fraction
+            of images rejected by pre-checks, answered by the fast model and
+            escalated to the heavy model
+        """
+        prechecks = self.prechecks.get_stats() if self.prechecks is not None else None
+        cascade = self.cascade.get_stats() if self.cascade is not None else None
+        
+        rejected = sum(prechecks['rejected'].values()) if prechecks else 0
+        modelled = cascade['images'] if cascade else 0
+        escalated = cascade['escalated'] if cascade else 0
+        total = rejected + modelled
+        
+        return {
+            'prechecks': prechecks,
+            'cascade': cascade,
+            'tier_share': {
+                'precheck': rejected / total if total else 0.0,
+                'fast': (modelled - escalated) / total if total else 0.0,
+                'heavy': escalated / total if total else 0.0
+            }
+        }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """In-process snapshot of verification metrics."""
+        return self.metrics.snapshot()
+    
+    def render_metrics(self) -> str:
+        """Verification metrics in Prometheus text format."""
+        return self.metrics.render_prometheus()
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models."""
         info = {
             'models_loaded': list(self.models.keys()),
+            'models_deferred': list(self._deferred.keys()),
+            'model_version': self.model_version,
+            'startup': dict(self.startup_stats),
             'hazard_types': self.hazard_types,
             'model_path': str(self.model_path)
         }
         
-        if 'tflite' in self.models:
-            interpreter = self.models['tflite']
-            input_details = interpreter.get_input_details()
-            output_details = interpreter.get_output_details()
-            
-            info['tflite'] = {
-                'input_shape': input_details[0]['shape'],
-                'input_type': str(input_details[0]['dtype']),
-                'output_count': len(output_details)
-            }
+        if self.result_cache is not None:
+            info['cache'] = self.result_cache.get_stats()
+        
+        if self.prechecks is not None or self.cascade is not None:
+            info['cascade'] = self.get_cascade_stats()
+        
+        if self.near_duplicates is not None:
+            info['near_duplicates'] = self.near_duplicates.get_stats()
+        
+        if self.vector_index is not None:
+            info['vector_index'] = self.vector_index.get_stats()
         
-        if 'keras' in self.models:
-            model = self.models['keras']
-            info['keras'] = {
-                'input_shape': model.input_shape,
-                'output_shape': model.output_shape,
-                'parameters': model.count_params()
+        if self.geo_index is not None:
+            info['geo_index'] = self.geo_index.get_stats()
+        
+        if self.event_clusterer is not None:
+            info['events'] = self.event_clusterer.get_stats()
+        
+        if self.early_exit is not None:
+            info['early_exit'] = self.early_exit.get_stats()
+            if 'early_exit' in self.models:
+                info['early_exit'].update(self.models['early_exit'].describe())
+        
+        if self.registry is not None:
+            info['registry'] = {
+                'root': str(self.registry.root),
+                'serving_version': self.registry_version,
+                'shadow': self.get_shadow_stats()
             }
         
+        info['serving_backend'] = self.serving_backend()
+        if self.backend_selection is not None:
+            info['backend_selection'] = self.backend_selection
+            
+        for backend in MODEL_FILES:
+            if backend in self.models:
+                info[backend] = self.models[backend].describe()
+        
         return info
 
 
 def integrate_with_report_hazard(verification_service: AIVerificationService, 
-                               image_file: Any) -> Dict[str, Any]:
+                               image_file: Any,
+                               selected_hazard_type: str = None,
+                               report_id: str = None,
+                               location: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Integrate AI verification with the ReportHazard component.
     
     Args:
         verification_service: AI verification service instance
-        image_file: File object from the form
+        image_file: File object from the form, or the uploaded bytes
+        selected_hazard_type: Hazard type chosen in the form (optional)
+        report_id: Id of the report being submitted (optional)
+        location: Report location with 'lat'/'lng' (optional)
         
     Returns:
         Verification results compatible with ReportHazard
     """
     try:
-        # Save temporary file
-        temp_path = f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-        with open(temp_path, 'wb') as f:
-            f.write(image_file.read())
-        
-        # Verify image
-        result = verification_service.verify_image(temp_path)
-        
-        # Clean up
-        os.remove(temp_path)
+        # Read the upload once and verify it straight from memory
+        data = _read_upload(image_file)
+        result = verification_service.verify_image_bytes(data, selected_hazard_type, report_id)
+        if report_id and location:
+            verification_service.record_report_location(report_id, location, result)
         
         # Format for ReportHazard component
+        return format_report_hazard_result(result, len(data))
+        
+    except Exception as e:
+        return report_hazard_error(f'Verification failed: {str(e)}')
+
+
+def _read_upload(image_file: Any) -> bytes:
+    """Read the full contents of an uploaded file object."""
+    if isinstance(image_file, (bytes, bytearray, memoryview)):
+        return image_file
+    
+    # Rewind in case the framework already consumed the stream
+    if hasattr(image_file, 'seek'):
+        image_file.seek(0)
+    return image_file.read()
+
+
+def format_report_hazard_result(result: Dict[str, Any], file_size: int) -> Dict[str, Any]:
+    """
+    Format a verification result for the ReportHazard component.
+    
+    Args:
+        result: Result from AIVerificationService.verify_image
+        file_size: Size of the uploaded file in bytes
+    
+    Returns:
+        Verification results compatible with ReportHazard
+    """
+    if result['status'] == 'error':
+        return report_hazard_error(result['message'])
+    
+    if 'hazard_detection' not in result:
+        # Rejected by the pre-checks before any model ran
         return {
             'status': result['status'],
             'checks': {
                 'isImage': True,
-                'fileSize': len(image_file.read()),
-                'isRealImage': not result['ai_detection']['is_ai_generated'],
-                'hazardTypeMatch': result['status'] == 'verified',
-                'scenarioMatch': result['status'] == 'verified',
-                'contentAnalysis': result['confidence'] > 0.7,
-                'hazardRelevant': result['hazard_detection']['confidence'] > 0.5
-            },
-            'aiDetection': result['ai_detection'],
-            'hazardMatching': {
-                'matchesSelectedType': result['status'] == 'verified',
-                'detectedHazardTypes': [result['hazard_detection']['detected_type']],
-                'confidence': result['hazard_detection']['confidence'],
-                'scenarioMatch': result['status'] == 'verified'
+                'fileSize': file_size,
+                'precheck': result.get('precheck')
             },
-            'confidence': result['confidence'],
-            'message': result['message'],
-            'timestamp': result['timestamp']
-        }
-        
-    except Exception as e:
-        return {
-            'status': 'error',
-            'checks': {},
             'aiDetection': {},
             'hazardMatching': {},
-            'confidence': 0.0,
-            'message': f'Verification failed: {str(e)}',
-            'timestamp': datetime.now().isoformat()
+            'confidence': result.get('confidence', 0.0),
+            'message': result['message'],
+            'timestamp': result['timestamp']
         }
+    
+    return {
+        'status': result['status'],
+        'checks': {
+            'isImage': True,
+            'fileSize': file_size,
+            'isRealImage': not result['ai_detection']['is_ai_generated'],
+            'hazardTypeMatch': result['status'] == 'verified',
+            'scenarioMatch': result['status'] == 'verified',
+            'contentAnalysis': result['confidence'] > 0.7,
+            'hazardRelevant': result['hazard_detection']['confidence'] > 0.5
+        },
+        'aiDetection': result['ai_detection'],
+        'hazardMatching': {
+            'matchesSelectedType': result['status'] == 'verified',
+            'detectedHazardTypes': [result['hazard_detection']['detected_type']],
+            'confidence': result['hazard_detection']['confidence'],
+            'scenarioMatch': result['status'] == 'verified'
+        },
+        'confidence': result['confidence'],
+        'message': result['message'],
+        'timestamp': result['timestamp']
+    }
+
+
+def report_hazard_error(message: str) -> Dict[str, Any]:
+    """ReportHazard-compatible result for a failed verification."""
+    return {
+        'status': 'error',
+        'checks': {},
+        'aiDetection': {},
+        'hazardMatching': {},
+        'confidence': 0.0,
+        'message': message,
+        'timestamp': datetime.now().isoformat()
+    }
 
 
 def main():
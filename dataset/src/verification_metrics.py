@@ -0,0 +1,187 @@
+"""
+OceanWatch Sentinel - Verification Metrics Module
+
+This module records per-stage latency histograms, batch sizes, queue waits,
+fallback counts and verification outcomes for AIVerificationService. The
+same data is available as an in-process snapshot and in Prometheus text
+exposition format. When disabled, every hook is a no-op.
+"""
+
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# Seconds; covers sub-millisecond decodes up to multi-second batches
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative export."""
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float):
+        """Record one value."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if not total:
+            return None
+        
+        rank = q * total
+        seen = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float('inf')
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Counts, sum and estimated quantiles."""
+        with self._lock:
+            count, total = self.count, self.sum
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else None,
+            'p50': self.quantile(0.50),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99)
+        }
+    
+    def render(self, name: str, labels: str = '') -> List[str]:
+        """Prometheus text lines for this histogram."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        
+        prefix = f"{labels}," if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {count}')
+        
+        suffix = f"{{{labels}}}" if labels else ''
+        lines.append(f"{name}_sum{suffix} {total}")
+        lines.append(f"{name}_count{suffix} {count}")
+        return lines
+
+
+class VerificationMetrics:
+    """Latency, batch and outcome metrics for the verification pipeline."""
+    
+    # Pipeline stages timed by AIVerificationService
+    STAGES = ('decode', 'resize', 'video_sampling', 'inference', 'postprocess', 'queue_wait', 'total')
+    
+    def __init__(self, enabled: bool = True, namespace: str = "oceanwatch_verification"):
+        self.enabled = enabled
+        self.namespace = namespace
+        
+        self.stage_latency = {stage: Histogram(LATENCY_BUCKETS) for stage in self.STAGES}
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.fallbacks = defaultdict(int)
+        self.outcomes = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def observe(self, stage: str, seconds: float):
+        """Record a stage latency in seconds."""
+        if self.enabled:
+            self.stage_latency[stage].observe(seconds)
+    
+    @contextmanager
+    def _timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_latency[stage].observe(time.perf_counter() - start)
+    
+    def timer(self, stage: str):
+        """Context manager timing a stage (a shared no-op when disabled)."""
+        if not self.enabled:
+            return _NOOP
+        return self._timed(stage)
+    
+    def observe_batch_size(self, size: int):
+        """Record the number of images in one forward pass."""
+        if self.enabled:
+            self.batch_sizes.observe(size)
+    
+    def count_fallback(self, reason: str, n: int = 1):
+        """Count predictions served by the fallback path."""
+        if self.enabled and n:
+            with self._lock:
+                self.fallbacks[reason] += n
+    
+    def count_outcome(self, status: str, n: int = 1):
+        """Count verification results by status (verified/failed/error/cached)."""
+        if self.enabled and n:
+            with self._lock:
+                self.outcomes[status] += n
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """In-process view of all metrics."""
+        with self._lock:
+            fallbacks, outcomes = dict(self.fallbacks), dict(self.outcomes)
+        return {
+            'enabled': self.enabled,
+            'stage_latency_seconds': {
+                stage: histogram.snapshot()
+                for stage, histogram in self.stage_latency.items()
+            },
+            'batch_size': self.batch_sizes.snapshot(),
+            'fallbacks': fallbacks,
+            'outcomes': outcomes
+        }
+    
+    def render_prometheus(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        ns = self.namespace
+        lines = [
+            f"# HELP {ns}_stage_seconds Latency of each verification stage.",
+            f"# TYPE {ns}_stage_seconds histogram"
+        ]
+        for stage, histogram in self.stage_latency.items():
+            lines.extend(histogram.render(f"{ns}_stage_seconds", f'stage="{stage}"'))
+        
+        lines.append(f"# HELP {ns}_batch_size Images per forward pass.")
+        lines.append(f"# TYPE {ns}_batch_size histogram")
+        lines.extend(self.batch_sizes.render(f"{ns}_batch_size"))
+        
+        with self._lock:
+            fallbacks, outcomes = dict(self.fallbacks), dict(self.outcomes)
+        
+        lines.append(f"# HELP {ns}_fallback_total Predictions served by the fallback path.")
+        lines.append(f"# TYPE {ns}_fallback_total counter")
+        for reason, count in sorted(fallbacks.items()):
+            lines.append(f'{ns}_fallback_total{{reason="{reason}"}} {count}')
+        
+        lines.append(f"# HELP {ns}_results_total Verification results by status.")
+        lines.append(f"# TYPE {ns}_results_total counter")
+        for status, count in sorted(outcomes.items()):
+            lines.append(f'{ns}_results_total{{status="{status}"}} {count}')
+        
+        return "\n".join(lines) + "\n"
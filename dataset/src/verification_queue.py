@@ -0,0 +1,417 @@
+"""
+OceanWatch Sentinel - Verification Job Queue Module
+
+This module puts a durable SQLite job queue in front of
+AIVerificationService. Report submissions are enqueued and answered
+immediately; a pool of worker threads claims jobs in batches, most severe
+hazard types first, and verifies them with one forward pass per batch.
+Failed jobs are retried with backoff and dead-lettered after max_attempts,
+and jobs leased by a worker that crashed are picked up again once their
+lease expires.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from verification_integration import AIVerificationService
+
+
+# Lower values are verified first
+HAZARD_PRIORITY = {
+    "tsunami": 0,
+    "storm_surge": 1,
+    "flooding": 2,
+    "high_waves": 3,
+    "erosion": 4,
+    "pollution": 5,
+    "wildlife": 6,
+    "debris": 7,
+    "other": 8
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id TEXT NOT NULL,
+    hazard_type TEXT,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload BLOB,
+    payload_size INTEGER NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    leased_until REAL,
+    worker TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, id);
+CREATE INDEX IF NOT EXISTS jobs_report ON jobs (report_id, id);
+"""
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+DEAD = 'dead'
+
+
+@dataclass
+class VerificationJob:
+    """A claimed job handed to a worker."""
+    job_id: int
+    report_id: str
+    hazard_type: Optional[str]
+    priority: int
+    attempts: int
+    payload: bytes
+    created_at: float
+
+
+class VerificationJobQueue:
+    """SQLite-backed priority queue of verification jobs."""
+    
+    def __init__(self, path: str = "dataset/queue/verification_jobs.db",
+                 max_attempts: int = 3,
+                 retry_delay_seconds: float = 5.0,
+                 lease_seconds: float = 300.0):
+        """
+        Args:
+            path: SQLite database file
+            max_attempts: Attempts before a job is dead-lettered
+            retry_delay_seconds: Delay before the first retry (doubles per attempt)
+            lease_seconds: How long a claimed job stays with its worker before
+                it is assumed lost and handed out again
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay_seconds
+        self.lease_seconds = lease_seconds
+        
+        # sqlite3 connections must not be shared between threads
+        self._local = threading.local()
+        
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; transactions are explicit)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+    
+    @staticmethod
+    def priority_for(hazard_type: Optional[str]) -> int:
+        """Queue priority of a hazard type (unknown types rank with 'other')."""
+        return HAZARD_PRIORITY.get(hazard_type, HAZARD_PRIORITY['other'])
+    
+    def enqueue(self, report_id: str, data: bytes,
+                selected_hazard_type: Optional[str] = None,
+                priority: Optional[int] = None) -> int:
+        """
+        Add a report image to the queue.
+        
+        Args:
+            report_id: Report the image belongs to
+            data: Encoded image bytes
+            selected_hazard_type: Hazard type chosen by the submitter
+            priority: Explicit priority (defaults to the hazard type's)
+        
+        Returns:
+            Job id
+        """
+        if priority is None:
+            priority = self.priority_for(selected_hazard_type)
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT INTO jobs (report_id, hazard_type, priority, status, payload, payload_size,"
+            " available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(report_id), selected_hazard_type, priority, QUEUED,
+             sqlite3.Binary(bytes(data)), len(data), now, now, now)
+        )
+        return cursor.lastrowid
+    
+    def claim(self, batch_size: int, worker: str = '') -> List[VerificationJob]:
+        """
+        Lease up to batch_size ready jobs, most urgent first.
+        
+        Args:
+            batch_size: Maximum jobs to claim
+            worker: Name recorded on the claimed jobs
+        
+        Returns:
+            Claimed jobs (possibly empty)
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs whose worker died count the lost attempt and go back in line
+            connection.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,"
+                " error = 'Lease expired', updated_at = ? WHERE status = ? AND leased_until < ?",
+                (self.max_attempts, DEAD, QUEUED, now, RUNNING, now)
+            )
+            rows = connection.execute(
+                "SELECT id, report_id, hazard_type, priority, attempts, payload, created_at FROM jobs"
+                " WHERE status = ? AND available_at <= ? ORDER BY priority, id LIMIT ?",
+                (QUEUED, now, batch_size)
+            ).fetchall()
+            connection.executemany(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, leased_until = ?,"
+                " worker = ?, updated_at = ? WHERE id = ?",
+                [(RUNNING, now + self.lease_seconds, worker, now, row['id']) for row in rows]
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        
+        return [
+            VerificationJob(row['id'], row['report_id'], row['hazard_type'], row['priority'],
+                            row['attempts'] + 1, bytes(row['payload']), row['created_at'])
+            for row in rows
+        ]
+    
+    def complete(self, job_id: int, result: Dict[str, Any]):
+        """Store a job's result and drop its payload."""
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, payload = NULL,"
+            " leased_until = NULL, updated_at = ? WHERE id = ?",
+            (DONE, json.dumps(result, default=str), time.time(), job_id)
+        )
+    
+    def fail(self, job_id: int, error: str) -> str:
+        """
+        Record a failed attempt, scheduling a retry or dead-lettering the job.
+        
+        Returns:
+            The job's new status
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                connection.execute("ROLLBACK")
+                raise KeyError(f"Unknown job {job_id}")
+            
+            now = time.time()
+            status = DEAD if row['attempts'] >= self.max_attempts else QUEUED
+            delay = self.retry_delay * 2 ** max(row['attempts'] - 1, 0)
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, available_at = ?, leased_until = NULL,"
+                " updated_at = ? WHERE id = ?",
+                (status, error, now + delay, now, job_id)
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error:
+            connection.execute("ROLLBACK")
+            raise
+        return status
+    
+    def requeue(self, job_id: int) -> bool:
+        """Give a dead-lettered job a fresh set of attempts."""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, attempts = 0, available_at = ?, updated_at = ?"
+            " WHERE id = ? AND status = ?",
+            (QUEUED, time.time(), time.time(), job_id, DEAD)
+        )
+        return cursor.rowcount > 0
+    
+    def _describe(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """Public view of a job row."""
+        job = {
+            'job_id': row['id'],
+            'report_id': row['report_id'],
+            'status': row['status'],
+            'hazard_type': row['hazard_type'],
+            'priority': row['priority'],
+            'attempts': row['attempts'],
+            'payload_size': row['payload_size'],
+            'error': row['error'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+        if row['status'] == QUEUED:
+            job['queue_position'] = self._connection().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND (priority < ? OR (priority = ? AND id < ?))",
+                (QUEUED, row['priority'], row['priority'], row['id'])
+            ).fetchone()[0]
+        return job
+    
+    def status(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Latest job for a report.
+        
+        Returns:
+            Job dictionary with status, attempts, result or error and, while
+            queued, the number of jobs ahead of it; None if never submitted
+        """
+        row = self._connection().execute(
+            "SELECT * FROM jobs WHERE report_id = ? ORDER BY id DESC LIMIT 1", (str(report_id),)
+        ).fetchone()
+        return self._describe(row) if row is not None else None
+    
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Jobs that exhausted their attempts, oldest first."""
+        rows = self._connection().execute(
+            "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT ?", (DEAD, limit)
+        ).fetchall()
+        return [self._describe(row) for row in rows]
+    
+    def purge_completed(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        """Delete finished jobs last updated before the cutoff; returns how many."""
+        cursor = self._connection().execute(
+            "DELETE FROM jobs WHERE status = ? AND updated_at < ?",
+            (DONE, time.time() - older_than_seconds)
+        )
+        return cursor.rowcount
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status and the age of the oldest ready job."""
+        connection = self._connection()
+        counts = {status: 0 for status in (QUEUED, RUNNING, DONE, DEAD)}
+        for row in connection.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row['status']] = row['n']
+        oldest = connection.execute(
+            "SELECT MIN(created_at) FROM jobs WHERE status = ?", (QUEUED,)
+        ).fetchone()[0]
+        return {
+            'path': str(self.path),
+            'jobs': counts,
+            'oldest_queued_seconds': time.time() - oldest if oldest is not None else 0.0
+        }
+
+
+class VerificationWorkerPool:
+    """Worker threads that drain a VerificationJobQueue in batches."""
+    
+    def __init__(self, service: AIVerificationService, queue: VerificationJobQueue,
+                 workers: int = 2, batch_size: int = 16, poll_interval: float = 0.5):
+        """
+        Args:
+            service: AI verification service instance
+            queue: Job queue to drain
+            workers: Worker threads, each running its own batches
+            batch_size: Jobs claimed (and verified in one forward pass) at a time
+            poll_interval: Seconds an idle worker waits before polling again
+        """
+        self.service = service
+        self.queue = queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        
+        self._stop = threading.Event()
+        self._threads = []
+        self._decode_executor = None
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'completed': 0, 'retried': 0, 'dead_lettered': 0}
+    
+    def start(self):
+        """Start the worker threads."""
+        self._stop.clear()
+        self._decode_executor = ThreadPoolExecutor(
+            max_workers=self.service.decode_workers, thread_name_prefix="queue-decode"
+        )
+        self._threads = [
+            threading.Thread(target=self._run, args=(f"worker-{i}",), name=f"queue-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop claiming work and wait for in-progress batches to finish."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._decode_executor is not None:
+            self._decode_executor.shutdown(wait=True)
+            self._decode_executor = None
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _run(self, worker: str):
+        """Claim and process batches until stopped."""
+        while not self._stop.is_set():
+            try:
+                jobs = self.queue.claim(self.batch_size, worker)
+            except Exception as e:
+                print(f"Error claiming verification jobs: {e}")
+                jobs = []
+            if not jobs:
+                self._stop.wait(self.poll_interval)
+                continue
+            self.process(jobs)
+    
+    def process(self, jobs: List[VerificationJob]):
+        """Verify a batch of claimed jobs and record the outcomes."""
+        now = time.time()
+        for job in jobs:
+            self.service.metrics.observe('queue_wait', now - job.created_at)
+        
+        try:
+            # Hash, check the result cache and decode in parallel
+            prepared = list(self._decode_executor.map(
+                lambda job: self.service.prepare_encoded(job.payload, job.hazard_type, job.report_id), jobs
+            ))
+            results = [cached for _, cached, _ in prepared]
+            misses = [i for i, (_, cached, _) in enumerate(prepared) if cached is None]
+            verified = self.service.verify_batch(
+                [prepared[i][2] for i in misses],
+                [jobs[i].hazard_type for i in misses],
+                [prepared[i][0] for i in misses],
+                [jobs[i].report_id for i in misses]
+            )
+            for i, result in zip(misses, verified):
+                results[i] = result
+        except Exception as e:
+            print(f"Error verifying batch of {len(jobs)} jobs: {e}")
+            statuses = [self.queue.fail(job.job_id, str(e)) for job in jobs]
+            with self._lock:
+                self.stats['batches'] += 1
+                self.stats['retried'] += statuses.count(QUEUED)
+                self.stats['dead_lettered'] += statuses.count(DEAD)
+            return
+        
+        for job, result in zip(jobs, results):
+            self.queue.complete(job.job_id, result)
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['completed'] += len(jobs)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker counters alongside the queue's job counts."""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['workers'] = self.workers
+        stats['batch_size'] = self.batch_size
+        stats['avg_batch_size'] = (
+            (stats['completed'] + stats['retried'] + stats['dead_lettered']) / stats['batches']
+            if stats['batches'] else 0.0
+        )
+        stats['queue'] = self.queue.get_stats()
+        return stats
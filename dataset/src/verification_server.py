@@ -0,0 +1,485 @@
+"""
+OceanWatch Sentinel - Verification Server Module
+
+This module serves AIVerificationService over HTTP with asyncio.
+Concurrent requests are collected into micro-batches so a burst of uploads
+(e.g. during a cyclone alert) runs as a few batched forward passes instead
+of one model call per report. With a job queue configured, reports can also
+be submitted for background verification and polled by report id.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from aiohttp import web
+
+from event_clustering import HazardEventClusterer
+from verification_integration import (
+    AIVerificationService,
+    format_report_hazard_result,
+    report_hazard_error,
+)
+from verification_queue import VerificationJobQueue, VerificationWorkerPool
+
+
+class QueueFullError(Exception):
+    """Raised when a request is shed because the batch queue is full."""
+
+
+@dataclass
+class _PendingRequest:
+    """A decoded image waiting for a batch slot."""
+    image: Optional[np.ndarray]
+    selected_hazard_type: Optional[str]
+    cache_key: Optional[str]
+    future: asyncio.Future
+    report_id: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """Groups concurrent verification requests into batched inference calls."""
+    
+    def __init__(self, service: AIVerificationService,
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0,
+                 max_queue_size: int = 256,
+                 decode_workers: Optional[int] = None,
+                 inference_workers: int = 1):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self.inference_workers = inference_workers
+        
+        self._decode_executor = ThreadPoolExecutor(
+            max_workers=decode_workers or service.decode_workers,
+            thread_name_prefix="decode"
+        )
+        self._inference_executor = ThreadPoolExecutor(
+            max_workers=inference_workers,
+            thread_name_prefix="inference"
+        )
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        
+        # Requests admitted but not yet answered (decoding, queued or running)
+        self._in_flight = 0
+        
+        self.stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'shed': 0,
+            'batches': 0,
+            'batched_images': 0,
+            'max_batch_size_seen': 0,
+            'total_queue_wait': 0.0
+        }
+    
+    async def start(self):
+        """Start the batching loops on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._batch_loop())
+            for _ in range(self.inference_workers)
+        ]
+    
+    async def stop(self):
+        """Stop the batching loops and release worker threads."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._decode_executor.shutdown(wait=False)
+        self._inference_executor.shutdown(wait=False)
+    
+    async def submit(self, data: bytes,
+                     selected_hazard_type: Optional[str] = None,
+                     report_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Verify one encoded image as part of the next micro-batch.
+        
+        Args:
+            data: Encoded image bytes
+            selected_hazard_type: Expected hazard type (optional)
+            report_id: Hazard report the image belongs to (optional), linked
+                in the near-duplicate and embedding indexes
+        
+        Returns:
+            Verification results dictionary
+        
+        Raises:
+            QueueFullError: If max_queue_size requests are already in flight
+        """
+        # Shed load before doing any work for this request
+        if self._in_flight >= self.max_queue_size:
+            self.stats['shed'] += 1
+            raise QueueFullError(f"Verification queue full ({self.max_queue_size} in flight)")
+        
+        self._in_flight += 1
+        self.stats['requests'] += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            
+            # Hash, check the result cache and decode off the event loop
+            cache_key, cached, image = await loop.run_in_executor(
+                self._decode_executor, self.service.prepare_encoded, data, selected_hazard_type, report_id
+            )
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+            
+            future = loop.create_future()
+            await self._queue.put(_PendingRequest(image, selected_hazard_type, cache_key, future, report_id))
+            return await future
+        finally:
+            self._in_flight -= 1
+            self.service.metrics.observe('total', time.perf_counter() - start)
+    
+    async def _collect_batch(self) -> List[_PendingRequest]:
+        """Wait for one request, then gather more until the batch is full or max_wait elapses."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _batch_loop(self):
+        """Run batched inference until cancelled."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = await self._collect_batch()
+            
+            now = time.perf_counter()
+            self.stats['batches'] += 1
+            self.stats['batched_images'] += len(batch)
+            self.stats['max_batch_size_seen'] = max(self.stats['max_batch_size_seen'], len(batch))
+            self.stats['total_queue_wait'] += sum(now - item.enqueued_at for item in batch)
+            for item in batch:
+                self.service.metrics.observe('queue_wait', now - item.enqueued_at)
+            
+            try:
+                results = await loop.run_in_executor(
+                    self._inference_executor,
+                    self.service.verify_batch,
+                    [item.image for item in batch],
+                    [item.selected_hazard_type for item in batch],
+                    [item.cache_key for item in batch],
+                    [item.report_id for item in batch]
+                )
+            except Exception as e:
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+            
+            # Fan results back out to the waiting requests
+            for item, result in zip(batch, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        batches = self.stats['batches']
+        images = self.stats['batched_images']
+        return {
+            **self.stats,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': self._in_flight,
+            'avg_batch_size': images / batches if batches else 0.0,
+            'avg_queue_wait_ms': 1000.0 * self.stats['total_queue_wait'] / images if images else 0.0
+        }
+
+
+async def _read_image_upload(request: web.Request) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """
+    Read the uploaded image and form fields from a request.
+    
+    Accepts the ReportHazard multipart form (``image`` plus text fields) or
+    a raw image body with the fields as query parameters.
+    
+    Returns:
+        Tuple of (image bytes or None if the form has no image, fields)
+    """
+    fields = dict(request.query)
+    if not request.content_type.startswith('multipart/'):
+        return await request.read(), fields
+    
+    form = await request.post()
+    fields.update({key: value for key, value in form.items() if isinstance(value, str) and value})
+    upload = form.get('image')
+    if upload is None or not hasattr(upload, 'file'):
+        return None, fields
+    return upload.file.read(), fields
+
+
+async def handle_verify_image(request: web.Request) -> web.Response:
+    """
+    POST /api/verify-image/
+    
+    Accepts the ReportHazard multipart form (``image``, ``hazard_type``)
+    or a raw image body with an optional ``hazard_type`` query parameter.
+    An optional ``report_id`` links the image in the near-duplicate and
+    embedding indexes; with ``lat`` and ``lng`` (and optionally
+    ``district``) a verified report is also recorded for the geo index and
+    event clustering.
+    """
+    batcher: MicroBatcher = request.app['batcher']
+    data, fields = await _read_image_upload(request)
+    hazard_type = fields.get('hazard_type')
+    report_id = fields.get('report_id')
+    
+    if data is None:
+        return web.json_response(report_hazard_error('No image uploaded'), status=400)
+    if not data:
+        return web.json_response(report_hazard_error('Empty image upload'), status=400)
+    
+    try:
+        result = await batcher.submit(data, hazard_type, report_id)
+    except QueueFullError as e:
+        return web.json_response(
+            report_hazard_error(str(e)), status=503, headers={'Retry-After': '1'}
+        )
+    except Exception as e:
+        return web.json_response(report_hazard_error(f'Verification failed: {str(e)}'), status=500)
+    
+    if report_id and fields.get('lat') and fields.get('lng'):
+        try:
+            location = {
+                'lat': float(fields['lat']),
+                'lng': float(fields['lng']),
+                'district': fields.get('district')
+            }
+            request.app['service'].record_report_location(report_id, location, result)
+        except Exception as e:
+            print(f"Error recording location of report {report_id}: {e}")
+    
+    status = 422 if result['status'] == 'error' else 200
+    return web.json_response(format_report_hazard_result(result, len(data)), status=status)
+
+
+async def handle_submit_job(request: web.Request) -> web.Response:
+    """
+    POST /api/verification-jobs/
+    
+    Queues a report image (``image``, ``report_id``, optional
+    ``hazard_type``) for background verification and answers with 202.
+    """
+    queue: VerificationJobQueue = request.app['job_queue']
+    data, fields = await _read_image_upload(request)
+    report_id = fields.get('report_id')
+    
+    if not report_id:
+        return web.json_response(report_hazard_error('Missing report_id'), status=400)
+    if not data:
+        return web.json_response(report_hazard_error('No image uploaded'), status=400)
+    
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(None, queue.enqueue, report_id, data, fields.get('hazard_type'))
+    job = await loop.run_in_executor(None, queue.status, report_id)
+    return web.json_response({
+        'reportId': report_id,
+        'jobId': job_id,
+        'status': job['status'],
+        'queuePosition': job.get('queue_position')
+    }, status=202)
+
+
+async def handle_job_status(request: web.Request) -> web.Response:
+    """GET /api/verification-jobs/{report_id}"""
+    queue: VerificationJobQueue = request.app['job_queue']
+    report_id = request.match_info['report_id']
+    
+    job = await asyncio.get_running_loop().run_in_executor(None, queue.status, report_id)
+    if job is None:
+        return web.json_response(report_hazard_error(f'No verification job for report {report_id}'), status=404)
+    
+    response = {
+        'reportId': report_id,
+        'jobId': job['job_id'],
+        'status': job['status'],
+        'attempts': job['attempts'],
+        'queuePosition': job.get('queue_position'),
+        'error': job['error']
+    }
+    if job['result'] is not None:
+        response['result'] = format_report_hazard_result(job['result'], job['payload_size'])
+    return web.json_response(response)
+
+
+async def handle_hazard_events(request: web.Request) -> web.Response:
+    """
+    GET /api/hazard-events/
+    
+    Open hazard events, largest first. Optional query parameters:
+    ``hazard_type`` and ``include_closed=true``.
+    """
+    clusterer: HazardEventClusterer = request.app['service'].event_clusterer
+    # Close events that went quiet even if no report arrived since
+    clusterer.advance()
+    events = clusterer.get_events(
+        request.query.get('hazard_type'),
+        request.query.get('include_closed', '').lower() in ('1', 'true', 'yes')
+    )
+    return web.json_response({'events': events, 'count': len(events)})
+
+
+async def handle_health(request: web.Request) -> web.Response:
+    """GET /health"""
+    return web.json_response({
+        'status': 'ok',
+        'models_loaded': list(request.app['service'].models.keys())
+    })
+
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    """GET /metrics (Prometheus text format)"""
+    return web.Response(
+        text=request.app['service'].render_metrics(),
+        content_type='text/plain',
+        headers={'X-Content-Type-Options': 'nosniff'}
+    )
+
+
+async def handle_stats(request: web.Request) -> web.Response:
+    """GET /stats"""
+    stats = request.app['batcher'].get_stats()
+    if request.app['job_workers'] is not None:
+        stats['job_queue'] = request.app['job_workers'].get_stats()
+    return web.json_response(stats)
+
+
+def create_app(service: AIVerificationService,
+               job_queue: Optional[VerificationJobQueue] = None,
+               queue_workers: int = 2,
+               **batcher_kwargs) -> web.Application:
+    """
+    Create the verification web application.
+    
+    Args:
+        service: AI verification service instance
+        job_queue: Durable queue for background verification (optional)
+        queue_workers: Worker threads draining the job queue
+        **batcher_kwargs: Options forwarded to MicroBatcher
+    
+    Returns:
+        aiohttp application
+    """
+    app = web.Application(client_max_size=20 * 1024 * 1024)
+    app['service'] = service
+    app['batcher'] = MicroBatcher(service, **batcher_kwargs)
+    app['job_queue'] = job_queue
+    app['job_workers'] = None
+    if job_queue is not None:
+        app['job_workers'] = VerificationWorkerPool(
+            service, job_queue, workers=queue_workers,
+            batch_size=batcher_kwargs.get('max_batch_size', 16)
+        )
+    
+    async def on_startup(app):
+        await app['batcher'].start()
+        if app['job_workers'] is not None:
+            app['job_workers'].start()
+    
+    async def on_cleanup(app):
+        await app['batcher'].stop()
+        if app['job_workers'] is not None:
+            await asyncio.get_running_loop().run_in_executor(None, app['job_workers'].stop)
+    
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    
+    app.router.add_post('/api/verify-image/', handle_verify_image)
+    app.router.add_get('/health', handle_health)
+    app.router.add_get('/stats', handle_stats)
+    app.router.add_get('/metrics', handle_metrics)
+    
+    if job_queue is not None:
+        app.router.add_post('/api/verification-jobs/', handle_submit_job)
+        app.router.add_get('/api/verification-jobs/{report_id}', handle_job_status)
+    
+    if service.event_clusterer is not None:
+        app.router.add_get('/api/hazard-events/', handle_hazard_events)
+    
+    return app
+
+
+def main():
+    """Run the verification server."""
+    parser = argparse.ArgumentParser(description="OceanWatch Sentinel verification server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model-path", default="dataset/models")
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--max-queue-size", type=int, default=256)
+    parser.add_argument("--inference-workers", type=int, default=1)
+    parser.add_argument("--interpreter-threads", type=int, default=None)
+    parser.add_argument("--disable-metrics", action="store_true")
+    parser.add_argument("--queue-db", default=None,
+                        help="SQLite file enabling queued verification (e.g. dataset/queue/verification_jobs.db)")
+    parser.add_argument("--queue-workers", type=int, default=2)
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--event-radius-km", type=float, default=None,
+                        help="Cluster verified reports into hazard events within this radius")
+    parser.add_argument("--event-window-minutes", type=float, default=60.0)
+    parser.add_argument("--event-min-reports", type=int, default=5)
+    args = parser.parse_args()
+    
+    event_clusterer = None
+    if args.event_radius_km:
+        event_clusterer = HazardEventClusterer(
+            radius_km=args.event_radius_km,
+            window_seconds=args.event_window_minutes * 60.0,
+            min_reports=args.event_min_reports
+        )
+    
+    # One pooled interpreter per batching loop so batches run in parallel
+    service = AIVerificationService(
+        args.model_path,
+        batch_size=args.max_batch_size,
+        interpreter_pool_size=args.inference_workers,
+        interpreter_threads=args.interpreter_threads,
+        enable_metrics=not args.disable_metrics,
+        event_clusterer=event_clusterer
+    )
+    
+    job_queue = None
+    if args.queue_db:
+        job_queue = VerificationJobQueue(args.queue_db, max_attempts=args.max_attempts)
+    
+    app = create_app(
+        service,
+        job_queue=job_queue,
+        queue_workers=args.queue_workers,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_queue_size=args.max_queue_size,
+        inference_workers=args.inference_workers
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+OceanWatch Sentinel - Shared Test Fixtures
+
+Tiny deterministic models and images for the dataset/src modules.
+"""
+
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Index of 'flooding' in AIVerificationService.hazard_types
+FLOODING = 3
+NUM_CLASSES = 9
+
+
+def make_image(seed: int = 0, size: int = 256) -> np.ndarray:
+    """Textured RGB uint8 image that passes the blank and blur pre-checks."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (size, size, 3), dtype=np.uint8)
+
+
+def encode_jpeg(image: np.ndarray) -> bytes:
+    """JPEG bytes of an RGB image."""
+    ok, encoded = cv2.imencode('.jpg', cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+    assert ok
+    return encoded.tobytes()
+
+
+def build_model():
+    """
+    Two-head model with the production head names and fixed outputs.
+    
+    The heads ignore their input: every image is 'flooding' with high
+    confidence and almost certainly real, so verifying against 'flooding'
+    yields 'verified'.
+    """
+    from tensorflow import keras
+    
+    inputs = keras.Input((224, 224, 3))
+    x = keras.layers.AveragePooling2D(16)(inputs)
+    x = keras.layers.Conv2D(4, 3, padding='same', activation='relu')(x)
+    pooled = keras.layers.GlobalAveragePooling2D()(x)
+    hazard = keras.layers.Dense(NUM_CLASSES, activation='softmax', name='hazard_classification')(pooled)
+    ai = keras.layers.Dense(1, activation='sigmoid', name='ai_detection')(pooled)
+    model = keras.Model(inputs, [hazard, ai])
+    
+    hazard_layer = model.get_layer('hazard_classification')
+    bias = np.zeros(NUM_CLASSES, dtype=np.float32)
+    bias[FLOODING] = 8.0
+    hazard_layer.set_weights([np.zeros_like(hazard_layer.get_weights()[0]), bias])
+    ai_layer = model.get_layer('ai_detection')
+    ai_layer.set_weights([np.zeros_like(ai_layer.get_weights()[0]), np.array([-6.0], dtype=np.float32)])
+    return model
+
+
+@pytest.fixture(scope='session')
+def keras_model_dir(tmp_path_factory):
+    """Directory holding ocean_hazard_model.h5 only."""
+    path = tmp_path_factory.mktemp('keras_model')
+    build_model().save(str(path / 'ocean_hazard_model.h5'))
+    return path
+
+
+@pytest.fixture(scope='session')
+def model_dir(tmp_path_factory):
+    """Directory holding ocean_hazard_model.h5 and a float ocean_hazard_model.tflite."""
+    import tensorflow as tf
+    
+    path = tmp_path_factory.mktemp('model')
+    model = build_model()
+    model.save(str(path / 'ocean_hazard_model.h5'))
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    (path / 'ocean_hazard_model.tflite').write_bytes(converter.convert())
+    return path
@@ -0,0 +1,72 @@
+"""
+OceanWatch Sentinel - Annotation Snapshot Tests
+"""
+
+import pytest
+
+from annotation_snapshots import TRAINING_COLUMNS, read_snapshot, read_snapshot_frame, write_snapshot
+
+
+def _annotation(image_id, hazard_type, timestamp, **extra):
+    annotation = {
+        'image_id': image_id,
+        'file_path': f"images/{image_id}.jpg",
+        'hazard_type': hazard_type,
+        'is_real': True,
+        'verification_status': 'verified',
+        'confidence': 0.9,
+        'location': {'lat': 13.08, 'lng': 80.27, 'city': 'Chennai', 'district': 'Chennai'},
+        'metadata': {
+            'source': 'user_upload',
+            'timestamp': timestamp,
+            'file_size': 2048,
+            'dimensions': [640, 480],
+            'format': 'JPEG'
+        },
+        'ai_detection': {'is_ai_generated': False, 'confidence': 0.1, 'indicators': []},
+        'hazard_detection': {'detected_types': [hazard_type], 'confidence': 0.8, 'scenario_match': True}
+    }
+    annotation.update(extra)
+    return annotation
+
+
+ANNOTATIONS = [
+    _annotation('a', 'tsunami', '2024-12-26T09:30:00+05:30', reviewer='sam'),
+    _annotation('b', 'flooding', '2024-11-01T10:00:00'),
+    _annotation('c', 'tsunami', '2024-12-25T08:00:00+00:00'),
+]
+
+
+@pytest.mark.parametrize('file_format, suffix', [('parquet', '.parquet'), ('arrow', '.arrow')])
+def test_snapshot_round_trips_annotations(tmp_path, file_format, suffix):
+    path = write_snapshot(ANNOTATIONS, tmp_path / f"snapshot{suffix}", file_format)
+    
+    restored = {annotation['image_id']: annotation for annotation in read_snapshot(path)}
+    
+    assert restored == {annotation['image_id']: annotation for annotation in ANNOTATIONS}
+
+
+def test_rows_are_sorted_and_filters_and_columns_apply(tmp_path):
+    path = write_snapshot(ANNOTATIONS, tmp_path / 'snapshot.parquet')
+    
+    assert [a['image_id'] for a in read_snapshot(path)] == ['b', 'c', 'a']
+    rows = read_snapshot(path, TRAINING_COLUMNS, [('hazard_type', '=', 'tsunami')])
+    assert rows == [
+        {'image_id': 'c', 'file_path': 'images/c.jpg', 'hazard_type': 'tsunami', 'is_real': True},
+        {'image_id': 'a', 'file_path': 'images/a.jpg', 'hazard_type': 'tsunami', 'is_real': True},
+    ]
+
+
+def test_categorical_columns_load_as_pandas_categories(tmp_path):
+    path = write_snapshot(ANNOTATIONS, tmp_path / 'snapshot.parquet')
+    
+    frame = read_snapshot_frame(path, ['hazard_type', 'district', 'timestamp_utc_offset'])
+    
+    assert str(frame['hazard_type'].dtype) == 'category'
+    assert str(frame['district'].dtype) == 'category'
+    assert sorted(frame['timestamp_utc_offset'].dropna().tolist()) == [0, 330]
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        write_snapshot(ANNOTATIONS, tmp_path / 'snapshot.csv', 'csv')
@@ -0,0 +1,80 @@
+"""
+OceanWatch Sentinel - Dataset Integrity Scanner Tests
+"""
+
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import make_image
+from dataset_scanner import DatasetScanner
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    """raw/ with two valid images, a tiny one, a corrupt one and an orphan."""
+    raw = tmp_path / 'raw'
+    (raw / 'flooding').mkdir(parents=True)
+    (raw / 'tsunami').mkdir()
+    cv2.imwrite(str(raw / 'flooding' / 'a.jpg'), make_image(1, size=128))
+    cv2.imwrite(str(raw / 'tsunami' / 'b.png'), np.full((96, 96, 3), 200, dtype=np.uint8))
+    cv2.imwrite(str(raw / 'tsunami' / 'tiny.png'), make_image(2, size=16))
+    (raw / 'flooding' / 'corrupt.jpg').write_bytes(b'not an image')
+    cv2.imwrite(str(raw / 'flooding' / 'orphan.png'), make_image(1, size=128)[:, :, ::-1])
+    
+    annotations = [
+        {'image_id': 'a', 'file_path': str(raw / 'flooding' / 'a.jpg'), 'hazard_type': 'flooding', 'is_real': True},
+        {'image_id': 'b', 'file_path': str(raw / 'tsunami' / 'b.png'), 'hazard_type': 'tsunami', 'is_real': False},
+        {'image_id': 'tiny', 'file_path': str(raw / 'tsunami' / 'tiny.png'), 'hazard_type': 'tsunami', 'is_real': True},
+        {'image_id': 'corrupt', 'file_path': str(raw / 'flooding' / 'corrupt.jpg'), 'hazard_type': 'flooding', 'is_real': True},
+        {'image_id': 'gone', 'file_path': str(raw / 'flooding' / 'gone.jpg'), 'hazard_type': 'flooding', 'is_real': True},
+    ]
+    (tmp_path / 'annotations').mkdir()
+    (tmp_path / 'annotations' / 'annotations.json').write_text(json.dumps(annotations))
+    return tmp_path
+
+
+def test_scan_reports_invalid_orphaned_and_dangling_files(data_path):
+    report = DatasetScanner(str(data_path), workers=2).scan()
+    
+    errors = {os.path.basename(item['file_path']): item['error'] for item in report['invalid_files']}
+    assert errors == {'corrupt.jpg': 'undecodable', 'tiny.png': 'too_small'}
+    assert [os.path.basename(path) for path in report['orphaned_files']] == ['orphan.png']
+    assert {item['image_id']: item['reason'] for item in report['dangling_annotations']} == {
+        'tiny': 'too_small', 'corrupt': 'undecodable', 'gone': 'missing'
+    }
+    assert report['class_counts']['tsunami'] == {'real': 1, 'ai_generated': 1}
+    
+    # b.png is a flat grey image: mean 200/255 and no spread
+    grey = report['channel_stats']['per_class']['tsunami']
+    assert grey['images'] == 1
+    np.testing.assert_allclose(grey['mean'], [200 / 255] * 3, atol=1e-6)
+    np.testing.assert_allclose(grey['std'], [0.0] * 3, atol=1e-6)
+
+
+def test_rescan_only_reads_changed_files(data_path):
+    scanner = DatasetScanner(str(data_path), workers=1)
+    first = scanner.scan()
+    
+    # Touched without changing content, and rewritten with new content
+    touched = data_path / 'raw' / 'flooding' / 'a.jpg'
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10**9))
+    cv2.imwrite(str(data_path / 'raw' / 'tsunami' / 'b.png'), make_image(3, size=96))
+    second = scanner.scan()
+    
+    assert first['rescanned'] == first['files'] == 5
+    assert second['rescanned'] == 2
+    assert second['cached'] == 3
+    assert second['channel_stats']['per_class']['tsunami']['std'][0] > 0.1
+
+
+def test_changed_settings_discard_the_cache(data_path):
+    DatasetScanner(str(data_path), workers=1).scan()
+    
+    report = DatasetScanner(str(data_path), workers=1, min_width=8, min_height=8).scan()
+    
+    assert report['rescanned'] == 5
+    assert [item['error'] for item in report['invalid_files']] == ['undecodable']
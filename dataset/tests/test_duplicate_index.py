@@ -0,0 +1,54 @@
+"""
+OceanWatch Sentinel - Near-Duplicate Index Tests
+"""
+
+import cv2
+import numpy as np
+
+from conftest import encode_jpeg, make_image
+from duplicate_index import NearDuplicateIndex
+from verification_integration import AIVerificationService
+
+
+def _smooth_image(seed: int) -> np.ndarray:
+    """Low-frequency image whose perceptual hash survives re-encoding."""
+    small = make_image(seed, size=8)
+    return cv2.resize(small, (256, 256), interpolation=cv2.INTER_CUBIC)
+
+
+def test_recompressed_image_matches_and_links_report():
+    index = NearDuplicateIndex(max_distance=6)
+    image = _smooth_image(1)
+    entry_id = index.add(index.hash_image(image), {'hazard_type': 'flooding'}, 'v1', 'rep1')
+    
+    recompressed = cv2.imdecode(
+        np.frombuffer(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 40])[1], np.uint8),
+        cv2.IMREAD_COLOR
+    )
+    match = index.lookup(index.hash_image(recompressed), 'v1', 'rep2')
+    
+    assert match['entry_id'] == entry_id
+    assert match['prediction'] == {'hazard_type': 'flooding'}
+    assert index.report_ids(entry_id) == ['rep1', 'rep2']
+
+
+def test_lookup_ignores_other_images_and_model_versions():
+    index = NearDuplicateIndex(max_distance=6)
+    index.add(index.hash_image(_smooth_image(1)), {}, 'v1', 'rep1')
+    
+    assert index.lookup(index.hash_image(_smooth_image(2)), 'v1') is None
+    assert index.lookup(index.hash_image(_smooth_image(1)), 'v2') is None
+
+
+def test_same_bytes_with_new_report_id_is_linked_on_cache_hit(keras_model_dir):
+    near_duplicates = NearDuplicateIndex()
+    service = AIVerificationService(str(keras_model_dir), near_duplicates=near_duplicates)
+    data = encode_jpeg(make_image(3))
+    
+    first = service.verify_image_bytes(data, 'flooding', 'rep1')
+    second = service.verify_image_bytes(data, 'flooding', 'rep2')
+    
+    assert first['status'] == 'verified'
+    assert second.get('cached') is True
+    assert second['near_duplicate']['report_ids'] == ['rep1']
+    assert near_duplicates.report_ids(second['near_duplicate']['entry_id']) == ['rep1', 'rep2']
@@ -0,0 +1,102 @@
+"""
+OceanWatch Sentinel - Early-Exit Inference Tests
+"""
+
+import numpy as np
+import pytest
+
+from conftest import FLOODING, NUM_CLASSES
+from early_exit import EarlyExitPolicy
+
+
+def _hazard(confidences):
+    """Hazard scores whose top class is 'flooding' at the given confidence."""
+    scores = np.zeros((len(confidences), NUM_CLASSES), dtype=np.float32)
+    scores[:, FLOODING] = confidences
+    return scores
+
+
+def _ai(scores):
+    return np.array(scores, dtype=np.float32).reshape(-1, 1)
+
+
+class FakeStages:
+    """Two stages; the first is confident only for images whose first pixel is odd."""
+    
+    cost_fractions = [0.4, 1.0]
+    
+    def __init__(self):
+        self.batches = []
+    
+    def __len__(self):
+        return 2
+    
+    def run_stage(self, stage, inputs):
+        self.batches.append(len(inputs))
+        if stage == 0:
+            confident = inputs[:, 0, 0, 0] % 2 == 1
+            features = inputs.astype(np.float32)
+            return features, _hazard(np.where(confident, 0.95, 0.5)), _ai([0.05] * len(inputs))
+        return None, _hazard([0.6] * len(inputs)), _ai([0.4] * len(inputs))
+
+
+def _parse(outputs):
+    hazard, ai = outputs
+    return [{'confidence': float(h.max()), 'ai_score': float(a[0])} for h, a in zip(hazard, ai)]
+
+
+def test_accepts_needs_both_heads_confident():
+    policy = EarlyExitPolicy(hazard_threshold=0.85, ai_margin=0.35)
+    
+    accepted = policy.accepts(_hazard([0.9, 0.9, 0.9, 0.5]), _ai([0.1, 0.9, 0.5, 0.0]))
+    
+    assert accepted.tolist() == [True, True, False, False]
+
+
+def test_exit_indices_pick_first_confident_exit():
+    policy = EarlyExitPolicy()
+    hazard = [_hazard([0.9, 0.5, 0.5]), _hazard([0.9, 0.9, 0.5]), _hazard([0.5, 0.5, 0.5])]
+    ai = [_ai([0.0] * 3), _ai([0.0] * 3), _ai([0.5] * 3)]
+    
+    assert policy.exit_indices(hazard, ai).tolist() == [0, 1, 2]
+
+
+def test_run_routes_only_unconfident_images_onward():
+    policy = EarlyExitPolicy()
+    stages = FakeStages()
+    images = np.zeros((4, 2, 2, 3), dtype=np.uint8)
+    images[[1, 3], 0, 0, 0] = 1
+    
+    results = policy.run(images, stages, _parse)
+    
+    assert stages.batches == [4, 2]
+    assert [r['exit'] for r in results] == [1, 0, 1, 0]
+    assert [r['compute_fraction'] for r in results] == [1.0, 0.4, 1.0, 0.4]
+    assert results[1]['confidence'] == pytest.approx(0.95)
+    assert results[0]['ai_score'] == pytest.approx(0.4)
+
+
+def test_stats_report_exit_rates_and_compute_saved():
+    policy = EarlyExitPolicy()
+    assert policy.get_stats()['compute_saved'] == 0.0
+    
+    images = np.zeros((4, 2, 2, 3), dtype=np.uint8)
+    images[[1, 3], 0, 0, 0] = 1
+    policy.run(images, FakeStages(), _parse)
+    stats = policy.get_stats()
+    
+    assert stats['images'] == 4
+    assert stats['exits'] == {'0': 2, '1': 2}
+    assert stats['exit_rates'] == {'0': 0.5, '1': 0.5}
+    assert stats['avg_compute_fraction'] == pytest.approx(0.7)
+    assert stats['compute_saved'] == pytest.approx(0.3)
+
+
+def test_run_stops_once_every_image_has_exited():
+    stages = FakeStages()
+    images = np.ones((3, 2, 2, 3), dtype=np.uint8)
+    
+    results = EarlyExitPolicy().run(images, stages, _parse)
+    
+    assert stages.batches == [3]
+    assert all(r['exit'] == 0 for r in results)
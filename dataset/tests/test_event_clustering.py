@@ -0,0 +1,102 @@
+"""
+OceanWatch Sentinel - Hazard Event Clustering Tests
+"""
+
+from event_clustering import CLOSE, GROW, OPEN, HazardEventClusterer
+
+
+T0 = 1_700_000_000.0
+
+
+def _clusterer(**kwargs):
+    options = {'radius_km': 5.0, 'window_seconds': 600.0, 'min_reports': 3}
+    options.update(kwargs)
+    return HazardEventClusterer(**options)
+
+
+def _burst(clusterer, prefix, lat, start, count=3, hazard_type='flooding'):
+    updates = []
+    for i in range(count):
+        updates.extend(clusterer.add_report(f"{prefix}{i}", lat, 80.0, hazard_type,
+                                            start + i, district='Chennai', confidence=0.9))
+    return updates
+
+
+def test_dense_reports_open_then_grow_an_event():
+    clusterer = _clusterer()
+    
+    updates = _burst(clusterer, 'r', 13.0, T0)
+    grown = clusterer.add_report('r3', 13.001, 80.001, 'flooding', T0 + 10)
+    
+    assert [u['type'] for u in updates] == [OPEN]
+    assert updates[0]['event']['reports'] == 3
+    assert updates[0]['event']['districts'] == {'Chennai': 3}
+    assert [u['type'] for u in grown] == [GROW]
+    assert grown[0]['event']['event_id'] == updates[0]['event']['event_id']
+    assert grown[0]['event']['reports'] == 4
+    assert clusterer.get_stats()['unclustered_on_arrival'] == 2
+
+
+def test_far_or_other_hazard_reports_do_not_join():
+    clusterer = _clusterer()
+    _burst(clusterer, 'r', 13.0, T0)
+    
+    assert clusterer.add_report('far', 13.2, 80.0, 'flooding', T0 + 5) == []
+    assert clusterer.add_report('other', 13.0, 80.0, 'tsunami', T0 + 5) == []
+    assert [e['reports'] for e in clusterer.get_events()] == [3]
+
+
+def test_bridging_report_merges_events():
+    clusterer = _clusterer()
+    first = _burst(clusterer, 'a', 13.0, T0)[0]['event']['event_id']
+    second = _burst(clusterer, 'b', 13.08, T0 + 10)[0]['event']['event_id']
+    
+    updates = clusterer.add_report('bridge', 13.04, 80.0, 'flooding', T0 + 20)
+    
+    assert [u['type'] for u in updates] == [CLOSE, GROW]
+    assert updates[0]['event']['event_id'] == second
+    assert updates[0]['event']['close_reason'] == f'merged into {first}'
+    assert updates[1]['event']['event_id'] == first
+    assert updates[1]['event']['reports'] == 7
+    assert clusterer.get_stats()['events_merged'] == 1
+    assert [e['event_id'] for e in clusterer.get_events()] == [first]
+
+
+def test_quiet_event_closes_when_window_advances():
+    clusterer = _clusterer()
+    received = []
+    clusterer.subscribe(received.append)
+    _burst(clusterer, 'r', 13.0, T0)
+    
+    assert clusterer.advance(T0 + 300) == []
+    updates = clusterer.advance(T0 + 700)
+    
+    assert [u['type'] for u in updates] == [CLOSE]
+    assert updates[0]['event']['close_reason'] == 'expired'
+    assert [u['type'] for u in received] == [OPEN, CLOSE]
+    assert clusterer.get_events() == []
+    assert clusterer.get_events(include_closed=True)[0]['status'] == 'closed'
+    assert clusterer.get_stats()['window_points'] == {'flooding': 0}
+
+
+def test_late_reports_are_counted_not_clustered():
+    clusterer = _clusterer()
+    clusterer.add_report('new', 13.0, 80.0, 'flooding', T0 + 1000)
+    
+    assert clusterer.add_report('old', 13.0, 80.0, 'flooding', T0) == []
+    assert clusterer.get_stats()['late_reports'] == 1
+    assert clusterer.get_stats()['window_points'] == {'flooding': 1}
+
+
+def test_add_result_skips_unverified_and_unlocated_reports():
+    clusterer = _clusterer(min_reports=1)
+    result = {'status': 'verified', 'confidence': 0.8, 'timestamp': T0,
+              'hazard_detection': {'detected_type': 'flooding'}}
+    
+    assert clusterer.add_result('r0', {'lat': 13.0, 'lng': 80.0}, {**result, 'status': 'failed'}) == []
+    assert clusterer.add_result('r1', {'city': 'Chennai'}, result) == []
+    updates = clusterer.add_result('r2', {'lat': 13.0, 'lng': 80.0, 'city': 'Chennai'}, result)
+    
+    assert [u['type'] for u in updates] == [OPEN]
+    assert updates[0]['event']['districts'] == {'Chennai': 1}
+    assert updates[0]['event']['mean_confidence'] == 0.8
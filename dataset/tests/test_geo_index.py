@@ -0,0 +1,61 @@
+"""
+OceanWatch Sentinel - Geospatial Index Tests
+"""
+
+import numpy as np
+import pytest
+
+from geo_index import GeoIndex, haversine_km
+
+
+@pytest.fixture
+def coast():
+    index = GeoIndex(cell_size_deg=0.1)
+    index.add('chennai', 13.08, 80.27, 'flooding', '2024-11-01T10:00:00')
+    index.add('puducherry', 11.94, 79.81, 'cyclone', '2024-11-02T10:00:00')
+    index.add('mahabalipuram', 12.62, 80.19, 'flooding', '2024-11-03T10:00:00')
+    index.add('kochi', 9.93, 76.27, 'flooding', '2024-11-01T12:00:00')
+    return index
+
+
+def test_bbox_applies_hazard_and_time_filters(coast):
+    east_coast = (11.5, 79.5, 13.5, 80.5)
+    
+    assert sorted(coast.query_bbox(*east_coast)) == ['chennai', 'mahabalipuram', 'puducherry']
+    assert sorted(coast.query_bbox(*east_coast, hazard_types=['flooding'])) == ['chennai', 'mahabalipuram']
+    assert coast.query_bbox(*east_coast, hazard_types=['flooding'], start='2024-11-02T00:00:00') == ['mahabalipuram']
+    assert coast.query_bbox(*east_coast, hazard_types=['tsunami']) == []
+
+
+def test_radius_results_are_nearest_first(coast):
+    hits = coast.query_radius(13.0, 80.25, 60.0)
+    
+    assert [item_id for item_id, _ in hits] == ['chennai', 'mahabalipuram']
+    assert hits[0][1] < hits[1][1] <= 60.0
+
+
+def test_duplicates_and_unlocated_annotations_are_skipped(coast):
+    assert not coast.add('chennai', 0.0, 0.0)
+    assert not coast.add_annotation({'image_id': 'x', 'location': {}})
+    assert coast.get_stats()['points'] == 4
+
+
+@pytest.mark.parametrize('base_lat', [10.0, 62.0, 78.0])
+def test_nearest_matches_brute_force_on_dense_grid(base_lat):
+    rng = np.random.default_rng(int(base_lat))
+    lats = base_lat + rng.uniform(-3, 3, 3000)
+    lngs = rng.uniform(-6, 6, 3000)
+    index = GeoIndex(cell_size_deg=0.2)
+    for i, (lat, lng) in enumerate(zip(lats, lngs)):
+        index.add(str(i), lat, lng)
+    
+    for lat, lng in zip(base_lat + rng.uniform(-2, 2, 20), rng.uniform(-4, 4, 20)):
+        expected = np.sort(haversine_km(lat, lng, lats, lngs))[:5]
+        found = [distance for _, distance in index.nearest(lat, lng, k=5)]
+        np.testing.assert_allclose(found, expected)
+
+
+def test_nearest_respects_max_radius_and_filters(coast):
+    assert coast.nearest(13.0, 80.25, k=3, max_radius_km=20.0)[0][0] == 'chennai'
+    assert len(coast.nearest(13.0, 80.25, k=3, max_radius_km=20.0)) == 1
+    assert [item for item, _ in coast.nearest(13.0, 80.25, k=1, hazard_types=['cyclone'])] == ['puducherry']
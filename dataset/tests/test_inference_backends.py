@@ -0,0 +1,74 @@
+"""
+OceanWatch Sentinel - Inference Backend Tests
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from conftest import FLOODING, NUM_CLASSES
+from inference_backends import BackendSelector, InferenceBackend, KerasBackend, normalize_pixels
+
+
+class FakeBackend(InferenceBackend):
+    """Returns fixed head outputs after a fixed delay."""
+    
+    def __init__(self, delay: float = 0.0, shift: float = 0.0, fail: bool = False):
+        super().__init__('fake')
+        self.delay = delay
+        self.shift = shift
+        self.fail = fail
+    
+    def predict(self, images):
+        if self.fail:
+            raise RuntimeError("backend crashed")
+        time.sleep(self.delay)
+        hazard = np.full((len(images), NUM_CLASSES), 0.01, dtype=np.float32)
+        hazard[:, FLOODING] = 0.9 - self.shift
+        return [np.full((len(images), 1), 0.1, dtype=np.float32), hazard]
+
+
+def test_normalize_pixels_matches_service_math_and_reuses_buffer():
+    buffers = threading.local()
+    images = np.random.default_rng(0).integers(0, 256, (3, 8, 8, 3), dtype=np.uint8)
+    
+    first = normalize_pixels(images, buffers, min_rows=4)
+    np.testing.assert_array_equal(first, images.astype(np.float32) / 255.0)
+    second = normalize_pixels(images[:2], buffers)
+    
+    assert np.shares_memory(first, second)
+    assert buffers.floats.shape == (4, 8, 8, 3)
+    floats = np.zeros((1, 8, 8, 3), dtype=np.float32)
+    assert normalize_pixels(floats, buffers) is floats
+
+
+def test_selector_picks_fastest_agreeing_backend():
+    selector = BackendSelector(batch_size=2, rounds=3, tolerance=0.05)
+    backends = {
+        'keras': FakeBackend(delay=0.02),
+        'tflite': FakeBackend(delay=0.0, shift=0.5),
+        'onnx': FakeBackend(delay=0.005, shift=0.01),
+        'broken': FakeBackend(fail=True)
+    }
+    
+    selected, report = selector.select(backends, NUM_CLASSES, (8, 8))
+    
+    assert selected == 'onnx'
+    assert report['reference'] == 'keras'
+    assert report['backends']['tflite']['agrees'] is False
+    assert 'error' in report['backends']['broken']
+
+
+def test_selector_without_backends_selects_nothing():
+    assert BackendSelector(batch_size=1, rounds=1).select({}, NUM_CLASSES)[0] is None
+
+
+def test_keras_backend_accepts_raw_pixels(keras_model_dir):
+    backend = KerasBackend(str(keras_model_dir / 'ocean_hazard_model.h5')).load()
+    images = np.random.default_rng(1).integers(0, 256, (2, 224, 224, 3), dtype=np.uint8)
+    
+    outputs = backend.predict(images)
+    hazard = next(o for o in outputs if o.shape[-1] == NUM_CLASSES)
+    
+    assert np.argmax(hazard, axis=1).tolist() == [FLOODING, FLOODING]
@@ -0,0 +1,88 @@
+"""
+OceanWatch Sentinel - TFLite Interpreter Pool Tests
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import FLOODING, NUM_CLASSES, build_model
+from interpreter_pool import TFLiteInterpreterPool
+
+
+@pytest.fixture(scope='module')
+def int8_model_path(tmp_path_factory):
+    """Fully int8-quantized model (int8 input tensor)."""
+    import tensorflow as tf
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(build_model())
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    rng = np.random.default_rng(0)
+    converter.representative_dataset = lambda: (
+        [rng.random((1, 224, 224, 3), dtype=np.float32)] for _ in range(8)
+    )
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    path = tmp_path_factory.mktemp('int8') / 'model.tflite'
+    path.write_bytes(converter.convert())
+    return path
+
+
+def _hazard(outputs):
+    return next(o for o in outputs if o.shape[-1] == NUM_CLASSES)
+
+
+def _pixels(count, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (count, 224, 224, 3), dtype=np.uint8)
+
+
+def test_raw_and_normalized_inputs_agree_across_batch_sizes(model_dir):
+    pool = TFLiteInterpreterPool(str(model_dir / 'ocean_hazard_model.tflite'))
+    
+    single = _hazard(pool.run(_pixels(1)))
+    batch = _hazard(pool.run(_pixels(3)))
+    normalized = _hazard(pool.run(_pixels(3).astype(np.float32) / 255.0))
+    
+    assert pool.input_mode == 'float'
+    assert single.shape == (1, NUM_CLASSES) and batch.shape == (3, NUM_CLASSES)
+    np.testing.assert_allclose(batch, normalized, atol=1e-6)
+    assert np.argmax(batch, axis=1).tolist() == [FLOODING] * 3
+
+
+def test_int8_input_uses_lookup_table(int8_model_path):
+    pool = TFLiteInterpreterPool(str(int8_model_path))
+    pixels = _pixels(2)
+    
+    assert pool.input_mode == 'lut'
+    np.testing.assert_array_equal(pool.input_lut[pixels], pool._quantize_float(pixels / 255.0))
+    np.testing.assert_allclose(
+        _hazard(pool.run(pixels)), _hazard(pool.run(pixels.astype(np.float32) / 255.0)), atol=1e-6
+    )
+
+
+def test_acquire_times_out_when_every_interpreter_is_checked_out(model_dir):
+    pool = TFLiteInterpreterPool(str(model_dir / 'ocean_hazard_model.tflite'), pool_size=1)
+    
+    with pool.checkout():
+        assert pool.describe()['available'] == 0
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+    assert pool.describe()['available'] == 1
+
+
+def test_concurrent_runs_each_get_their_own_interpreter(model_dir):
+    pool = TFLiteInterpreterPool(str(model_dir / 'ocean_hazard_model.tflite'), pool_size=2)
+    results = {}
+    
+    def worker(n):
+        results[n] = _hazard(pool.run(_pixels(n, seed=n))).shape[0]
+    
+    threads = [threading.Thread(target=worker, args=(n,)) for n in (1, 2, 3, 4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results == {1: 1, 2: 2, 3: 3, 4: 4}
+    assert pool.describe()['available'] == 2
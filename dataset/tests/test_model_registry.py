@@ -0,0 +1,81 @@
+"""
+OceanWatch Sentinel - Model Registry Tests
+"""
+
+import pytest
+
+from conftest import build_model, encode_jpeg, make_image
+from model_registry import ModelRegistry
+from verification_integration import AIVerificationService
+
+
+def test_publish_stores_files_under_given_names(tmp_path):
+    source = tmp_path / 'custom.h5'
+    source.write_bytes(b'weights')
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    
+    version = registry.publish({'ocean_hazard_model.h5': str(source)})
+    
+    assert (registry.version_path(version) / 'ocean_hazard_model.h5').read_bytes() == b'weights'
+    assert list(registry.read_manifest()['versions'][version]['files']) == ['ocean_hazard_model.h5']
+    assert registry.verify(version)
+
+
+def _publish_bytes(registry, tmp_path, name, data, activate=False):
+    source = tmp_path / name
+    source.write_bytes(data)
+    return registry.publish({'ocean_hazard_model.h5': str(source)}, activate=activate)
+
+
+def test_activate_and_rollback(tmp_path):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    v1 = _publish_bytes(registry, tmp_path, 'a.h5', b'one', activate=True)
+    v2 = _publish_bytes(registry, tmp_path, 'b.h5', b'two', activate=True)
+    
+    assert registry.active_version() == v2
+    assert registry.rollback() == v1
+    assert registry.active_version() == v1
+    with pytest.raises(ValueError):
+        registry.rollback()
+
+
+def test_corrupted_version_is_never_activated(tmp_path):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    v1 = _publish_bytes(registry, tmp_path, 'a.h5', b'one', activate=True)
+    v2 = _publish_bytes(registry, tmp_path, 'b.h5', b'two', activate=True)
+    (registry.version_path(v1) / 'ocean_hazard_model.h5').write_bytes(b'tampered')
+    
+    with pytest.raises(ValueError):
+        registry.rollback()
+    assert registry.active_version() == v2
+    with pytest.raises(ValueError):
+        registry.activate(v1)
+
+
+def test_service_swaps_versions_and_keeps_serving_on_failed_load(tmp_path, keras_model_dir):
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    v1 = registry.publish([str(keras_model_dir / 'ocean_hazard_model.h5')], activate=True)
+    service = AIVerificationService(str(keras_model_dir))
+    service.attach_registry(registry, watch=False)
+    data = encode_jpeg(make_image(4))
+    service.verify_image_bytes(data, 'flooding')
+    
+    rebuilt = tmp_path / 'rebuilt.h5'
+    build_model().save(str(rebuilt))
+    v2 = registry.publish({'ocean_hazard_model.h5': str(rebuilt)}, activate=True)
+    previous_version = service.model_version
+    
+    assert service._registry_watcher.check()
+    assert service.registry_version == v2
+    assert service.model_version != previous_version
+    # Results from the old model are not served by the new one
+    assert not service.verify_image_bytes(data, 'flooding').get('cached')
+    
+    _publish_bytes(registry, tmp_path, 'broken.h5', b'not a model', activate=True)
+    models, model_version = service.models, service.model_version
+    
+    assert not service._registry_watcher.check()
+    assert service.registry_version == v2
+    assert service.models is models and service.model_version == model_version
+    assert service.verify_image_bytes(data, 'flooding')['status'] == 'verified'
+    assert v1 in registry.list_versions()
@@ -0,0 +1,33 @@
+"""
+OceanWatch Sentinel - Model Training Tests
+"""
+
+import pytest
+
+pytest.importorskip('tensorflow_model_optimization')
+
+from model_registry import ModelRegistry
+from model_training import OceanHazardModelTrainer
+
+
+def test_publish_ships_only_this_runs_artifacts_under_served_names(tmp_path):
+    trainer = OceanHazardModelTrainer(str(tmp_path / 'data'), str(tmp_path / 'models'))
+    # Leftovers from an earlier run must not be bundled
+    (trainer.model_path / 'ocean_hazard_model.onnx').write_bytes(b'stale')
+    (trainer.model_path / 'ocean_hazard_model_exit0.tflite').write_bytes(b'stale')
+    saved = trainer.model_path / 'custom.h5'
+    saved.write_bytes(b'weights')
+    trainer.exported_files['ocean_hazard_model.h5'] = saved
+    registry = ModelRegistry(str(tmp_path / 'registry'))
+    
+    version = trainer.publish_to_registry(registry)
+    
+    assert sorted(p.name for p in registry.version_path(version).iterdir()) == ['ocean_hazard_model.h5']
+    assert (registry.version_path(version) / 'ocean_hazard_model.h5').read_bytes() == b'weights'
+
+
+def test_publish_without_exports_fails(tmp_path):
+    trainer = OceanHazardModelTrainer(str(tmp_path / 'data'), str(tmp_path / 'models'))
+    
+    with pytest.raises(ValueError):
+        trainer.publish_to_registry(ModelRegistry(str(tmp_path / 'registry')))
@@ -0,0 +1,113 @@
+"""
+OceanWatch Sentinel - Multi-Process Worker Pool Tests
+"""
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+import pytest
+
+from conftest import encode_jpeg, make_image
+from process_workers import ProcessWorkerPool, _worker_main
+from verification_cascade import ImagePrechecks
+
+
+@pytest.fixture(scope='module')
+def pool(model_dir):
+    with ProcessWorkerPool(str(model_dir), num_workers=1, max_batch_size=4, pin_cpus=False,
+                           prechecks=ImagePrechecks()) as pool:
+        yield pool
+
+
+@pytest.fixture
+def image_paths(tmp_path):
+    paths = []
+    for name, image in (('blank', np.full((256, 256, 3), 127, dtype=np.uint8)),
+                        ('a', make_image(1)), ('b', make_image(2))):
+        path = tmp_path / f"{name}.jpg"
+        path.write_bytes(encode_jpeg(image))
+        paths.append(str(path))
+    return paths
+
+
+def test_prechecks_and_cache_run_in_front(pool, image_paths):
+    first = pool.batch_verify_images(image_paths, ['flooding'] * 3)
+    second = pool.batch_verify_images(image_paths, ['flooding'] * 3)
+    
+    assert [r['status'] for r in first] == ['failed', 'verified', 'verified']
+    assert first[0]['precheck'] == 'blank'
+    assert all(r.get('cached') for r in second)
+    # The repeat is answered from the cache without decoding again
+    assert pool.get_stats()['prechecks']['rejected'] == {'blank': 1}
+
+
+def test_dead_worker_is_replaced(pool):
+    images = [cv2.resize(make_image(5), (224, 224))]
+    pool._processes[0].kill()
+    pool._processes[0].join()
+    
+    with pytest.raises(RuntimeError, match="failed"):
+        pool.verify_batch(images, ['flooding'])
+    
+    assert pool.verify_batch(images, ['flooding'])[0]['status'] == 'verified'
+    assert pool.get_stats()['restarts'] == 1
+
+
+def test_calls_fail_fast_once_every_worker_is_dead(model_dir, monkeypatch):
+    pool = ProcessWorkerPool(str(model_dir), num_workers=1, max_batch_size=2, pin_cpus=False)
+    pool.start()
+    try:
+        def fail(worker_id):
+            raise RuntimeError("cannot start")
+        monkeypatch.setattr(pool, '_spawn', fail)
+        pool._processes[0].kill()
+        pool._processes[0].join()
+        images = [cv2.resize(make_image(6), (224, 224))]
+        
+        with pytest.raises(RuntimeError):
+            pool.verify_batch(images)
+        with pytest.raises(RuntimeError, match="All verification workers have failed"):
+            pool.verify_batch(images)
+    finally:
+        pool.close()
+
+
+def test_worker_reports_init_failure():
+    shm = shared_memory.SharedMemory(create=True, size=16)
+    parent, child = mp.Pipe()
+    try:
+        _worker_main(0, shm.name, (1, 2, 2, 3), child, '/nonexistent', {'unknown_option': 1}, None)
+        status, detail = parent.recv()
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    assert status == 'error'
+    assert 'unknown_option' in detail
+
+
+def test_start_failure_cleans_up(model_dir, monkeypatch):
+    pool = ProcessWorkerPool(str(model_dir), num_workers=2, max_batch_size=2, pin_cpus=False)
+    spawned = []
+    original_spawn = pool._spawn
+    
+    def spawn(worker_id):
+        original_spawn(worker_id)
+        spawned.append((pool._processes[worker_id], pool._shared[worker_id].name))
+    
+    def wait_ready(worker_id):
+        raise RuntimeError("worker failed to start")
+    
+    monkeypatch.setattr(pool, '_spawn', spawn)
+    monkeypatch.setattr(pool, '_wait_ready', wait_ready)
+    
+    with pytest.raises(RuntimeError, match="failed to start"):
+        pool.start()
+    
+    assert len(spawned) == 2
+    for process, name in spawned:
+        assert not process.is_alive()
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
@@ -0,0 +1,50 @@
+"""
+OceanWatch Sentinel - ReportHazard Formatting Tests
+
+Regression checks for results that never reach a model.
+"""
+
+import cv2
+import numpy as np
+
+from verification_cascade import ImagePrechecks
+from verification_integration import (
+    AIVerificationService,
+    format_report_hazard_result,
+    integrate_with_report_hazard,
+)
+
+
+def _blank_jpeg() -> bytes:
+    ok, encoded = cv2.imencode('.jpg', np.full((256, 256, 3), 127, dtype=np.uint8))
+    assert ok
+    return encoded.tobytes()
+
+
+def test_precheck_rejection_is_formatted(tmp_path):
+    service = AIVerificationService(str(tmp_path), load_models=False, prechecks=ImagePrechecks())
+    data = _blank_jpeg()
+    
+    response = integrate_with_report_hazard(service, data, 'flooding')
+    
+    assert response['status'] == 'failed'
+    assert response['checks']['precheck'] == 'blank'
+    assert response['checks']['fileSize'] == len(data)
+    assert 'blank' in response['message']
+
+
+def test_result_without_detections_is_formatted():
+    result = {
+        'status': 'failed',
+        'message': 'Image is too blurry - please upload a sharper photo',
+        'confidence': 0.0,
+        'precheck': 'blurry',
+        'timestamp': '2024-01-01T00:00:00'
+    }
+    
+    response = format_report_hazard_result(result, 1234)
+    
+    assert response['status'] == 'failed'
+    assert response['aiDetection'] == {}
+    assert response['hazardMatching'] == {}
+    assert response['message'] == result['message']
@@ -0,0 +1,52 @@
+"""
+OceanWatch Sentinel - Verification Result Cache Tests
+"""
+
+from conftest import encode_jpeg, make_image
+from result_cache import VerificationResultCache, content_hash
+from verification_integration import AIVerificationService
+
+
+def test_lru_evicts_oldest_and_returns_copies():
+    cache = VerificationResultCache(max_entries=2)
+    cache.put('v1-any-a', {'status': 'verified'})
+    cache.put('v1-any-b', {'status': 'failed'})
+    cache.get('v1-any-a')
+    cache.put('v1-any-c', {'status': 'verified'})
+    
+    assert cache.get('v1-any-b') is None
+    hit = cache.get('v1-any-a')
+    hit['status'] = 'changed'
+    assert cache.get('v1-any-a') == {'status': 'verified'}
+    assert cache.get_stats()['memory_entries'] == 2
+
+
+def test_disk_tier_outlives_process_cache_and_invalidation(tmp_path):
+    key = VerificationResultCache.make_key(content_hash(b'image'), 'v1', 'flooding')
+    VerificationResultCache(cache_dir=str(tmp_path)).put(key, {'status': 'verified'})
+    
+    cache = VerificationResultCache(cache_dir=str(tmp_path))
+    cache.invalidate()
+    
+    assert cache.get(key) == {'status': 'verified'}
+    assert cache.get(VerificationResultCache.make_key(content_hash(b'image'), 'v2', 'flooding')) is None
+    assert cache.get_stats()['disk_hits'] == 1
+
+
+def test_service_keys_results_by_hazard_type_and_drops_them_on_reload(keras_model_dir):
+    service = AIVerificationService(str(keras_model_dir))
+    data = encode_jpeg(make_image(8))
+    
+    first = service.verify_image_bytes(data, 'flooding')
+    repeat = service.verify_image_bytes(data, 'flooding')
+    other_type = service.verify_image_bytes(data, 'tsunami')
+    invalidations = service.result_cache.get_stats()['invalidations']
+    service.reload_models()
+    after_reload = service.verify_image_bytes(data, 'flooding')
+    
+    assert not first.get('cached')
+    assert repeat.get('cached') is True
+    assert repeat['status'] == first['status']
+    assert not other_type.get('cached')
+    assert not after_reload.get('cached')
+    assert service.result_cache.get_stats()['invalidations'] == invalidations + 1
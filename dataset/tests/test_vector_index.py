@@ -0,0 +1,64 @@
+"""
+OceanWatch Sentinel - Embedding Vector Index Tests
+"""
+
+import cv2
+import numpy as np
+
+from conftest import encode_jpeg, make_image
+from duplicate_index import NearDuplicateIndex
+from vector_index import EmbeddingIndex
+from verification_integration import AIVerificationService
+
+
+def test_search_finds_stored_vectors_and_survives_reopen(tmp_path):
+    vectors = np.random.default_rng(0).normal(size=(50, 16)).astype(np.float32)
+    index = EmbeddingIndex(str(tmp_path), initial_capacity=8)
+    index.add([f"r{i}" for i in range(50)], vectors)
+    
+    assert index.search(vectors[7], k=1)[0][0][0] == 'r7'
+    
+    reopened = EmbeddingIndex(str(tmp_path))
+    assert reopened.count == 50
+    assert [hits[0][0] for hits in reopened.search(vectors[[3, 42]], k=1)] == ['r3', 'r42']
+
+
+def test_ivf_search_matches_exact_top_hit(tmp_path):
+    vectors = np.random.default_rng(1).normal(size=(400, 8)).astype(np.float32)
+    index = EmbeddingIndex(str(tmp_path))
+    index.add([f"r{i}" for i in range(400)], vectors)
+    index.train_ivf(nlist=8)
+    
+    assert index.search(vectors[123], k=1, nprobe=8)[0][0][0] == 'r123'
+
+
+def test_ids_from_an_interrupted_add_are_dropped(tmp_path):
+    vectors = np.eye(4, dtype=np.float32)
+    index = EmbeddingIndex(str(tmp_path))
+    index.add(['a', 'b'], vectors[:2])
+    # An add that wrote its ids but crashed before updating the metadata
+    with open(tmp_path / 'ids.txt', 'a') as f:
+        f.write('lost\n')
+    
+    reopened = EmbeddingIndex(str(tmp_path))
+    reopened.add(['c'], vectors[2:3])
+    
+    assert EmbeddingIndex(str(tmp_path)).ids == ['a', 'b', 'c']
+    assert reopened.search(vectors[2], k=1)[0][0][0] == 'c'
+
+
+def test_cached_and_near_duplicate_results_are_indexed(tmp_path, keras_model_dir):
+    vector_index = EmbeddingIndex(str(tmp_path / 'embeddings'))
+    service = AIVerificationService(str(keras_model_dir), vector_index=vector_index,
+                                    near_duplicates=NearDuplicateIndex())
+    data = encode_jpeg(make_image(7))
+    image = cv2.resize(make_image(7), (224, 224))
+    
+    service.verify_image_bytes(data, 'flooding', 'rep1')
+    cached = service.verify_image_bytes(data, 'flooding', 'rep2')
+    duplicate = service.verify_batch([image], ['flooding'], report_ids=['rep3'])[0]
+    service.verify_image_bytes(data, 'flooding', 'rep2')
+    
+    assert cached.get('cached') is True
+    assert 'near_duplicate' in duplicate
+    assert vector_index.ids == ['rep1', 'rep2', 'rep3']
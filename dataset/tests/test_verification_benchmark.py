@@ -0,0 +1,53 @@
+"""
+OceanWatch Sentinel - Verification Benchmark Tests
+"""
+
+from conftest import encode_jpeg, make_image
+from verification_benchmark import compare_to_baseline, run_benchmarks, summarize
+
+
+def test_summary_reports_cumulative_rss_per_scenario():
+    summary = summarize([0.01, 0.02, 0.03, 0.04], items=8, wall_seconds=0.1)
+    
+    assert summary['throughput'] == 80.0
+    assert summary['p50_ms'] == 25.0
+    assert 'peak_rss_mb' not in summary
+    assert summary['cumulative_peak_rss_mb'] > 0
+
+
+def test_regressions_beyond_threshold_are_reported():
+    baseline = {
+        'scenarios': {'verify_image/c1': {'p95_ms': 100.0, 'throughput': 50.0}},
+        'startup': {'startup_seconds': 2.0},
+        'peak_rss_mb': 500.0
+    }
+    results = {
+        'scenarios': {'verify_image/c1': {'p95_ms': 130.0, 'throughput': 48.0,
+                                          'cumulative_peak_rss_mb': 900.0}},
+        'startup': {'startup_seconds': 2.1},
+        'peak_rss_mb': 520.0
+    }
+    
+    regressions = compare_to_baseline(results, baseline, threshold=0.15)
+    
+    assert len(regressions) == 1
+    assert regressions[0].startswith('verify_image/c1 p95_ms')
+
+
+def test_run_benchmarks_covers_every_scenario(model_dir, tmp_path):
+    paths = []
+    for seed in range(4):
+        path = tmp_path / f"{seed}.jpg"
+        path.write_bytes(encode_jpeg(make_image(seed, size=320)))
+        paths.append(str(path))
+    
+    results = run_benchmarks(str(model_dir), paths, concurrency=(2,), batch_sizes=(4,),
+                             interpreter_pool_size=2)
+    
+    assert sorted(results['scenarios']) == [
+        'batch_verify_images/b4', 'integrate_with_report_hazard/c2', 'verify_image/c2'
+    ]
+    assert all(scenario['items'] == 4 for scenario in results['scenarios'].values())
+    assert results['peak_rss_mb'] >= max(
+        scenario['cumulative_peak_rss_mb'] for scenario in results['scenarios'].values()
+    )
@@ -0,0 +1,72 @@
+"""
+OceanWatch Sentinel - Verification Cascade Tests
+"""
+
+import cv2
+import numpy as np
+
+from conftest import make_image
+from verification_cascade import ImagePrechecks, VerificationCascade
+from verification_integration import AIVerificationService
+
+
+def _prediction(hazard_confidence, ai_confidence=0.05, fallback=False):
+    prediction = {'hazard_confidence': hazard_confidence, 'ai_confidence': ai_confidence}
+    if fallback:
+        prediction['fallback'] = True
+    return prediction
+
+
+def test_prechecks_reject_small_blank_and_blurry_images():
+    prechecks = ImagePrechecks()
+    sharp = cv2.resize(make_image(1), (224, 224))
+    # Smooth gradient: plenty of contrast, no edges
+    ramp = np.linspace(0, 255, 224, dtype=np.float32).astype(np.uint8)
+    blurry = np.repeat(np.tile(ramp, (224, 1))[:, :, None], 3, axis=2)
+    
+    assert prechecks.check_source(np.zeros((64, 300, 3), dtype=np.uint8)) == 'too_small'
+    assert prechecks.check(np.full((224, 224, 3), 90, dtype=np.uint8)) == 'blank'
+    assert prechecks.check(blurry) == 'blurry'
+    assert prechecks.check(sharp) is None
+    assert prechecks.get_stats()['rejected'] == {'too_small': 1, 'blank': 1, 'blurry': 1}
+
+
+def test_only_uncertain_predictions_are_escalated():
+    cascade = VerificationCascade(hazard_band=(0.5, 0.85), ai_band=(0.3, 0.7))
+    fast = [_prediction(0.95), _prediction(0.6), _prediction(0.95, ai_confidence=0.5)]
+    escalated_rows = []
+    
+    def heavy(images):
+        escalated_rows.extend(images[:, 0, 0].tolist())
+        return [_prediction(0.9) for _ in images]
+    
+    images = np.arange(3, dtype=np.uint8).reshape(3, 1, 1)
+    predictions = cascade.run(images, lambda batch: [dict(p) for p in fast], heavy)
+    
+    assert escalated_rows == [1, 2]
+    assert [p['tier'] for p in predictions] == ['fast', 'heavy', 'heavy']
+    assert cascade.get_stats()['escalation_rate'] == 2 / 3
+
+
+def test_heavy_fallback_keeps_fast_answer():
+    cascade = VerificationCascade()
+    images = np.zeros((1, 1, 1), dtype=np.uint8)
+    
+    predictions = cascade.run(images, lambda batch: [_prediction(0.6)],
+                              lambda batch: [_prediction(0.5, fallback=True)])
+    
+    assert predictions[0]['tier'] == 'fast'
+    assert predictions[0]['hazard_confidence'] == 0.6
+    assert cascade.get_stats()['escalated'] == 0
+
+
+def test_service_serves_confident_images_from_fast_tier(model_dir):
+    cascade = VerificationCascade()
+    service = AIVerificationService(str(model_dir), cascade=cascade)
+    images = [cv2.resize(make_image(seed), (224, 224)) for seed in range(3)]
+    
+    results = service.verify_batch(images, ['flooding'] * 3)
+    
+    assert [r['status'] for r in results] == ['verified'] * 3
+    assert all(r['tier'] == 'fast' for r in results)
+    assert cascade.get_stats()['fast_only'] == 3
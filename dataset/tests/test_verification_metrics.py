@@ -0,0 +1,48 @@
+"""
+OceanWatch Sentinel - Verification Metrics Tests
+"""
+
+from verification_metrics import Histogram, VerificationMetrics
+
+
+def test_histogram_quantiles_use_bucket_upper_bounds():
+    histogram = Histogram((0.01, 0.1, 1.0))
+    for value in [0.005] * 90 + [0.05] * 9 + [5.0]:
+        histogram.observe(value)
+    
+    snapshot = histogram.snapshot()
+    assert snapshot['count'] == 100
+    assert snapshot['p50'] == 0.01
+    assert snapshot['p95'] == 0.1
+    assert histogram.quantile(1.0) == float('inf')
+
+
+def test_prometheus_buckets_are_cumulative():
+    metrics = VerificationMetrics(namespace='ow')
+    metrics.observe('inference', 0.003)
+    metrics.observe('inference', 0.2)
+    metrics.observe_batch_size(4)
+    metrics.count_outcome('verified', 2)
+    metrics.count_fallback('no_model')
+    
+    text = metrics.render_prometheus()
+    
+    assert 'ow_stage_seconds_bucket{stage="inference",le="0.005"} 1' in text
+    assert 'ow_stage_seconds_bucket{stage="inference",le="+Inf"} 2' in text
+    assert 'ow_stage_seconds_count{stage="inference"} 2' in text
+    assert 'ow_batch_size_bucket{le="4"} 1' in text
+    assert 'ow_results_total{status="verified"} 2' in text
+    assert 'ow_fallback_total{reason="no_model"} 1' in text
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = VerificationMetrics(enabled=False)
+    with metrics.timer('decode'):
+        pass
+    metrics.observe('total', 1.0)
+    metrics.count_outcome('verified')
+    
+    snapshot = metrics.snapshot()
+    assert snapshot['stage_latency_seconds']['decode']['count'] == 0
+    assert snapshot['stage_latency_seconds']['total']['count'] == 0
+    assert snapshot['outcomes'] == {}
@@ -0,0 +1,84 @@
+"""
+OceanWatch Sentinel - Verification Job Queue Tests
+"""
+
+import time
+
+import pytest
+
+from conftest import encode_jpeg, make_image
+from verification_integration import AIVerificationService
+from verification_queue import VerificationJobQueue, VerificationWorkerPool
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return VerificationJobQueue(str(tmp_path / 'jobs.db'), max_attempts=2,
+                                retry_delay_seconds=0.0, lease_seconds=60.0)
+
+
+def test_most_severe_hazards_are_claimed_first(queue):
+    for report_id, hazard_type in (('r1', 'debris'), ('r2', 'tsunami'), ('r3', 'flooding')):
+        queue.enqueue(report_id, b'image', hazard_type)
+    
+    assert queue.status('r1')['queue_position'] == 2
+    assert [job.report_id for job in queue.claim(2, 'w')] == ['r2', 'r3']
+    assert queue.status('r2')['status'] == 'running'
+
+
+def test_failed_jobs_retry_then_dead_letter(queue):
+    job_id = queue.enqueue('r1', b'image', 'flooding')
+    
+    assert queue.fail(queue.claim(1)[0].job_id, 'boom') == 'queued'
+    retry = queue.claim(1)[0]
+    assert retry.attempts == 2
+    assert queue.fail(retry.job_id, 'boom again') == 'dead'
+    
+    assert queue.claim(1) == []
+    assert [job['job_id'] for job in queue.dead_letters()] == [job_id]
+    assert queue.status('r1')['error'] == 'boom again'
+    
+    assert queue.requeue(job_id)
+    assert queue.claim(1)[0].attempts == 1
+
+
+def test_retries_back_off(tmp_path):
+    queue = VerificationJobQueue(str(tmp_path / 'jobs.db'), retry_delay_seconds=60.0)
+    queue.enqueue('r1', b'image')
+    
+    queue.fail(queue.claim(1)[0].job_id, 'boom')
+    
+    assert queue.claim(1) == []
+    assert queue.status('r1')['status'] == 'queued'
+
+
+def test_expired_leases_are_reclaimed_and_count_as_attempts(tmp_path):
+    queue = VerificationJobQueue(str(tmp_path / 'jobs.db'), max_attempts=2, lease_seconds=0.05)
+    queue.enqueue('r1', b'image')
+    
+    queue.claim(1, 'crashed-worker')
+    time.sleep(0.1)
+    reclaimed = queue.claim(1, 'worker')
+    assert reclaimed[0].attempts == 2
+    time.sleep(0.1)
+    
+    assert queue.claim(1) == []
+    assert queue.status('r1')['status'] == 'dead'
+    assert queue.status('r1')['error'] == 'Lease expired'
+
+
+def test_worker_pool_verifies_queued_reports(queue, keras_model_dir):
+    service = AIVerificationService(str(keras_model_dir))
+    queue.enqueue('r1', encode_jpeg(make_image(1)), 'flooding')
+    queue.enqueue('r2', encode_jpeg(make_image(2)), 'flooding')
+    queue.enqueue('r3', b'not an image', 'flooding')
+    
+    with VerificationWorkerPool(service, queue, workers=1, batch_size=8, poll_interval=0.05) as pool:
+        deadline = time.time() + 60
+        while pool.get_stats()['completed'] < 3 and time.time() < deadline:
+            time.sleep(0.05)
+    
+    assert [queue.status(r)['status'] for r in ('r1', 'r2', 'r3')] == ['done'] * 3
+    assert queue.status('r1')['result']['status'] == 'verified'
+    assert queue.status('r3')['result']['status'] == 'error'
+    assert pool.get_stats()['queue']['jobs']['done'] == 3
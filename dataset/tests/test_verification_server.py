@@ -0,0 +1,100 @@
+"""
+OceanWatch Sentinel - Verification Server Tests
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import FormData
+from aiohttp.test_utils import TestClient, TestServer
+
+from conftest import encode_jpeg, make_image
+from verification_integration import AIVerificationService
+from verification_server import MicroBatcher, QueueFullError, create_app
+
+
+@pytest.fixture(scope='module')
+def service(keras_model_dir):
+    return AIVerificationService(str(keras_model_dir), cache_size=0)
+
+
+def _with_client(app, scenario):
+    """Run scenario(client) against the app on a local test server."""
+    async def run():
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+    return asyncio.run(run())
+
+
+def _form(data, **fields):
+    form = FormData()
+    form.add_field('image', data, filename='report.jpg', content_type='image/jpeg')
+    for key, value in fields.items():
+        form.add_field(key, value)
+    return form
+
+
+def test_concurrent_uploads_are_micro_batched(service):
+    app = create_app(service, max_batch_size=8, max_wait_ms=200)
+    uploads = [encode_jpeg(make_image(seed)) for seed in range(6)]
+    
+    async def scenario(client):
+        responses = await asyncio.gather(*(
+            client.post('/api/verify-image/', data=_form(data, hazard_type='flooding'))
+            for data in uploads
+        ))
+        bodies = [await response.json() for response in responses]
+        stats = await (await client.get('/stats')).json()
+        return [response.status for response in responses], bodies, stats
+    
+    statuses, bodies, stats = _with_client(app, scenario)
+    
+    assert statuses == [200] * 6
+    assert all(body['status'] == 'verified' for body in bodies)
+    assert stats['batched_images'] == 6
+    assert stats['batches'] < 6
+    assert stats['max_batch_size_seen'] > 1
+
+
+def test_requests_over_the_queue_limit_are_shed(service):
+    batcher = MicroBatcher(service, max_batch_size=4, max_wait_ms=1, max_queue_size=1)
+    data = encode_jpeg(make_image(1))
+    
+    async def run():
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(data, 'flooding') for _ in range(3)),
+                                        return_exceptions=True)
+        finally:
+            await batcher.stop()
+    
+    results = asyncio.run(run())
+    
+    assert results[0]['status'] == 'verified'
+    assert all(isinstance(result, QueueFullError) for result in results[1:])
+    assert batcher.get_stats()['shed'] == 2
+    assert batcher.get_stats()['in_flight'] == 0
+
+
+def test_shed_request_gets_503_with_retry_after(service):
+    app = create_app(service, max_queue_size=0)
+    
+    async def scenario(client):
+        response = await client.post('/api/verify-image/', data=_form(encode_jpeg(make_image(2))))
+        return response.status, response.headers.get('Retry-After'), await response.json()
+    
+    status, retry_after, body = _with_client(app, scenario)
+    
+    assert status == 503
+    assert retry_after == '1'
+    assert body['status'] == 'error'
+
+
+def test_empty_upload_is_rejected(service):
+    app = create_app(service)
+    
+    async def scenario(client):
+        response = await client.post('/api/verify-image/?hazard_type=flooding', data=b'')
+        return response.status
+    
+    assert _with_client(app, scenario) == 400
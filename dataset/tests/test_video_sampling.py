@@ -0,0 +1,75 @@
+"""
+OceanWatch Sentinel - Video Frame Sampling Tests
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from verification_integration import AIVerificationService
+from video_sampling import VideoFrameSampler
+
+FPS = 30
+
+
+def _scene(colour, seed):
+    """Textured frame dominated by one colour."""
+    noise = np.random.default_rng(seed).integers(0, 40, (240, 320, 3))
+    return np.clip(np.array(colour) + noise, 0, 255).astype(np.uint8)
+
+
+@pytest.fixture(scope='module')
+def clip(tmp_path_factory):
+    """Three one-second scenes (blue, green, red) at 30 fps."""
+    path = tmp_path_factory.mktemp('video') / 'clip.avi'
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), FPS, (320, 240))
+    for scene, colour in enumerate([(200, 40, 40), (40, 200, 40), (40, 40, 200)]):
+        for frame in range(FPS):
+            writer.write(_scene(colour, scene * FPS + frame))
+    writer.release()
+    return path
+
+
+def _prepare(frame):
+    return cv2.cvtColor(cv2.resize(frame, (224, 224)), cv2.COLOR_BGR2RGB)
+
+
+def test_scene_changes_are_sampled_first(clip):
+    sampler = VideoFrameSampler(max_frames=4, analysis_fps=5)
+    
+    frames, stats = sampler.sample(str(clip), _prepare)
+    
+    assert [frame.index for frame in frames if frame.selection == 'scene'] == [0, 30, 60]
+    assert len(frames) == 4
+    assert stats['frames_analysed'] == 15
+    assert stats['frames_read'] == 90
+    assert all(frame.image.shape == (224, 224, 3) for frame in frames)
+
+
+def test_budgets_truncate_and_dropped_frames_are_counted(clip):
+    sampler = VideoFrameSampler(max_frames=8, analysis_fps=5, max_duration_seconds=1.5)
+    
+    frames, stats = sampler.sample(str(clip), lambda frame: None)
+    
+    assert frames == []
+    assert stats['truncated']
+    assert stats['frames_dropped'] == stats['frames_analysed'] == 8
+
+
+def test_unreadable_video_raises(tmp_path):
+    path = tmp_path / 'broken.mp4'
+    path.write_bytes(b'not a video')
+    
+    with pytest.raises(ValueError):
+        VideoFrameSampler().sample(str(path), _prepare)
+
+
+def test_service_verifies_clip_from_sampled_frames(clip, keras_model_dir):
+    service = AIVerificationService(str(keras_model_dir),
+                                    video_sampler=VideoFrameSampler(max_frames=4, analysis_fps=5))
+    
+    result = service.verify_video(str(clip), 'flooding')
+    
+    assert result['status'] == 'verified'
+    assert len(result['video']['frames']) == 4
+    assert {frame['hazard_type'] for frame in result['video']['frames']} == {'flooding'}